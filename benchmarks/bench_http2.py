@@ -0,0 +1,56 @@
+"""
+ClientAsync transports: aiohttp (HTTP/1.1) vs httpx over HTTP/1.1 and HTTP/2, against a local HTTP/2 stand-in server
+(h2server.py). Skipped if httpx[http2] is not installed.
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+import schwabdev
+from common import h2_server, latency_results, make_client, simulator
+from schwabdev.transport import AiohttpTransport, HttpxTransport
+
+_TRANSPORTS = {"aiohttp_h1": lambda: AiohttpTransport(),
+               "httpx_h1": lambda: HttpxTransport(http2=False, max_connections=100, max_keepalive_connections=100),
+               "httpx_h2": lambda: HttpxTransport(http1=False, max_connections=1)}
+
+
+async def _run(url: str, tokens_db: str, transport, requests: int, concurrency: int) -> tuple[list[float], float]:
+    client = make_client(url, schwabdev.ClientAsync, tokens_db=tokens_db, transport=transport)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.quotes(["AAPL", "MSFT"])
+            response.raise_for_status()
+            await response.read()
+            return time.perf_counter() - start
+
+    async with client:
+        await one()  # warm up the connection
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one() for _ in range(requests)))
+        return list(latencies), time.perf_counter() - start
+
+
+def run(quick: bool = False) -> list[dict]:
+    try:
+        import h2  # noqa: F401
+        import httpx  # noqa: F401
+    except ImportError:
+        print("[Schwabdev] httpx[http2] is not installed, skipping the http2 benchmark")
+        return []
+    requests = 300 if quick else 2000
+    tokens_db = os.path.join(tempfile.mkdtemp(prefix="schwabdev-bench-"), "tokens.db")
+    with simulator() as url:
+        make_client(url, tokens_db=tokens_db).close()  # authorize once, the stand-in only serves api responses
+    results = []
+    for latency in (0.0, 0.005):
+        with h2_server(latency) as url:
+            for name, transport in _TRANSPORTS.items():
+                for concurrency in (1, 32):
+                    batch = asyncio.run(_run(url, tokens_db, transport(), requests, concurrency))
+                    results += latency_results(f"http2.{name}.c{concurrency}.latency{int(latency * 1000)}ms", *batch)
+    return results
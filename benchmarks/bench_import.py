@@ -0,0 +1,50 @@
+"""
+Import time (python -X importtime) of the package for sync, async and streaming scripts, measured in fresh interpreters.
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+from common import ROOT, result
+
+# (name, statement), the third party modules are touched the way a script's first api call would load them
+SCENARIOS = (
+    ("import", "import schwabdev"),
+    ("client", "from schwabdev import Client"),
+    ("client_first_call", "from schwabdev import Client; import requests; requests.Session"),
+    ("client_async_first_call", "from schwabdev import ClientAsync; import aiohttp; aiohttp.ClientSession"),
+    ("stream_first_call", "from schwabdev import Stream; import websockets; websockets.connect"),
+)
+
+
+def import_time(statement: str) -> float:
+    """
+    Seconds spent importing modules for a statement in a fresh interpreter (site imports excluded).
+
+    Args:
+        statement (str): python statement to run
+
+    Returns:
+        float: seconds
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import sys; sys.stderr.write('#\\n'); {statement}"],
+                             cwd=ROOT, env=os.environ | {"PYTHONPATH": str(ROOT)}, capture_output=True, text=True, check=True)
+    total = 0
+    for line in process.stderr.split("#\n", 1)[1].splitlines():  # lines after the marker, i.e. after site imports
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if not name[1:].startswith(" "):  # only top level imports, nested ones are included in their cumulative time
+                total += int(cumulative)
+    return total / 1e6
+
+
+def run(quick: bool = False) -> list[dict]:
+    runs = 5 if quick else 15
+    return [result(f"import.{name}", statistics.median(import_time(statement) for _ in range(runs)) * 1000, "ms")
+            for name, statement in SCENARIOS]
+
+
+if __name__ == "__main__":
+    for r in run("--quick" in sys.argv):
+        print(f"{r['name']:<32} {r['value']:>10.2f} {r['unit']}")
@@ -0,0 +1,127 @@
+"""
+Benchmark decoding large responses into dictionaries vs schwabdev.models (msgspec structs if msgspec is installed, and
+the json fallback).
+Measures decode time and the memory retained by the decoded objects (tracemalloc and process RSS).
+
+Usage:
+    python benchmarks/bench_models.py [--count 50000]
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_transactions(count: int) -> bytes:
+    """
+    Synthetic transactions() response with the shape of Schwab's.
+    """
+    return json.dumps([{
+        "activityId": 90000000000 + i, "time": "2024-10-18T14:30:00+0000", "accountNumber": "12345678",
+        "type": "TRADE", "status": "VALID", "subAccount": "MARGIN", "tradeDate": "2024-10-18T14:30:00+0000",
+        "settlementDate": "2024-10-21T00:00:00+0000", "positionId": 2000000000 + i, "orderId": 1000000000 + i,
+        "netAmount": -1523.45, "activityType": "EXECUTION", "description": "BUY TRADE",
+        "user": {"cdDomainId": "A000000012345678", "userName": "ABCD", "userType": "ADVISOR_USER", "userId": 1234567},
+        "transferItems": [
+            {"instrument": {"assetType": "CURRENCY", "symbol": "CURRENCY_USD", "description": "USD currency", "instrumentId": 1},
+             "amount": 0.0, "cost": 0.0, "feeType": "COMMISSION"},
+            {"instrument": {"assetType": "EQUITY", "cusip": "037833100", "symbol": "AAPL", "description": "APPLE INC", "instrumentId": 1973757747},
+             "amount": 10.0, "cost": -1523.45, "price": 152.345, "positionEffect": "OPENING"},
+        ],
+    } for i in range(count)]).encode()
+
+
+def _rss_mb() -> float | None:
+    """
+    Current resident set size (Linux), None if unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return None
+
+
+def _decode(variant: str, body: bytes):
+    if variant == "dict":
+        items = json.loads(body)
+        return items, sum(item["netAmount"] for item in items)
+    from schwabdev import models
+    items = models.Transaction.decode(body)
+    return items, sum(item.netAmount for item in items)
+
+
+def measure(variant: str, count: int, repeat: int = 3) -> dict:
+    if variant == "model_json":
+        sys.modules["msgspec"] = None  # models without msgspec
+    body = make_transactions(count)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items, _ = _decode(variant, body)
+        times.append(time.perf_counter() - start)
+        del items
+    gc.collect()
+    rss_before = _rss_mb()
+    items, _ = _decode(variant, body)
+    gc.collect()
+    rss_after = _rss_mb()
+    del items
+    gc.collect()
+    tracemalloc.start()
+    items, _ = _decode(variant, body)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"variant": variant, "count": count, "decode_ms": round(min(times) * 1000, 2),
+            "retained_mb": round(retained / 2**20, 2),
+            "rss_growth_mb": round(rss_after - rss_before, 2) if rss_before is not None else None}
+
+
+def _has_msgspec() -> bool:
+    return importlib.util.find_spec("msgspec") is not None
+
+
+def _variants(count: int) -> list[dict]:
+    measured = []
+    variants = ("dict", "model", "model_json") if _has_msgspec() else ("dict", "model")
+    for variant in variants:  # separate processes so RSS is not shared between variants
+        output = subprocess.run([sys.executable, __file__, "--variant", variant, "--count", str(count)],
+                                capture_output=True, text=True, check=True).stdout
+        measured.append(json.loads(output))
+    return measured
+
+
+def run(quick: bool = False) -> list[dict]:
+    from common import result
+
+    results = []
+    for measured in _variants(10000 if quick else 50000):
+        name = f"models.transactions.{measured['variant']}"
+        results.append(result(f"{name}.decode", measured["decode_ms"], "ms"))
+        results.append(result(f"{name}.retained", measured["retained_mb"], "MB"))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=50000, help="number of transactions")
+    parser.add_argument("--variant", choices=("dict", "model", "model_json"), help=argparse.SUPPRESS)  # run one variant (subprocess)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(measure(args.variant, args.count)))
+    else:
+        print(json.dumps({"benchmark": "models", "msgspec": _has_msgspec(), "results": _variants(args.count)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Overhead of building request paths and query strings (schwabdev.endpoints).
+"""
+import datetime
+
+from common import per_call, result
+
+from schwabdev import endpoints
+
+
+def run(quick: bool = False) -> list[dict]:
+    number = 20000 if quick else 100000
+    now = datetime.datetime.now(datetime.timezone.utc)
+    chain_args = ("AAPL", None, 10, None, None, None, None, "NTM", now.date(), None, None, None, None, None, None, None, None)
+    results = [
+        result("params.option_chains", per_call(lambda: endpoints.OPTION_CHAINS.build(*chain_args), number) * 1e9, "ns"),
+        result("params.quotes", per_call(lambda: endpoints.QUOTES.build(["AAPL", "MSFT", "AMZN", "NVDA"], None, False), number) * 1e9, "ns"),
+        result("params.quote", per_call(lambda: endpoints.QUOTE.build("/ES", None), number) * 1e9, "ns"),
+        result("params.account_orders", per_call(lambda: endpoints.ACCOUNT_ORDERS.build("HASH", now, now, None, "WORKING"), number) * 1e9, "ns"),
+    ]
+    for fmt, converter in endpoints.TIME_CONVERTERS.items():
+        results.append(result(f"params.time_convert.{fmt.name.lower()}", per_call(lambda: converter(now), number) * 1e9, "ns"))
+    results.append(result("params.time_convert.passthrough", per_call(lambda: endpoints.iso_8601("2024-01-01"), number) * 1e9, "ns"))
+    return results
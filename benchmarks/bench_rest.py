@@ -0,0 +1,143 @@
+"""
+REST request throughput and latency, Client (sync, threads) vs ClientAsync, order entry (place_order vs the
+pre-serialized OrderEntry path), a startup set of different calls (one by one vs client.batch) and the first burst of requests on new vs warmed (ConnectionManager) connections,
+against the local simulator.
+"""
+import asyncio
+import concurrent.futures
+import datetime
+import time
+
+import schwabdev
+from common import latency_results, make_client, simulator
+from schwabdev.connections import ConnectionManager
+from schwabdev.orders import OrderEntry, OrderTemplate
+
+_ORDER = {"orderType": "LIMIT", "session": "NORMAL", "duration": "DAY", "orderStrategyType": "SINGLE", "price": "{price}",
+          "orderLegCollection": [{"instruction": "BUY", "quantity": "{quantity}",
+                                  "instrument": {"symbol": "{symbol}", "assetType": "EQUITY"}}]}
+
+
+def _sync(client, requests: int, concurrency: int) -> tuple[list[float], float]:
+    def one(_):
+        start = time.perf_counter()
+        client.quotes(["AAPL", "MSFT"]).raise_for_status()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if concurrency == 1:
+        latencies = [one(i) for i in range(requests)]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+            latencies = list(executor.map(one, range(requests)))
+    return latencies, time.perf_counter() - start
+
+
+async def _async(url: str, requests: int, concurrency: int) -> tuple[list[float], float]:
+    client = make_client(url, schwabdev.ClientAsync)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.quotes(["AAPL", "MSFT"])
+            response.raise_for_status()
+            await response.read()
+            return time.perf_counter() - start
+
+    async with client:
+        await one()  # warm up the connection
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one() for _ in range(requests)))
+        return list(latencies), time.perf_counter() - start
+
+
+def _orders(client, requests: int) -> dict:
+    account_hash = client.linked_accounts().json()[0]["hashValue"]
+    template = OrderTemplate(_ORDER)
+    order = {**_ORDER, "price": 10.5, "orderLegCollection": [{"instruction": "BUY", "quantity": 3,
+                                                              "instrument": {"symbol": "AMD", "assetType": "EQUITY"}}]}
+
+    def place(_):
+        start = time.perf_counter()
+        client.place_order(account_hash, order).raise_for_status()
+        return time.perf_counter() - start
+
+    with OrderEntry(client, account_hash) as entry:
+        entry.warm()
+
+        def submit(_):
+            start = time.perf_counter()
+            entry.submit(template, price=10.5, quantity=3, symbol="AMD").response.raise_for_status()
+            return time.perf_counter() - start
+
+        batches = {}
+        for name, func in (("place_order", place), ("entry", submit)):
+            start = time.perf_counter()
+            latencies = [func(i) for i in range(requests)]
+            batches[name] = (latencies, time.perf_counter() - start)
+    return batches
+
+
+def _startup(client, repeats: int) -> dict:
+    # the calls a trading script typically makes at startup
+    account_hash = client.linked_accounts().json()[0]["hashValue"]
+    now = datetime.datetime.now(datetime.timezone.utc)
+    calls = [("quotes", ["AAPL", "MSFT", "AMD"]), "linked_accounts", ("account_details_all", "positions"),
+             ("account_orders", account_hash, now - datetime.timedelta(days=1), now), ("market_hours", ["equity", "option"]),
+             ("transactions", account_hash, now - datetime.timedelta(days=7), now, "TRADE"), "preferences", ("quote", "SPY")]
+
+    def one_by_one():
+        for name, *args in (call if isinstance(call, tuple) else (call,) for call in calls):
+            getattr(client, name)(*args).raise_for_status()
+
+    batches = {}
+    for name, func in (("one_by_one", one_by_one), ("batch", lambda: client.batch(calls))):
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - start)
+        batches[name] = (latencies, sum(latencies))
+    return batches
+
+
+def _burst(url: str, repeats: int, concurrency: int = 8) -> dict:
+    # a burst of concurrent requests from a new client: each opens a connection unless they were opened beforehand
+    batches = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for name in ("cold", "warm"):
+            latencies, elapsed = [], 0.0
+            for _ in range(repeats):
+                client = make_client(url)
+                if name == "warm":
+                    ConnectionManager(client, connections=concurrency).warm()
+                start = time.perf_counter()
+                list(executor.map(lambda _: client.quotes(["AAPL", "MSFT"]).raise_for_status(), range(concurrency)))
+                latencies.append(time.perf_counter() - start)
+                elapsed += latencies[-1]
+                client.close()
+            batches[name] = (latencies, elapsed)
+    return batches
+
+
+def run(quick: bool = False) -> list[dict]:
+    requests = 200 if quick else 1000
+    results = []
+    with simulator() as url:
+        client = make_client(url)
+        client.quotes("AAPL")  # warm up the connection
+        for concurrency in (1, 8):
+            results += latency_results(f"rest.sync.c{concurrency}", *_sync(client, requests, concurrency))
+            results += latency_results(f"rest.async.c{concurrency}", *asyncio.run(_async(url, requests, concurrency)))
+        for name, batch in _orders(client, requests).items():
+            results += latency_results(f"rest.orders.{name}", *batch)
+        client.close()
+        for name, batch in _burst(url, 20 if quick else 100).items():
+            results += latency_results(f"rest.burst.{name}", *batch)
+    with simulator(latency=0.02) as url:  # with network latency, where running calls concurrently pays off
+        client = make_client(url)
+        for name, batch in _startup(client, 10 if quick else 50).items():
+            results += latency_results(f"rest.startup.{name}", *batch)
+        client.close()
+    return results
@@ -0,0 +1,138 @@
+"""
+Streaming hot paths: frames/sec through _run_streamer (sync and async receivers), translating messages with
+stream_fields, replaying 10k subscriptions on (re)connect and bursts of send() calls from a thread.
+"""
+import json
+import threading
+import time
+
+import schwabdev
+from common import make_client, per_call, result, simulator
+from schwabdev.translate import iter_data, stream_fields
+
+
+def _frames(url: str, seconds: float, is_async: bool) -> tuple[float, float]:
+    """
+    Returns:
+        tuple[float, float]: frames per second (wall clock) and frames per second of client cpu time
+    """
+    client = make_client(url)
+    stream = schwabdev.Stream(client)
+    count = [0]
+    if is_async:
+        async def receiver(message):
+            count[0] += 1
+    else:
+        def receiver(message):
+            count[0] += 1
+    stream.send(stream.level_one_equities(["AAPL", "MSFT", "AMZN", "NVDA", "GOOGL"], "0,1,2,3,4,5,8"))
+    stream.start(receiver)
+    time.sleep(0.5)  # connect, login and subscribe
+    start_count, start, start_cpu = count[0], time.perf_counter(), time.process_time()
+    time.sleep(seconds)
+    frames = count[0] - start_count
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - start_cpu
+    stream.stop()
+    client.close()
+    return frames / elapsed, frames / cpu if cpu else 0.0
+
+
+def _translate(message: str) -> list[dict]:
+    translated = []
+    for service, _, content in iter_data(message):
+        names = stream_fields[service]
+        translated.append({names[int(k)] if k.isdigit() else k: v for k, v in content.items()})
+    return translated
+
+
+def _replay(url: str, keys: int, option_keys: bool = False) -> tuple[float, float]:
+    """
+    Returns:
+        tuple[float, float]: seconds from start to login response and from login response to the last replayed subscription's response
+    """
+    client = make_client(url)
+    stream = schwabdev.Stream(client)
+    times = {}
+    done = threading.Event()
+    acknowledged = [0]
+
+    def receiver(message):
+        now = time.perf_counter()
+        if '"LOGIN"' in message:
+            times["login"] = now
+        elif '"response"' in message:
+            acknowledged[0] += message.count('"ADD"')
+            if acknowledged[0] >= expected:
+                times["replayed"] = now
+                done.set()
+
+    if option_keys:  # e.g. "AAPL  250117C00150000"
+        symbols = [f"SYM{i // 400:<3}  2501{17 + i // 200 % 2:02}{'CP'[i % 2]}{i % 200 * 500:08}" for i in range(keys)]
+        stream.send(stream.level_one_options(symbols, "0,2,3,4,8,10,28,29,30"))  # recorded before start
+    else:
+        stream.send(stream.level_one_equities([f"SYM{i}" for i in range(keys)], "0,1,2,3"))
+    expected = len(stream.subscription_requests(stream.subscriptions, current={}))
+    start = time.perf_counter()
+    stream.start(receiver)
+    done.wait(timeout=60)
+    stream.stop()
+    client.close()
+    return times["login"] - start, times["replayed"] - times["login"]
+
+
+def _sends(url: str, count: int, shared: bool) -> tuple[float, float]:
+    """
+    Returns:
+        tuple[float, float]: seconds per send() call and seconds until every request of the burst was acknowledged
+    """
+    client = make_client(url)
+    loop = schwabdev.SharedLoop() if shared else None
+    stream = loop.stream(client) if shared else schwabdev.Stream(client)
+    acknowledged = [0]
+    done = threading.Event()
+
+    def receiver(message):
+        if '"response"' in message:
+            acknowledged[0] += message.count('"ADD"')
+            if acknowledged[0] >= count:
+                done.set()
+
+    stream.start(receiver)
+    time.sleep(0.3)  # connect and login
+    start = time.perf_counter()
+    for i in range(count):
+        stream.send(stream.level_one_equities(f"SYM{i}", "0,1,2,3"))
+    sent = time.perf_counter()
+    done.wait(timeout=30)
+    acked = time.perf_counter()
+    stream.stop()
+    if shared:
+        loop.stop()
+    client.close()
+    return (sent - start) / count, acked - start
+
+
+def run(quick: bool = False) -> list[dict]:
+    seconds = 2 if quick else 5
+    results = []
+    with simulator(rate=100000) as url:
+        for name, is_async in (("sync", False), ("async", True)):
+            wall, cpu = _frames(url, seconds, is_async)
+            results.append(result(f"stream.frames.{name}_receiver", wall, "frames/s", "higher"))
+            results.append(result(f"stream.frames.{name}_receiver_cpu", cpu, "frames/cpu-s", "higher"))
+
+    message = json.dumps({"data": [{"service": "LEVELONE_EQUITIES", "timestamp": 1700000000000, "command": "SUBS",
+                                    "content": [{"key": f"SYM{i}", "1": 100.1, "2": 100.2, "3": 100.15, "4": 3, "5": 7,
+                                                 "8": 123456, "33": 100.15, "34": 1700000000000} for i in range(10)]}]})
+    results.append(result("stream.translate.levelone_10_keys", per_call(lambda: _translate(message), 2000 if quick else 10000) * 1e6, "us"))
+
+    with simulator(rate=0) as url:
+        login, replay = _replay(url, 10000)
+        results.append(result("stream.login", login * 1000, "ms"))
+        results.append(result("stream.replay.10k_keys", replay * 1000, "ms"))
+        results.append(result("stream.replay.20k_option_keys", _replay(url, 20000, option_keys=True)[1] * 1000, "ms"))
+        for name, shared in (("own_loop", False), ("shared_loop", True)):
+            per_send, burst = _sends(url, 1000, shared)
+            results.append(result(f"stream.send.{name}", per_send * 1e6, "us"))
+            results.append(result(f"stream.send.{name}.1000_acked", burst * 1000, "ms"))
+    return results
@@ -0,0 +1,25 @@
+"""
+Token hot paths: the per-request expiry check and access token refreshes (plain and encrypted database).
+"""
+import time
+
+from cryptography.fernet import Fernet
+
+from common import make_client, per_call, result, simulator
+
+
+def run(quick: bool = False) -> list[dict]:
+    results = []
+    refreshes = 20 if quick else 100
+    with simulator() as url:
+        for name, encryption in (("plain", None), ("encrypted", Fernet.generate_key().decode())):
+            client = make_client(url, encryption=encryption)
+            if name == "plain":
+                results.append(result("tokens.check", per_call(client.tokens.update_tokens, 10000 if quick else 50000) * 1e6, "us"))
+                results.append(result("tokens.client_check", per_call(client.update_tokens, 10000 if quick else 50000) * 1e6, "us"))
+            start = time.perf_counter()
+            for _ in range(refreshes):
+                client.update_tokens(force_access_token=True)
+            results.append(result(f"tokens.refresh.{name}", (time.perf_counter() - start) / refreshes * 1000, "ms"))
+            client.close()
+    return results
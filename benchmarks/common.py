@@ -0,0 +1,140 @@
+"""
+Shared helpers for the benchmarks.
+"""
+import contextlib
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import requests
+
+import schwabdev
+from schwabdev.simulator import Simulator
+
+logging.getLogger("Schwabdev").setLevel(logging.ERROR)
+
+
+def result(name: str, value: float, unit: str, better: str = "lower", **extra) -> dict:
+    """
+    One benchmark measurement.
+
+    Args:
+        name (str): measurement name (unique across the suite)
+        value (float): measured value
+        unit (str): unit of the value
+        better (str): "lower" or "higher", the direction of an improvement. Defaults to "lower".
+        **extra: additional information to record
+    """
+    return {"name": name, "value": round(value, 4), "unit": unit, "better": better} | extra
+
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    Percentile (0-100) of the values (nearest rank).
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered) + 0.5)) - 1))]
+
+
+def latency_results(prefix: str, latencies: list[float], elapsed: float) -> list[dict]:
+    """
+    Throughput and latency percentiles of a batch of requests.
+    """
+    return [result(f"{prefix}.throughput", len(latencies) / elapsed, "req/s", "higher"),
+            result(f"{prefix}.p50", percentile(latencies, 50) * 1000, "ms"),
+            result(f"{prefix}.p99", percentile(latencies, 99) * 1000, "ms")]
+
+
+def per_call(func, number: int) -> float:
+    """
+    Best of 5 runs of the mean seconds per call.
+    """
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+@contextlib.contextmanager
+def simulator(rate: float | None = None, latency: float = 0.0):
+    """
+    Run the simulator in a separate process so it does not compete with the measured client for the GIL.
+
+    Args:
+        rate (float | None): streamer messages per second for every service, None for the simulator's defaults.
+        latency (float): seconds added to every REST response. Defaults to 0.
+
+    Yields:
+        str: base url of the simulator
+    """
+    args = ["-m", "schwabdev.simulator", "--latency", str(latency)]
+    if rate is not None:
+        args += ["--rate", str(rate)]
+    with _server(args, "Simulator") as url:
+        yield url
+
+
+@contextlib.contextmanager
+def h2_server(latency: float = 0.0):
+    """
+    Run the HTTP/2 + HTTP/1.1 stand-in server (h2server.py, needs httpx[http2]) in a separate process.
+
+    Args:
+        latency (float): seconds added to every response. Defaults to 0.
+
+    Yields:
+        str: base url of the server
+    """
+    with _server([str(Path(__file__).resolve().parent / "h2server.py"), "--latency", str(latency)], "HTTP/2 stand-in") as url:
+        yield url
+
+
+@contextlib.contextmanager
+def _server(args: list[str], name: str):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = os.environ | {"PYTHONPATH": str(ROOT) + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    process = subprocess.Popen([sys.executable] + args + ["--port", str(port)], env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"{name} did not start")
+                time.sleep(0.05)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def authorize(auth_url: str) -> str:
+    """
+    call_on_auth for a simulator in another process (follows the authorize redirect).
+    """
+    return requests.get(auth_url, allow_redirects=False).headers["Location"]
+
+
+def make_client(url: str, cls=schwabdev.Client, tokens_db: str | None = None, **kwargs):
+    """
+    Make a client authorized against the simulator (with a fresh tokens database unless one is given, and no rate limit).
+    """
+    tokens_db = tokens_db or os.path.join(tempfile.mkdtemp(prefix="schwabdev-bench-"), "tokens.db")
+    return cls(Simulator.app_key, Simulator.app_secret, tokens_db=tokens_db, base_url=url,
+               call_on_auth=authorize, rate_limit=None, order_rate_limit=None, **kwargs)
@@ -0,0 +1,109 @@
+"""
+HTTP/2 (cleartext with prior knowledge) and HTTP/1.1 stand-in server for the transport benchmark, every request gets the
+same JSON quotes body.
+
+Usage:
+    python benchmarks/h2server.py --port 8081 --latency 0.005
+"""
+import argparse
+import asyncio
+import json
+
+import h11
+import h2.config
+import h2.connection
+import h2.events
+import h2.settings
+
+_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+_BODY = json.dumps({symbol: {"assetMainType": "EQUITY", "symbol": symbol, "realtime": True,
+                             "quote": {"askPrice": 100.02, "bidPrice": 100.0, "lastPrice": 100.01, "totalVolume": 1000000}}
+                    for symbol in ("AAPL", "MSFT")}).encode()
+
+
+class StandIn:
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency (float): seconds added to every response. Defaults to 0.
+        """
+        self.latency = latency
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            first = await reader.readexactly(len(_PREFACE))
+            if first == _PREFACE:
+                await self._http2(first, reader, writer)
+            else:
+                await self._http1(first, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _http2(self, first: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        connection.update_settings({h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 1000})
+        writer.write(connection.data_to_send())
+        tasks = set()
+
+        async def respond(stream_id: int):
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            connection.send_headers(stream_id, [(":status", "200"), ("content-type", "application/json"),
+                                                ("content-length", str(len(_BODY)))])
+            connection.send_data(stream_id, _BODY, end_stream=True)
+            writer.write(connection.data_to_send())
+
+        data = first
+        while data:
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.StreamEnded):
+                    task = asyncio.ensure_future(respond(event.stream_id))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif isinstance(event, h2.events.DataReceived):
+                    connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(connection.data_to_send())
+            await writer.drain()
+            data = await reader.read(65536)
+
+    async def _http1(self, first: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = h11.Connection(h11.SERVER)
+        connection.receive_data(first)
+        while True:
+            event = connection.next_event()
+            if event is h11.NEED_DATA:
+                data = await reader.read(65536)
+                connection.receive_data(data)
+                if not data:
+                    return
+            elif isinstance(event, h11.EndOfMessage):
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(connection.send(h11.Response(status_code=200, headers=[("Content-Type", "application/json"),
+                                                                                   ("Content-Length", str(len(_BODY)))])))
+                writer.write(connection.send(h11.Data(data=_BODY)))
+                writer.write(connection.send(h11.EndOfMessage()))
+                await writer.drain()
+                connection.start_next_cycle()
+            elif isinstance(event, h11.ConnectionClosed):
+                return
+
+
+async def main(port: int, latency: float):
+    server = await asyncio.start_server(StandIn(latency).handle, "127.0.0.1", port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP/2 and HTTP/1.1 stand-in server for transport benchmarks")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.port, args.latency))
@@ -0,0 +1,99 @@
+"""
+Run the Schwabdev benchmark suite (offline, against the local simulator) and write machine readable results.
+
+Usage:
+    python benchmarks/run.py                                  # all benchmarks, results to benchmarks/results.json
+    python benchmarks/run.py --quick --only rest,stream       # a shorter run of some benchmarks
+    python benchmarks/run.py --compare baseline.json          # exit 1 if a result regressed more than --threshold
+
+Each bench_<name>.py module has run(quick) returning a list of results:
+    {"name": ..., "value": ..., "unit": ..., "better": "lower" | "higher"}
+"""
+import argparse
+import datetime
+import importlib
+import json
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+import common  # noqa: E402 (sets up the import path)
+import schwabdev  # noqa: E402
+
+BENCHMARKS = ("import", "params", "tokens", "rest", "http2", "stream", "models")
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[dict]:
+    """
+    Find results that are worse than the baseline by more than the threshold.
+
+    Args:
+        results (list[dict]): current results
+        baseline (list[dict]): baseline results
+        threshold (float): allowed relative change (0.1 = 10%)
+
+    Returns:
+        list[dict]: regressions (name, baseline, value, change)
+    """
+    previous = {r["name"]: r for r in baseline}
+    regressions = []
+    for r in results:
+        base = previous.get(r["name"])
+        if base is None or not base["value"]:
+            continue
+        change = (r["value"] - base["value"]) / abs(base["value"])
+        worse = change if r.get("better", "lower") == "lower" else -change
+        if worse > threshold:
+            regressions.append({"name": r["name"], "baseline": base["value"], "value": r["value"], "change": round(change, 4)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schwabdev benchmark suite")
+    parser.add_argument("--only", help=f"comma separated benchmarks to run ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations (less stable numbers)")
+    parser.add_argument("--output", default=str(HERE / "results.json"), help="file to write results to ('-' for stdout)")
+    parser.add_argument("--compare", help="baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change counted as a regression. Defaults to 0.2.")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else BENCHMARKS
+    results = []
+    for name in names:
+        print(f"[Schwabdev] Running {name} benchmark...", file=sys.stderr)
+        results += importlib.import_module(f"bench_{name}").run(args.quick)
+
+    report = {"schwabdev": schwabdev.__version__, "commit": _commit(), "python": platform.python_version(),
+              "platform": platform.platform(), "machine": platform.machine(), "quick": args.quick,
+              "time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        Path(args.output).write_text(text)
+        for r in results:
+            print(f"{r['name']:<48} {r['value']:>14,.4f} {r['unit']}", file=sys.stderr)
+        print(f"[Schwabdev] Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text())["results"], args.threshold)
+        for r in regressions:
+            print(f"[Schwabdev] Regression: {r['name']} {r['baseline']} -> {r['value']} ({r['change']:+.1%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
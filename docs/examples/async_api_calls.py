@@ -5,6 +5,7 @@ import os
 import asyncio
 import dotenv
 import schwabdev
+from schwabdev.batch import Call
 
 dotenv.load_dotenv()
 
@@ -22,7 +23,13 @@ async def main():
 
         print([result.result() for result in results])
 
+        # or run different calls together with client.batch (results in order, with timing and errors)
+        results = await client.batch([("quotes", tickers), Call("account_details_all", fields="positions", parsed=True),
+                                      ("market_hours", ["equity", "option"])])
+        for result in results:
+            print(result)
+
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+"""
+This file is an example of repricing a whole option chain locally with schwabdev.pricing (requires numpy).
+The chain is loaded once and repriced (keeping each contract's implied volatility) whenever the streamed underlying price changes.
+"""
+import logging
+import os
+
+import dotenv
+
+import schwabdev
+from schwabdev import pricing
+
+# load environment
+dotenv.load_dotenv()
+
+# set logging level
+logging.basicConfig(level=logging.INFO)
+
+# make a client and stream
+client = schwabdev.Client(os.getenv('app_key'), os.getenv('app_secret'), os.getenv('callback_url'))
+streamer = schwabdev.Stream(client)
+
+# load every expiration as a columnar chain
+chain = schwabdev.OptionChain.from_json(client.full_chain("AAPL"))
+print(f"Loaded {len(chain)} contracts for {chain.underlying_symbol} @ {chain.underlying_price}")
+
+# implied volatility and greeks for every contract at once
+pricer = pricing.ChainPricer(chain, model="bs")
+values = pricer.reprice()
+print(f"Delta of {chain.symbols[0]}: {values['delta'][0]:.4f} (Schwab: {chain['delta'][0]:.4f})")
+
+# reprice the surface on every underlying trade
+streamer.start(pricer.on_stream)
+streamer.send(streamer.level_one_equities(chain.underlying_symbol, "0,3"))
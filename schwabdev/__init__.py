@@ -1,4 +1,44 @@
-from .client import Client, ClientAsync
-from .stream import Stream, StreamAsync
-from .translate import stream_fields
-__version__ = "3.0.3"
\ No newline at end of file
+import importlib
+
+__version__ = "3.0.3"
+
+# public names and the submodules they live in, imported on first access so `import schwabdev` stays fast
+_exports = {
+    "Client": "client",
+    "ClientAsync": "client",
+    "Stream": "stream",
+    "StreamAsync": "stream",
+    "SharedLoop": "loop",
+    "stream_fields": "translate",
+    "OptionChain": "chain",
+    "LiveChain": "chain",
+    "BarAggregator": "bars",
+    "IndicatorEngine": "indicators",
+    "OrderManager": "orders",
+    "Portfolio": "portfolio",
+    "MarketCalendar": "calendar",
+    "ConnectionManager": "connections",
+    "ConnectionManagerAsync": "connections",
+    "Poller": "poller",
+    "PollerAsync": "poller",
+}
+_submodules = {"bars", "batch", "calendar", "chain", "client", "connections", "endpoints", "enums", "hooks", "indicators",
+               "jsonstream", "limiter", "loop", "models", "orders", "poller", "portfolio", "pricing", "simulator", "stream",
+               "subscriptions", "tokens", "translate", "transport"}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str):
+    if name in _exports:
+        value = getattr(importlib.import_module(f".{_exports[name]}", __name__), name)
+    elif name in _submodules:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports) | _submodules)
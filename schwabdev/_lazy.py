@@ -0,0 +1,41 @@
+"""
+Schwabdev Lazy Import Module.
+Defers importing heavy dependencies until they are first used.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import importlib.util
+import sys
+import threading
+
+_lock = threading.Lock()
+
+
+def lazy_import(name: str):
+    """
+    Import a module lazily, it is only executed when one of its attributes is first accessed.
+
+    Args:
+        name (str): module name, e.g. "aiohttp" or "cryptography.fernet"
+
+    Returns:
+        module | None: the (lazy) module, None if it is not installed
+    """
+    with _lock:  # one module object per name when threads race to create it
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        try:
+            spec = importlib.util.find_spec(name)
+        except ModuleNotFoundError:  # parent package is not installed
+            return None
+        if spec is None:
+            return None
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        parent, _, child = name.rpartition(".")
+        if parent:  # like a normal import, so `import a.b` elsewhere followed by `a.b.x` works
+            setattr(sys.modules[parent], child, module)
+        return module
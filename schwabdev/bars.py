@@ -0,0 +1,380 @@
+"""
+Schwabdev Bars Module.
+Incremental OHLCV bars for many symbols and timeframes, built from streamed ticks (LEVELONE) and one-minute bars (CHART).
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import threading
+
+from .translate import iter_data
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (pip install schwabdev[numpy])
+    np = None
+
+_UNITS = {"s": 1000, "m": 60000, "h": 3600000}
+_MINUTE = 60000
+
+# LEVELONE service: (last price, last size, trade time) fields
+_TICK_FIELDS = {"LEVELONE_EQUITIES": ("3", "9", "35"),
+                "LEVELONE_OPTIONS": ("4", "18", "39"),
+                "LEVELONE_FUTURES": ("3", "9", "11"),
+                "LEVELONE_FUTURES_OPTIONS": ("3", "9", "11"),
+                "LEVELONE_FOREX": ("3", "7", "9")}
+
+# CHART service: (sequence, open, high, low, close, volume, chart time) fields
+_CHART_FIELDS = {"CHART_EQUITY": ("1", "2", "3", "4", "5", "6", "7"),
+                 "CHART_FUTURES": (None, "2", "3", "4", "5", "6", "1")}
+
+
+def timeframe_ms(timeframe: str | int) -> int:
+    """
+    Convert a timeframe to milliseconds.
+
+    Args:
+        timeframe (str | int): e.g. "5s", "1m", "15m", "1h", or seconds
+
+    Returns:
+        int: milliseconds
+    """
+    if isinstance(timeframe, int):
+        return timeframe * 1000
+    unit = _UNITS.get(timeframe[-1:])
+    if unit is None or not timeframe[:-1].isdigit() or int(timeframe[:-1]) <= 0:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(timeframe[:-1]) * unit
+
+
+class BarSeries:
+
+    columns = ("time", "open", "high", "low", "close", "volume")
+
+    def __init__(self, timeframe: int, capacity: int):
+        """
+        Ring buffer of the most recent bars of one symbol and timeframe, in time order.
+
+        Args:
+            timeframe (int): bar length in milliseconds
+            capacity (int): maximum bars kept (the oldest are overwritten)
+        """
+        if np is None:
+            raise ImportError("numpy is required to use schwabdev.bars (pip install schwabdev[numpy])")
+        self.timeframe = timeframe                                  # bar length (ms)
+        self.capacity = capacity                                    # maximum bars
+        self.count = 0                                              # bars in the buffer
+        self._data = np.full((len(self.columns) + 1, capacity), np.nan)  # rows: columns and sequence, times are epoch ms
+        self._head = 0                                              # physical index of the oldest bar
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _slot(self, i: int) -> int:
+        return (self._head + i) % self.capacity
+
+    def _find(self, time: float) -> int | None:
+        """
+        Logical index of the bar starting at time (searching from the newest), None if it is not in the buffer.
+        """
+        times = self._data[0]
+        for i in range(self.count - 1, -1, -1):
+            t = times[self._slot(i)]
+            if t == time:
+                return i
+            if t < time:
+                return None
+        return None
+
+    def _append(self, values: tuple, sequence: float):
+        slot = self._slot(self.count) if self.count < self.capacity else self._head
+        self._data[:-1, slot] = values
+        self._data[-1, slot] = sequence
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self._head = (self._head + 1) % self.capacity
+
+    def _insert(self, values: tuple, sequence: float):
+        """
+        Insert a late bar between existing ones (rare, the buffer is rewritten in order).
+        """
+        data = self._ordered()
+        position = int(np.searchsorted(data[0], values[0]))
+        data = np.insert(data, position, list(values) + [sequence], axis=1)[:, -self.capacity:]
+        self._data[:, :data.shape[1]] = data
+        self._head, self.count = 0, data.shape[1]
+
+    def _ordered(self):
+        return np.roll(self._data, -self._head, axis=1)[:, :self.count]
+
+    @property
+    def last_time(self) -> float | None:
+        """
+        Start time (epoch ms) of the newest bar, None if empty.
+        """
+        return self._data[0, self._slot(self.count - 1)] if self.count else None
+
+    def merge(self, time: float, open: float, high: float, low: float, close: float, volume: float) -> bool:
+        """
+        Merge a tick or partial bar into the bar starting at time (a late one only updates high, low and volume).
+
+        Returns:
+            bool: True if a new (newest) bar was started
+        """
+        last = self.last_time
+        if last is None or time > last:
+            self._append((time, open, high, low, close, volume), np.nan)
+            return True
+        i = self._find(time)
+        if i is None:
+            if self.count and time > self._data[0, self._head]:
+                self._insert((time, open, high, low, close, volume), np.nan)
+            return False  # older than the buffer: dropped
+        slot = self._slot(i)
+        data = self._data
+        data[2, slot] = max(data[2, slot], high)
+        data[3, slot] = min(data[3, slot], low)
+        if time == last:
+            data[4, slot] = close
+        data[5, slot] += volume
+        return False
+
+    def set(self, time: float, open: float, high: float, low: float, close: float, volume: float, sequence: float = float("nan")) -> int:
+        """
+        Set (replace) the bar starting at time, e.g. a corrected bar. Updates with a lower sequence than the stored bar are ignored.
+
+        Returns:
+            int: 1 if a new (newest) bar was started, 0 if a bar was replaced or inserted, -1 if ignored
+        """
+        last = self.last_time
+        if last is None or time > last:
+            self._append((time, open, high, low, close, volume), sequence)
+            return 1
+        i = self._find(time)
+        if i is None:
+            if self.count and time > self._data[0, self._head]:
+                self._insert((time, open, high, low, close, volume), sequence)
+                return 0
+            return -1
+        slot = self._slot(i)
+        if sequence < self._data[-1, slot]:  # stale (NaN compares False)
+            return -1
+        self._data[:-1, slot] = (time, open, high, low, close, volume)
+        self._data[-1, slot] = sequence
+        return 0
+
+    def between(self, start: float, end: float):
+        """
+        Bars with start <= time < end.
+
+        Returns:
+            numpy.ndarray: rows time, open, high, low, close, volume (one column per bar)
+        """
+        data = self._ordered()[:-1]
+        return data[:, (data[0] >= start) & (data[0] < end)]
+
+    def bar(self, i: int = -1) -> dict | None:
+        """
+        One bar by logical index (-1 for the newest).
+
+        Returns:
+            dict | None: time, open, high, low, close, volume (None if out of range)
+        """
+        if not -self.count <= i < self.count:
+            return None
+        slot = self._slot(i % self.count)
+        return {name: float(self._data[row, slot]) for row, name in enumerate(self.columns)}
+
+    def arrays(self, count: int | None = None) -> dict:
+        """
+        Copy of the newest bars as arrays, oldest first.
+
+        Args:
+            count (int | None): number of bars, None for all. Defaults to None.
+
+        Returns:
+            dict[str, numpy.ndarray]: column name -> array
+        """
+        data = self._ordered()
+        if count is not None:
+            data = data[:, -count:] if count else data[:, :0]
+        return {name: data[row].copy() for row, name in enumerate(self.columns)}
+
+
+class BarAggregator:
+
+    def __init__(self, timeframes: tuple | list = ("1m", "5m", "15m"), capacity: int = 1000, on_bar=None):
+        """
+        Build OHLCV bars for every streamed symbol and timeframe, pass aggregator.on_stream as (or call it from) the stream receiver.
+        Sub-minute timeframes are built from LEVELONE trades. Minute and longer timeframes are built from CHART_EQUITY/CHART_FUTURES
+        one-minute bars once a symbol receives them (so corrected bars are applied), otherwise from LEVELONE trades.
+
+        Args:
+            timeframes (tuple | list): timeframes to build, e.g. ("5s", "1m", "5m", "15m", "1h"). Defaults to ("1m", "5m", "15m").
+            capacity (int): bars kept per symbol and timeframe. Defaults to 1000.
+            on_bar (function | None): called with (symbol, timeframe, bar) when a bar completes (a newer one starts). Defaults to None.
+        """
+        if np is None:
+            raise ImportError("numpy is required to use schwabdev.bars (pip install schwabdev[numpy])")
+        self.timeframes = {timeframe: timeframe_ms(timeframe) for timeframe in timeframes}  # timeframe -> ms
+        self.capacity = capacity                                    # bars per series
+        self.on_bar = on_bar                                        # bar completed callback
+        self.lock = threading.RLock()                               # held while updating or reading
+        self._series = {}                                           # (symbol, timeframe) -> BarSeries
+        self._minutes = {}                                          # symbol -> BarSeries of one-minute bars (rollup source)
+        self._minute_capacity = max([capacity] + [2 * ms // _MINUTE for ms in self.timeframes.values()])
+        self._charted = set()                                       # symbols receiving CHART bars
+        self._last_price = {}                                       # symbol -> last trade price
+
+    def _get_series(self, symbol: str, timeframe: str) -> BarSeries:
+        series = self._series.get((symbol, timeframe))
+        if series is None:
+            series = self._series[(symbol, timeframe)] = BarSeries(self.timeframes[timeframe], self.capacity)
+        return series
+
+    def _completed(self, symbol: str, timeframe: str, series: BarSeries):
+        if self.on_bar is not None and len(series) > 1:
+            self.on_bar(symbol, timeframe, series.bar(-2))
+
+    def _rollup(self, symbol: str, minute: float):
+        """
+        Recompute the bars containing a (new or corrected) one-minute bar from the one-minute bars.
+        """
+        minutes = self._minutes[symbol]
+        for timeframe, ms in self.timeframes.items():
+            if ms < _MINUTE:
+                continue
+            start = minute - minute % ms
+            bars = minutes.between(start, start + ms)
+            if not bars.shape[1]:
+                continue
+            series = self._get_series(symbol, timeframe)
+            if series.set(start, bars[1, 0], bars[2].max(), bars[3].min(), bars[4, -1], bars[5].sum()) == 1:
+                self._completed(symbol, timeframe, series)
+
+    def add_minute_bar(self, symbol: str, time: float, open: float, high: float, low: float, close: float, volume: float, sequence: float | None = None):
+        """
+        Add (or correct) a one-minute bar and update the longer timeframes.
+
+        Args:
+            symbol (str): symbol
+            time (float): bar start time (epoch ms)
+            sequence (float | None): sequence number, a bar is only replaced by one with an equal or higher sequence. Defaults to None.
+        """
+        with self.lock:
+            minutes = self._minutes.get(symbol)
+            if minutes is None:
+                minutes = self._minutes[symbol] = BarSeries(_MINUTE, self._minute_capacity)
+            if minutes.set(time, open, high, low, close, volume, np.nan if sequence is None else sequence) >= 0:
+                self._rollup(symbol, time)
+
+    def add_trade(self, symbol: str, time: float, price: float, size: float = 0.0):
+        """
+        Add a trade (tick) to every timeframe built from trades for the symbol.
+
+        Args:
+            symbol (str): symbol
+            time (float): trade time (epoch ms)
+            price (float): trade price
+            size (float): trade size. Defaults to 0.
+        """
+        with self.lock:
+            charted = symbol in self._charted
+            for timeframe, ms in self.timeframes.items():
+                if charted and ms >= _MINUTE:
+                    continue
+                series = self._get_series(symbol, timeframe)
+                if series.merge(time - time % ms, price, price, price, price, size):
+                    self._completed(symbol, timeframe, series)
+
+    def on_stream(self, message, **kwargs):
+        """
+        Stream receiver that adds LEVELONE trades and CHART bars.
+
+        Args:
+            message (str | dict): message from the stream
+        """
+        with self.lock:
+            for service, timestamp, content in iter_data(message):
+                key = content.get("key")
+                fields = _TICK_FIELDS.get(service)
+                if fields is not None:
+                    price_field, size_field, time_field = fields
+                    if price_field in content:
+                        self._last_price[key] = content[price_field]
+                    elif time_field not in content:
+                        continue  # quote update without a trade
+                    price = self._last_price.get(key)
+                    if price is not None:
+                        self.add_trade(key, content.get(time_field, timestamp), price,
+                                       content.get(size_field, 0) if time_field in content else 0)
+                    continue
+                fields = _CHART_FIELDS.get(service)
+                if fields is not None and all(field in content for field in fields[1:]):
+                    self._charted.add(key)
+                    sequence, open_, high, low, close, volume, time = (content.get(field) if field else None for field in fields)
+                    self.add_minute_bar(key, time, open_, high, low, close, volume, sequence)
+
+    def seed(self, symbol: str, history: dict, period: str | int = "1m"):
+        """
+        Fill history from price_history() so the newest bars are available before streaming starts.
+        One-minute candles fill every minute and longer timeframe, longer candles fill the timeframes that are multiples of them.
+
+        Args:
+            symbol (str): symbol
+            history (dict): parsed response of price_history() ({"candles": [{"datetime", "open", "high", "low", "close", "volume"}, ...]})
+            period (str | int): candle length of the history (its frequency), e.g. "1m", "5m" or "30m". Defaults to "1m".
+        """
+        period = timeframe_ms(period)
+        candles = sorted(history.get("candles", ()), key=lambda candle: candle["datetime"])
+        with self.lock:
+            if period == _MINUTE:
+                for candle in candles:
+                    self.add_minute_bar(symbol, candle["datetime"], candle["open"], candle["high"], candle["low"], candle["close"], candle["volume"])
+                return
+            for timeframe, ms in self.timeframes.items():
+                if ms % period:
+                    continue
+                series = self._get_series(symbol, timeframe)
+                for candle in candles:
+                    series.merge(candle["datetime"] - candle["datetime"] % ms, candle["open"], candle["high"], candle["low"], candle["close"], candle["volume"])
+
+    def series(self, symbol: str, timeframe: str) -> BarSeries | None:
+        """
+        Returns:
+            BarSeries | None: bars of a symbol and timeframe (None if there are none yet)
+        """
+        return self._series.get((symbol, timeframe))
+
+    def bars(self, symbol: str, timeframe: str, count: int | None = None) -> dict:
+        """
+        Copy of the newest bars of a symbol and timeframe, oldest first (the newest bar may still be forming).
+
+        Args:
+            symbol (str): symbol
+            timeframe (str): timeframe, e.g. "5m"
+            count (int | None): number of bars, None for all. Defaults to None.
+
+        Returns:
+            dict[str, numpy.ndarray]: time (epoch ms), open, high, low, close and volume arrays (empty if there are no bars)
+        """
+        with self.lock:
+            series = self._series.get((symbol, timeframe))
+            if series is None:
+                return {name: np.empty(0) for name in BarSeries.columns}
+            return series.arrays(count)
+
+    def last(self, symbol: str, timeframe: str) -> dict | None:
+        """
+        Returns:
+            dict | None: newest (possibly still forming) bar of a symbol and timeframe, None if there are no bars
+        """
+        with self.lock:
+            series = self._series.get((symbol, timeframe))
+            return series.bar(-1) if series is not None else None
+
+    @property
+    def symbols(self) -> list[str]:
+        """
+        Symbols that have bars.
+        """
+        return sorted({symbol for symbol, _ in self._series})
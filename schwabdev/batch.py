@@ -0,0 +1,79 @@
+"""
+Schwabdev Batch Module.
+Call descriptors and results for client.batch(), which runs many different api calls concurrently.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+
+
+class Call:
+    __slots__ = ("method", "args", "kwargs")
+
+    def __init__(self, method, *args, **kwargs):
+        """
+        One api call of a batch, e.g. Call("quotes", ["AAPL", "AMD"], fields="quote").
+
+        Args:
+            method (str | callable): client method name (e.g. "account_details") or a callable
+            *args: positional arguments of the call
+            **kwargs: keyword arguments of the call
+        """
+        self.method = method                                        # client method name or callable
+        self.args = args                                            # positional arguments
+        self.kwargs = kwargs                                        # keyword arguments
+
+    @classmethod
+    def of(cls, call) -> "Call":
+        """
+        Make a Call from a descriptor: a Call, a method name, or a tuple of (method, *args).
+
+        Args:
+            call (Call | str | tuple): call descriptor
+
+        Returns:
+            Call: call
+        """
+        if isinstance(call, Call):
+            return call
+        if isinstance(call, str) or callable(call):
+            return cls(call)
+        if isinstance(call, tuple) and call:
+            return cls(*call)
+        raise ValueError(f"[Schwabdev] Invalid batch call: {call!r}")
+
+    @property
+    def name(self) -> str:
+        return self.method if isinstance(self.method, str) else getattr(self.method, "__name__", repr(self.method))
+
+    def __repr__(self) -> str:
+        args = [repr(arg) for arg in self.args] + [f"{key}={value!r}" for key, value in self.kwargs.items()]
+        return f"Call({self.name}({', '.join(args)}))"
+
+
+class CallResult:
+    __slots__ = ("call", "value", "status", "started", "elapsed", "error")
+
+    def __init__(self, call: Call, value, status: int | None, started: float, elapsed: float, error: Exception | None = None):
+        """
+        Result of one call in a batch.
+
+        Args:
+            call (Call): the call
+            value: what the call returned (response, or parsed data for ClientAsync), None if it raised
+            status (int | None): HTTP status of the (last) response, None if the call raised
+            started (float): seconds from the start of the batch until the call started (queueing behind max concurrency)
+            elapsed (float): seconds the call took (including waiting for the rate limiter)
+            error (Exception | None): exception raised by the call. Defaults to None.
+        """
+        self.call = call                                            # the call
+        self.value = value                                          # returned response/data
+        self.status = status                                        # HTTP status
+        self.started = started                                      # seconds after the batch started
+        self.elapsed = elapsed                                      # seconds taken
+        self.error = error                                          # exception, if any
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and (self.status is None or 200 <= self.status < 300)
+
+    def __repr__(self) -> str:
+        return f"CallResult({self.call.name}, status={self.status}, elapsed={self.elapsed * 1000:.1f}ms, error={self.error!r})"
@@ -0,0 +1,209 @@
+"""
+Schwabdev Calendar Module.
+Market sessions of upcoming days from market_hours (holidays and early closes included), cached so "is open", "next
+open" and "next close" are answered without requests or date math, and schedules for Stream.start_auto.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import asyncio
+import bisect
+import datetime
+import threading
+import zoneinfo
+
+_EASTERN = zoneinfo.ZoneInfo("America/New_York")
+
+MARKETS = ("equity", "option", "bond", "future", "forex")
+SESSIONS = ("preMarket", "regularMarket", "postMarket")
+
+
+class MarketCalendar:
+
+    def __init__(self, client=None, markets: list[str] | tuple[str] = ("equity", "option", "future", "forex"), days: int = 7):
+        """
+        Sessions of markets for the next days, loaded with calendar.refresh() (awaited for ClientAsync) or calendar.load(...).
+
+        Args:
+            client (Client | ClientAsync | None): client to get market hours with. Defaults to None.
+            markets (list[str]): markets to cache ("equity", "option", "bond", "future", "forex"). Defaults to ("equity", "option", "future", "forex").
+            days (int): days to cache from today (Eastern time). Defaults to 7.
+        """
+        self._client = client
+        self.markets = set(markets)                                 # cached markets
+        self.days = days                                            # days cached from today
+        self.lock = threading.Lock()                                # held while updating
+        self._days = {}                                             # (market, date) -> {session: [(start, end)]} (epoch seconds)
+        self._windows = {}                                          # (market, sessions) -> merged [(start, end)], sorted
+        self._cursor = {}                                           # (market, sessions) -> index of the current or next window
+
+    def load(self, hours: dict, date: datetime.date, markets: list[str] | None = None):
+        """
+        Add the market_hours response of one date.
+
+        Args:
+            hours (dict): parsed response of market_hours(markets, date)
+            date (datetime.date): date of the response
+            markets (list[str] | None): markets requested (markets missing from the response are closed), None for the markets in it. Defaults to None.
+        """
+        with self.lock:
+            for market in (markets if markets is not None else hours):
+                sessions = {}
+                for product in (hours.get(market) or {}).values():
+                    for name, windows in (product.get("sessionHours") or {}).items():
+                        sessions.setdefault(name, []).extend((datetime.datetime.fromisoformat(window["start"]).timestamp(),
+                                                              datetime.datetime.fromisoformat(window["end"]).timestamp())
+                                                             for window in windows)
+                self._days[(market, date)] = sessions
+            self._windows.clear()
+            self._cursor.clear()
+
+    def missing(self, now: datetime.datetime | None = None) -> dict:
+        """
+        Dates (Eastern time) from today on that are not cached yet.
+
+        Args:
+            now (datetime.datetime | None): time to count days from. Defaults to now.
+
+        Returns:
+            dict[datetime.date, list[str]]: date -> markets missing
+        """
+        today = (now or datetime.datetime.now(_EASTERN)).astimezone(_EASTERN).date()
+        missing = {}
+        for offset in range(self.days):
+            date = today + datetime.timedelta(days=offset)
+            for market in sorted(self.markets):
+                if (market, date) not in self._days:
+                    missing.setdefault(date, []).append(market)
+        return missing
+
+    def _trim(self, now: datetime.datetime | None):
+        today = (now or datetime.datetime.now(_EASTERN)).astimezone(_EASTERN).date()
+        with self.lock:
+            for key in [key for key in self._days if key[1] < today - datetime.timedelta(days=1)]:  # yesterday's sessions can run into today
+                del self._days[key]
+
+    def refresh(self, now: datetime.datetime | None = None):
+        """
+        Get the market hours of dates that are not cached yet (one request per date, nothing if every date is cached) and
+        drop past dates. Awaited for ClientAsync.
+
+        Args:
+            now (datetime.datetime | None): time to count days from. Defaults to now.
+        """
+        if asyncio.iscoroutinefunction(self._client.market_hours):
+            return self._refresh_async(now)
+        self._trim(now)
+        for date, markets in self.missing(now).items():
+            response = self._client.market_hours(markets, date)
+            response.raise_for_status()
+            self.load(response.json(), date, markets)
+
+    async def _refresh_async(self, now: datetime.datetime | None):
+        self._trim(now)
+        for date, markets in self.missing(now).items():
+            hours = await self._client.market_hours(markets, date, parsed=True)
+            if not isinstance(hours, dict) or "errors" in hours:
+                raise ConnectionError(f"[Schwabdev] Could not get market hours: {hours}")
+            self.load(hours, date, markets)
+
+    def _merged(self, key: tuple) -> list:
+        """
+        Windows of the sessions of a market over the cached days, sorted with overlapping and adjacent windows merged
+        (e.g. pre-market, regular and post-market into one, or futures sessions across midnight).
+        """
+        windows = self._windows.get(key)
+        if windows is None:
+            market, sessions = key
+            spans = sorted(span for (m, _), day in list(self._days.items()) if m == market
+                           for name in sessions for span in day.get(name, ()))
+            windows = []
+            for start, end in spans:
+                if windows and start <= windows[-1][1]:
+                    windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+                else:
+                    windows.append((start, end))
+            self._windows[key] = windows
+        return windows
+
+    def _locate(self, market: str, sessions: tuple[str], now: datetime.datetime | None) -> tuple[list, int, float]:
+        """
+        Windows, index of the current or next window and the time as epoch seconds. The index is kept between calls and
+        only moves forward as time passes, so a lookup is O(1).
+        """
+        key = (market, tuple(sessions))
+        windows = self._merged(key)
+        t = (now or datetime.datetime.now(datetime.timezone.utc)).timestamp()
+        i = self._cursor.get(key, 0)
+        if i > len(windows) or (i > 0 and windows[i - 1][1] > t):  # moved back in time
+            i = bisect.bisect_right([end for _, end in windows], t)
+        while i < len(windows) and windows[i][1] <= t:
+            i += 1
+        self._cursor[key] = i
+        return windows, i, t
+
+    def window(self, market: str = "equity", sessions: tuple[str] = ("regularMarket",),
+               now: datetime.datetime | None = None) -> tuple[datetime.datetime, datetime.datetime] | None:
+        """
+        Current or next session window of a market.
+
+        Args:
+            market (str): market. Defaults to "equity".
+            sessions (tuple[str]): sessions ("preMarket", "regularMarket", "postMarket"), adjacent sessions are one window. Defaults to ("regularMarket",).
+            now (datetime.datetime | None): time to look from (timezone aware). Defaults to now.
+
+        Returns:
+            tuple[datetime.datetime, datetime.datetime] | None: (open, close) in Eastern time, None if the market does not open in the cached days
+        """
+        windows, i, _ = self._locate(market, sessions, now)
+        if i >= len(windows):
+            return None
+        start, end = windows[i]
+        return datetime.datetime.fromtimestamp(start, _EASTERN), datetime.datetime.fromtimestamp(end, _EASTERN)
+
+    def is_open(self, market: str = "equity", sessions: tuple[str] = ("regularMarket",), now: datetime.datetime | None = None) -> bool:
+        """
+        Whether a market is in one of the sessions.
+
+        Args:
+            market (str): market. Defaults to "equity".
+            sessions (tuple[str]): sessions. Defaults to ("regularMarket",).
+            now (datetime.datetime | None): time (timezone aware). Defaults to now.
+
+        Returns:
+            bool: open
+        """
+        windows, i, t = self._locate(market, sessions, now)
+        return i < len(windows) and windows[i][0] <= t
+
+    def next_open(self, market: str = "equity", sessions: tuple[str] = ("regularMarket",),
+                  now: datetime.datetime | None = None) -> datetime.datetime | None:
+        """
+        Next time a market opens (after the current session if it is open).
+
+        Args:
+            market (str): market. Defaults to "equity".
+            sessions (tuple[str]): sessions. Defaults to ("regularMarket",).
+            now (datetime.datetime | None): time (timezone aware). Defaults to now.
+
+        Returns:
+            datetime.datetime | None: open time in Eastern time, None if not within the cached days
+        """
+        windows, i, t = self._locate(market, sessions, now)
+        if i < len(windows) and windows[i][0] <= t:
+            i += 1
+        return datetime.datetime.fromtimestamp(windows[i][0], _EASTERN) if i < len(windows) else None
+
+    def next_close(self, market: str = "equity", sessions: tuple[str] = ("regularMarket",),
+                   now: datetime.datetime | None = None) -> datetime.datetime | None:
+        """
+        Next time a market closes (the end of the current session if it is open).
+
+        Args:
+            market (str): market. Defaults to "equity".
+            sessions (tuple[str]): sessions. Defaults to ("regularMarket",).
+            now (datetime.datetime | None): time (timezone aware). Defaults to now.
+
+        Returns:
+            datetime.datetime | None: close time in Eastern time, None if not within the cached days
+        """
+        windows, i, _ = self._locate(market, sessions, now)
+        return datetime.datetime.fromtimestamp(windows[i][1], _EASTERN) if i < len(windows) else None
@@ -0,0 +1,263 @@
+"""
+Schwabdev Option Chain Module.
+Columnar (NumPy) representation of option chains.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import asyncio
+import datetime
+import threading
+import time
+
+from .translate import iter_data
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (pip install schwabdev[numpy])
+    np = None
+
+_YEAR = 365.0 * 24 * 60 * 60    # seconds in a year
+
+
+class OptionChain:
+
+    # column name: contract field from option_chains()
+    _fields = {"strike": "strikePrice", "bid": "bid", "ask": "ask", "last": "last", "mark": "mark",
+               "bid_size": "bidSize", "ask_size": "askSize", "volume": "totalVolume", "open_interest": "openInterest",
+               "volatility": "volatility", "delta": "delta", "gamma": "gamma", "theta": "theta", "vega": "vega",
+               "rho": "rho", "multiplier": "multiplier"}
+    _missing = ("volatility", "delta", "gamma", "theta", "vega", "rho")    # columns where Schwab sends -999 for missing values
+
+    def __init__(self, underlying_symbol: str, underlying_price: float, symbols: list[str], columns: dict, interest_rate: float = 0.0):
+        """
+        Initialize a columnar option chain, usually made with OptionChain.from_json(...)
+
+        Args:
+            underlying_symbol (str): underlying symbol (e.g. "AAPL" or "$SPX")
+            underlying_price (float): underlying price
+            symbols (list[str]): contract symbols, one per row
+            columns (dict[str, numpy.ndarray]): column name to array (one value per row)
+            interest_rate (float): risk free rate (0.05 = 5%). Defaults to 0.
+        """
+        if np is None:
+            raise ImportError("numpy is required to use OptionChain (pip install schwabdev[numpy])")
+        self.underlying_symbol = underlying_symbol                              # underlying symbol
+        self.underlying_price = underlying_price                                # underlying price
+        self.interest_rate = interest_rate                                      # risk free rate
+        self.symbols = np.asarray(symbols, dtype=object)                        # contract symbols
+        self.columns = columns                                                  # column name -> array
+        self.index = {symbol: row for row, symbol in enumerate(self.symbols)}   # contract symbol -> row
+
+    @classmethod
+    def from_json(cls, chain: dict) -> "OptionChain":
+        """
+        Make a columnar chain from an option chain response.
+
+        Args:
+            chain (dict): parsed response of option_chains() or the result of full_chain()
+
+        Returns:
+            OptionChain: columnar option chain
+        """
+        if np is None:
+            raise ImportError("numpy is required to use OptionChain (pip install schwabdev[numpy])")
+        contracts = [contract for key in ("callExpDateMap", "putExpDateMap")
+                     for strikes in chain.get(key, {}).values()
+                     for contracts in strikes.values()
+                     for contract in contracts]
+        columns = {name: np.array([contract.get(field, np.nan) for contract in contracts], dtype=np.float64)
+                   for name, field in cls._fields.items()}
+        for name in cls._missing:
+            columns[name][columns[name] == -999.0] = np.nan
+        columns["is_call"] = np.array([contract.get("putCall") == "CALL" for contract in contracts], dtype=bool)
+        columns["expiration"] = np.array([cls._epoch(contract.get("expirationDate")) for contract in contracts], dtype=np.float64)
+
+        underlying_price = chain.get("underlyingPrice")
+        if underlying_price is None:
+            underlying_price = (chain.get("underlying") or {}).get("last", np.nan)
+        return cls(chain.get("symbol"), underlying_price, [contract.get("symbol") for contract in contracts],
+                   columns, (chain.get("interestRate") or 0.0) / 100)
+
+    @staticmethod
+    def _epoch(date: str | None) -> float:
+        """
+        Convert an expiration date ("2024-10-18T20:00:00.000+00:00") to epoch seconds.
+        """
+        if not date:
+            return np.nan
+        dt = datetime.datetime.fromisoformat(date)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=datetime.timezone.utc)
+        return dt.timestamp()
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, column: str):
+        return self.columns[column]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def time_to_expiration(self, now: float | None = None):
+        """
+        Time to expiration of each contract in years.
+
+        Args:
+            now (float | None): epoch seconds to measure from. Defaults to now.
+
+        Returns:
+            numpy.ndarray: years to expiration (0 for expired contracts)
+        """
+        return np.maximum(self.columns["expiration"] - (time.time() if now is None else now), 0.0) / _YEAR
+
+    def select(self, mask) -> "OptionChain":
+        """
+        Make a new chain with a subset of rows.
+
+        Args:
+            mask (numpy.ndarray): boolean mask or row indices
+
+        Returns:
+            OptionChain: chain with the selected rows
+        """
+        return OptionChain(self.underlying_symbol, self.underlying_price, self.symbols[mask],
+                           {name: column[mask] for name, column in self.columns.items()}, self.interest_rate)
+
+
+class LiveChain(OptionChain):
+
+    # LEVELONE_OPTIONS field number: column
+    _stream_columns = {"2": "bid", "3": "ask", "4": "last", "8": "volume", "9": "open_interest", "10": "volatility",
+                       "16": "bid_size", "17": "ask_size", "28": "delta", "29": "gamma", "30": "theta", "31": "vega",
+                       "32": "rho", "37": "mark"}
+
+    def __init__(self, chain: dict, window: float = 0.1):
+        """
+        Initialize an option chain that is kept current by the stream, usually made with LiveChain.load(...)
+        Contracts with strikes within the window around the underlying price are subscribed, contracts are added or removed as the underlying moves.
+        Read with chain.snapshot() or while holding chain.lock for a consistent view.
+
+        Args:
+            chain (dict): parsed response of option_chains() or the result of full_chain()
+            window (float): fraction of the underlying price around it to subscribe to (0.1 = strikes within 10%). Defaults to 0.1.
+        """
+        base = OptionChain.from_json(chain)
+        super().__init__(base.underlying_symbol, base.underlying_price, base.symbols, base.columns, base.interest_rate)
+        self.window = window                            # subscription window around the underlying
+        self.lock = threading.RLock()                   # lock held while updating
+        self.subscribed = set()                         # contract symbols currently subscribed
+        self._stream = None                             # stream used for subscriptions
+        self._tasks = set()                             # pending sends (StreamAsync)
+
+    @classmethod
+    def from_json(cls, chain: dict, window: float = 0.1) -> "LiveChain":
+        return cls(chain, window)
+
+    @classmethod
+    def load(cls, client, symbol: str, window: float = 0.1, **kwargs) -> "LiveChain":
+        """
+        Load a snapshot of every expiration through the (synchronous) client.
+
+        Args:
+            client (Client): client to load the chain with
+            symbol (str): underlying symbol
+            window (float): fraction of the underlying price around it to subscribe to. Defaults to 0.1.
+            **kwargs: keyword arguments to pass to client.full_chain()
+
+        Returns:
+            LiveChain: live option chain (not subscribed yet, see subscribe())
+        """
+        return cls(client.full_chain(symbol, **kwargs), window)
+
+    def _in_window(self):
+        if not self.underlying_price or self.underlying_price != self.underlying_price:  # no or NaN price -> everything
+            return np.ones(len(self), dtype=bool)
+        return np.abs(self.columns["strike"] - self.underlying_price) <= self.window * self.underlying_price
+
+    def _send(self, requests: list):
+        result = self._stream.send(requests)
+        if asyncio.iscoroutine(result):  # StreamAsync
+            task = asyncio.ensure_future(result)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _update_window(self):
+        """
+        Subscribe contracts that entered the window and unsubscribe those that left.
+        """
+        wanted = set(self.symbols[self._in_window()])
+        added, removed = wanted - self.subscribed, self.subscribed - wanted
+        if not (added or removed):
+            return
+        fields = ",".join(["0", "35"] + list(self._stream_columns))
+        requests = []
+        if removed:
+            requests.append(self._stream.level_one_options(sorted(removed), fields, command="UNSUBS"))
+        if added:
+            requests.append(self._stream.level_one_options(sorted(added), fields, command="ADD"))
+        self.subscribed = wanted
+        self._send(requests)
+
+    def subscribe(self, stream):
+        """
+        Subscribe the underlying and the contracts in the window, pass chain.on_stream as (or call it from) the stream receiver.
+
+        Args:
+            stream (Stream | StreamAsync): stream to subscribe with
+        """
+        self._stream = stream
+        with self.lock:
+            self._send([stream.level_one_equities(self.underlying_symbol, "0,3")])
+            self._update_window()
+
+    def unsubscribe(self):
+        """
+        Unsubscribe every contract of this chain and the underlying.
+        """
+        if self._stream is None:
+            return
+        with self.lock:
+            requests = [self._stream.level_one_equities(self.underlying_symbol, "0,3", command="UNSUBS")]
+            if self.subscribed:
+                requests.append(self._stream.level_one_options(sorted(self.subscribed), "0", command="UNSUBS"))
+            self.subscribed = set()
+            self._send(requests)
+
+    def on_stream(self, message, **kwargs):
+        """
+        Stream receiver that applies streamed changes to the chain in place.
+
+        Args:
+            message (str | dict): message from the stream
+        """
+        underlying_moved = False
+        with self.lock:
+            for service, _, content in iter_data(message):
+                key = content.get("key")
+                if service == "LEVELONE_OPTIONS":
+                    row = self.index.get(key)
+                    if row is None:
+                        continue
+                    for field, column in self._stream_columns.items():
+                        if field in content:
+                            value = content[field]
+                            self.columns[column][row] = np.nan if value == -999 and column in self._missing else value
+                    if "35" in content and content["35"] != self.underlying_price:
+                        self.underlying_price = content["35"]
+                        underlying_moved = True
+                elif service == "LEVELONE_EQUITIES" and key == self.underlying_symbol and "3" in content:
+                    self.underlying_price = content["3"]
+                    underlying_moved = True
+            if underlying_moved and self._stream is not None:
+                self._update_window()
+
+    def snapshot(self) -> OptionChain:
+        """
+        Copy the current chain (consistent, not updated afterwards).
+
+        Returns:
+            OptionChain: copy of the chain
+        """
+        with self.lock:
+            return OptionChain(self.underlying_symbol, self.underlying_price, self.symbols.copy(),
+                               {name: column.copy() for name, column in self.columns.items()}, self.interest_rate)
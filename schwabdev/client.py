@@ -3,23 +3,37 @@ Schwabdev Client & ClientAsync Module.
 For connecting to the Schwab API.
 https://github.com/tylerebowers/Schwab-API-Python
 """
+from __future__ import annotations  # annotations name requests/aiohttp types without importing them
+
+import contextvars
 import datetime
 import logging
-import asyncio
-import urllib.parse
+import time
 import threading
-import requests
-import aiohttp
 
-from .enums import TimeFormat
+from ._lazy import lazy_import
+from . import endpoints, hooks
+from .batch import Call, CallResult
+from .orders import OrderResult
+from .limiter import RateLimiter
 from .tokens import Tokens
+from .transport import AiohttpTransport, Transport
+
+# heavy dependencies are imported on first use so `import schwabdev` (and a sync-only script) starts quickly
+asyncio = lazy_import("asyncio")
+futures = lazy_import("concurrent.futures")
+requests = lazy_import("requests")
+aiohttp = lazy_import("aiohttp")
+
+# HTTP status of the last response parsed by ClientAsync in the current task (read by batch when responses are parsed)
+_response_status = contextvars.ContextVar("schwabdev_response_status", default=None)
 
 
 class ClientBase:
 
     _base_api_url = "https://api.schwabapi.com"
 
-    def __init__(self, app_key, app_secret, callback_url="https://127.0.0.1", tokens_db="~/.schwabdev/tokens.db", encryption=None, timeout=10, call_on_auth=None):
+    def __init__(self, app_key, app_secret, callback_url="https://127.0.0.1", tokens_db="~/.schwabdev/tokens.db", encryption=None, timeout=10, call_on_auth=None, rate_limit=120, base_url=None, order_rate_limit=120):
         """
         Initialize a client to access the Schwab API.
 
@@ -31,6 +45,9 @@ class ClientBase:
             timeout (int): Request timeout in seconds - how long to wait for a response.
             use_session (bool): Use a requests session for requests instead of creating a new session for each request.
             call_on_notify (function | None): Function to call when user needs to be notified (e.g. for input)
+            rate_limit (int | None): Maximum api requests per minute, None to disable limiting.
+            base_url (str | None): Base url of the api, e.g. a local simulator (schwabdev.simulator). Defaults to Schwab's.
+            order_rate_limit (int | None): Maximum orders placed/replaced/canceled per minute, None to disable limiting.
         """
 
         # other checks are done in the tokens class
@@ -38,89 +55,186 @@ class ClientBase:
             raise Exception("Timeout must be greater than 0 and is recommended to be 5 seconds or more.")
 
         self.timeout = timeout                                              # timeout to use in requests
+        if base_url is not None:
+            self._base_api_url = base_url.rstrip("/")                       # base url override (e.g. simulator)
         self.logger = logging.getLogger("Schwabdev")  # init the logger
-        self.tokens = Tokens(app_key, app_secret, callback_url, self.logger, tokens_db, encryption, call_on_auth)
+        self.rate_limiter = RateLimiter(rate_limit, 60) if rate_limit else None  # limits requests per minute
+        self.order_rate_limiter = RateLimiter(order_rate_limit, 60) if order_rate_limit else None  # limits order requests per minute
+        self.tokens = Tokens(app_key, app_secret, callback_url, self.logger, tokens_db, encryption, call_on_auth, self._base_api_url)
         self.tokens.update_tokens()                                               # ensure tokens are up to date on init
+        self._hooks = []                                                    # tracing/profiling hooks (schwabdev.hooks)
+        self._account_hashes = {}                                           # account number -> hash (from linked_accounts)
 
-    def _parse_params(self, params: dict):
+    def add_hook(self, hook: hooks.Hook) -> hooks.Hook:
         """
-        Removes None (null) values.
+        Register a hook called around every api request, requests take a separate timed path only while hooks are registered.
 
         Args:
-            params (dict): params to remove None values from
+            hook (schwabdev.hooks.Hook): hook to add (e.g. schwabdev.hooks.OpenTelemetryHook())
 
         Returns:
-            dict: params without None values
-
-        Example:
-            params = {'a': 1, 'b': None}
-            client._parse_params(params)
-            {'a': 1}
+            schwabdev.hooks.Hook: the hook (so it can be removed later)
         """
-        for key in list(params.keys()):
-            if params[key] is None: del params[key]
-        return params
+        self._hooks = self._hooks + [hook]  # copy on write so requests in other threads iterate a stable list
+        return hook
 
-    def _time_convert(self, dt=None, format: str | TimeFormat=TimeFormat.ISO_8601) -> str | int | None:
+    def remove_hook(self, hook: hooks.Hook):
         """
-        Convert time to the correct format, passthrough if a string, preserve None if None for params parser
+        Unregister a hook.
 
         Args:
-            dt (datetime.datetime): datetime object to convert
-            form (str): format to convert to (check source for options)
-
-        Returns:
-            str | None: converted time (or None passed through)
+            hook (schwabdev.hooks.Hook): hook to remove
         """
-        if dt is None or not (isinstance(dt, datetime.datetime) or isinstance(dt, datetime.date)):
-            return dt
-        match format:
-            case TimeFormat.ISO_8601 | TimeFormat.ISO_8601.value:
-                return f"{dt.isoformat().split('+')[0][:-3]}Z"
-            case TimeFormat.EPOCH | TimeFormat.EPOCH.value:
-                return int(dt.timestamp())
-            case TimeFormat.EPOCH_MS | TimeFormat.EPOCH_MS.value:
-                return int(dt.timestamp() * 1000)
-            case TimeFormat.YYYY_MM_DD | TimeFormat.YYYY_MM_DD.value:
-                return dt.strftime('%Y-%m-%d')
-            case _:
-                raise ValueError(f"Unsupported time format: {format}")
+        self._hooks = [h for h in self._hooks if h is not hook]
 
-
-    def _format_list(self, l: list | str | None):
+    def _open_orders_by_account(self, orders, accountNumber: str | None, symbol: str | None) -> dict:
+        """
+        Cancelable orders from an OrderManager, grouped by account number.
         """
-        Convert python list to string or passthough if a string or None
+        grouped = {}
+        for order in orders.open_orders(account=accountNumber, symbol=symbol):
+            if order.status != "PENDING_CANCEL":
+                grouped.setdefault(order.account, []).append(order.order_id)
+        return grouped
 
-        Args:
-            l (list | str | None): list to convert
+    def _cache_account_hashes(self, status: int, accounts) -> None:
+        """
+        Replace the account hash cache with a linked_accounts() response, raising ValueError if the request failed.
+        """
+        if not 200 <= status < 300 or not isinstance(accounts, list):
+            raise ValueError(f"[Schwabdev] Could not get linked accounts ({status}): {accounts}")
+        self._account_hashes = {str(a["accountNumber"]): a["hashValue"] for a in accounts}
 
-        Returns:
-            str | None: converted string or passthrough
+    @staticmethod
+    def _unknown_account(accountNumber: str) -> ValueError:
+        return ValueError(f"[Schwabdev] Account {accountNumber} is not linked.")
 
-        Example:
-            l = ["a", "b"]
-            client._format_list(l)
-            "a,b"
+    def _batch_calls(self, calls: list) -> list[tuple[Call, callable]]:
         """
-        if l is None:
-            return None
-        elif isinstance(l, list):
-            return ",".join(l)
-        else:
-            return l
-    
+        Resolve batch call descriptors to (Call, function), unknown or private methods raise ValueError before anything runs.
+        """
+        resolved = []
+        for call in calls:
+            call = Call.of(call)
+            if isinstance(call.method, str):
+                if call.method.startswith("_") or call.method == "batch" or not callable(getattr(self, call.method, None)):
+                    raise ValueError(f"[Schwabdev] Unknown api call for batch: {call.method!r}")
+                resolved.append((call, getattr(self, call.method)))
+            else:
+                resolved.append((call, call.method))
+        return resolved
+
+    def _call_hooks(self, name: str, *args):
+        for hook in self._hooks:
+            try:
+                getattr(hook, name)(*args)
+            except Exception as e:
+                self.logger.error(f"Error in {type(hook).__name__}.{name}: {e}")
+
     def _get_streamer_info(self):
         self.tokens.update_tokens()
-        response = requests.request("GET", f'{self._base_api_url}/trader/v1/userPreference', headers={'Authorization': f'Bearer {self.tokens.access_token}'})
+        response = requests.request("GET", f'{self._base_api_url}/trader/v1/userPreference', timeout=self.timeout,
+                                    headers={'Authorization': f'Bearer {self.tokens.access_token}'})
         if response.ok:
             return response.json().get('streamerInfo', None)[0]
         else:
             self.logger.error(f"Could not get streamerInfo (HTTP {response.status_code})")
             return
 
+    def _get_quotes(self, symbols: list[str], chunk_size: int = 500) -> dict:
+        """
+        Get quotes synchronously for any client (used by the streamers for snapshots after reconnecting).
+
+        Args:
+            symbols (list[str]): symbols
+            chunk_size (int): symbols per request. Defaults to 500.
+
+        Returns:
+            dict: symbol -> quote
+        """
+        quotes = {}
+        for i in range(0, len(symbols), chunk_size):
+            self.tokens.update_tokens()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = requests.request("GET", f'{self._base_api_url}/marketdata/v1/quotes', timeout=self.timeout,
+                                        params={'symbols': ",".join(symbols[i:i + chunk_size])},
+                                        headers={'Authorization': f'Bearer {self.tokens.access_token}'})
+            response.raise_for_status()
+            quotes.update(response.json())
+        return quotes
+
+    @staticmethod
+    def _chain_expirations(expiration_chain: dict) -> list[str]:
+        """
+        Get the unique expiration dates from an option expiration chain.
+
+        Args:
+            expiration_chain (dict): parsed response of option_expiration_chain()
+
+        Returns:
+            list[str]: expiration dates ("YYYY-MM-DD") in order
+        """
+        return list(dict.fromkeys(exp.get("expirationDate") for exp in expiration_chain.get("expirationList", []) if exp.get("expirationDate")))
+
+    @staticmethod
+    def _is_buffer_overflow(text: str) -> bool:
+        """
+        Check if an error response is the "Body buffer overflow" error (too much data requested).
+        """
+        return "Body buffer overflow" in text or "TooBigBody" in text
+
+    @staticmethod
+    def _split_chain_params(params: dict) -> list[dict]:
+        """
+        Split option chain params into smaller requests, first by contract type then by strike range.
+
+        Args:
+            params (dict): option_chains() keyword arguments
+
+        Returns:
+            list[dict]: smaller requests that together cover the same contracts, or [] if they cannot be split further
+        """
+        if params.get("contractType") in (None, "ALL"):
+            return [params | {"contractType": "CALL"}, params | {"contractType": "PUT"}]
+        elif params.get("range") in (None, "ALL"):
+            # NTM overlaps ITM and OTM (duplicates merge by strike), it is kept for the at-the-money strike that is
+            # neither in nor out of the money and so could be missing from both
+            return [params | {"range": "ITM"}, params | {"range": "NTM"}, params | {"range": "OTM"}]
+        else:
+            return []
+
+    @staticmethod
+    def _merge_chains(parts: list[dict]) -> dict:
+        """
+        Stitch several option chains for the same symbol into one chain.
+
+        Args:
+            parts (list[dict]): parsed option chains
+
+        Returns:
+            dict: merged option chain (same format as option_chains())
+        """
+        merged = {}
+        for part in parts:
+            for key, value in part.items():
+                if key in ("callExpDateMap", "putExpDateMap"):
+                    exp_map = merged.setdefault(key, {})
+                    for exp, strikes in value.items():
+                        exp_map.setdefault(exp, {}).update(strikes)
+                elif key not in merged:
+                    merged[key] = value
+        for key in ("callExpDateMap", "putExpDateMap"):
+            merged.setdefault(key, {})
+            merged[key] = {exp: dict(sorted(strikes.items(), key=lambda item: float(item[0])))  # parts arrive by range
+                           for exp, strikes in sorted(merged[key].items())}
+        merged["numberOfContracts"] = sum(len(contracts) for key in ("callExpDateMap", "putExpDateMap")
+                                          for strikes in merged[key].values() for contracts in strikes.values())
+        return merged
+
 class Client(ClientBase):
 
-    def __init__(self, app_key:str, app_secret:str, callback_url:str="https://127.0.0.1", tokens_db: str="~/.schwabdev/tokens.db", encryption:str=None, timeout:int=10, call_on_auth:callable=None):
+    def __init__(self, app_key:str, app_secret:str, callback_url:str="https://127.0.0.1", tokens_db: str="~/.schwabdev/tokens.db", encryption:str=None, timeout:int=10, call_on_auth:callable=None, rate_limit:int | None=120, base_url:str | None=None, order_rate_limit:int | None=120):
         """
         Initialize a client to access the Schwab API.
 
@@ -131,8 +245,11 @@ class Client(ClientBase):
             tokens_db (str): Path to tokens file.
             timeout (int): Request timeout in seconds - how long to wait for a response.
             call_on_auth (function | None): Function to call for custom auth flow.
+            rate_limit (int | None): Maximum api requests per minute, None to disable limiting.
+            base_url (str | None): Base url of the api, e.g. a local simulator (schwabdev.simulator). Defaults to Schwab's.
+            order_rate_limit (int | None): Maximum orders placed/replaced/canceled per minute, None to disable limiting.
         """
-        super().__init__(app_key, app_secret, callback_url, tokens_db, encryption, timeout, call_on_auth)
+        super().__init__(app_key, app_secret, callback_url, tokens_db, encryption, timeout, call_on_auth, rate_limit, base_url, order_rate_limit)
 
         self._session = requests.Session()                                  # session to use in requests
         self._session.headers.update({'Authorization': f'Bearer {self.tokens.access_token}'})
@@ -152,10 +269,88 @@ class Client(ClientBase):
         else:
             return False
 
-    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+    def _request(self, method: str, path: str, stream: bool = False, **kwargs) -> requests.Response:
+        if self._hooks:
+            return self._request_hooked(method, path, stream, **kwargs)
+        self.update_tokens()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with self._session_lock: # only hold the lock while reading session headers so requests can run in parallel threads
+            prepared = self._session.prepare_request(requests.Request(method, f'{self._base_api_url}{path}', **kwargs))
+        settings = self._session.merge_environment_settings(prepared.url, {}, stream, None, None)
+        return self._session.send(prepared, timeout=self.timeout, **settings)
+
+    def _request_hooked(self, method: str, path: str, stream: bool = False, **kwargs) -> requests.Response:
+        # same as _request but timing each step for hooks, requests/urllib3 do not expose dns/connect timings
+        info = hooks.RequestInfo(method, path, f'{self._base_api_url}{path}')
         self.update_tokens()
+        mark = time.perf_counter()
+        info.token_wait = mark - info.start
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+            info.limiter_wait = time.perf_counter() - mark
+            mark += info.limiter_wait
         with self._session_lock:
-            return self._session.request(method, f'{self._base_api_url}{path}', timeout=self.timeout, **kwargs)
+            info.lock_wait = time.perf_counter() - mark
+            prepared = self._session.prepare_request(requests.Request(method, info.url, **kwargs))
+        info.url = prepared.url
+        info.request_bytes = len(prepared.body) if prepared.body is not None else 0
+        settings = self._session.merge_environment_settings(prepared.url, {}, stream, None, None)
+        self._call_hooks("before_request", info)
+        sent = time.perf_counter()
+        try:
+            response = self._session.send(prepared, timeout=self.timeout, **settings)
+        except Exception as e:
+            info.error = e
+            info.timings["total"] = time.perf_counter() - sent
+            self._call_hooks("on_error", info, e)
+            raise
+        info.timings["ttfb"] = response.elapsed.total_seconds()  # until the response headers were parsed
+        info.timings["total"] = time.perf_counter() - sent
+        info.status = response.status_code
+        length = response.headers.get("Content-Length")
+        info.response_bytes = len(response.content) if not stream else int(length) if length else None
+        self._call_hooks("after_response", info, response)
+        return response
+
+    def _order_request(self, method: str, path: str, **kwargs) -> requests.Response:
+        if self.order_rate_limiter is not None:
+            self.order_rate_limiter.acquire()
+        return self._request(method, path, **kwargs)
+
+    def _call(self, endpoint: endpoints.Endpoint, *args, **kwargs) -> requests.Response:
+        # args are the endpoint's path arguments and query parameters, kwargs go to the request (json, stream)
+        request = self._order_request if endpoint.order else self._request
+        return request(endpoint.method, endpoint.build(*args), headers=endpoint.headers, **kwargs)
+
+    def batch(self, calls: list, max_workers: int = 8) -> list[CallResult]:
+        """
+        Run many (different) api calls concurrently in threads, under the client's rate limiter.
+
+        Args:
+            calls (list[Call | str | tuple]): calls, each a schwabdev.batch.Call, a method name or a tuple of (method name, *args),
+                e.g. [("quotes", ["AAPL", "AMD"]), "linked_accounts", Call("account_details_all", fields="positions")]
+            max_workers (int): maximum concurrent calls. Defaults to 8.
+
+        Returns:
+            list[CallResult]: result per call (in order) with the response, status, timing and error (calls do not raise)
+        """
+        resolved = self._batch_calls(calls)
+        batch_start = time.perf_counter()
+
+        def run(item):
+            call, func = item
+            start = time.perf_counter()
+            try:
+                value = func(*call.args, **call.kwargs)
+            except Exception as e:
+                return CallResult(call, None, None, start - batch_start, time.perf_counter() - start, e)
+            return CallResult(call, value, getattr(value, "status_code", None), start - batch_start, time.perf_counter() - start)
+
+        if max_workers <= 1 or len(resolved) <= 1:
+            return [run(item) for item in resolved]
+        with futures.ThreadPoolExecutor(min(max_workers, len(resolved))) as executor:
+            return list(executor.map(run, resolved))
 
     def close(self):
         try:
@@ -185,36 +380,51 @@ class Client(ClientBase):
         Return:
             request.Response: All linked account numbers and hashes
         """
-        return self._request('GET', '/trader/v1/accounts/accountNumbers')
+        return self._call(endpoints.LINKED_ACCOUNTS)
 
-    def account_details_all(self, fields: str | None = None) -> requests.Response:
+    def _account_hash(self, accountNumber: str) -> str:
+        """
+        Account hash of a plain account number, cached from linked_accounts() and refreshed when the account is not cached.
+
+        Raises:
+            ValueError: linked_accounts() failed or the account is not linked
+        """
+        accountNumber = str(accountNumber)
+        if accountNumber not in self._account_hashes:
+            response = self.linked_accounts()
+            self._cache_account_hashes(response.status_code, response.json() if response.ok else response.text)
+            if accountNumber not in self._account_hashes:
+                raise self._unknown_account(accountNumber)
+        return self._account_hashes[accountNumber]
+
+    def account_details_all(self, fields: str | None = None, stream: bool = False) -> requests.Response:
         """
         All the linked account information for the user logged in. The balances on these accounts are displayed by default however the positions on these accounts will be displayed based on the "positions" flag.
 
         Args:
             fields (str | None): fields to return (options: "positions")
+            stream (bool): defer reading the body, iterate it with schwabdev.jsonstream.iter_items(...). Defaults to False.
 
         Returns:
             request.Response: details for all linked accounts
         """
-        return self._request('GET', '/trader/v1/accounts/', 
-                             params=self._parse_params({'fields': fields}))
+        return self._call(endpoints.ACCOUNT_DETAILS_ALL, fields, stream=stream)
 
-    def account_details(self, accountHash: str, fields: str | None = None) -> requests.Response:
+    def account_details(self, accountHash: str, fields: str | None = None, stream: bool = False) -> requests.Response:
         """
         Specific account information with balances and positions. The balance information on these accounts is displayed by default but Positions will be returned based on the "positions" flag.
 
         Args:
             accountHash (str): account hash from account_linked()
             fields (str | None): fields to return
+            stream (bool): defer reading the body, iterate it with schwabdev.jsonstream.iter_items(...). Defaults to False.
 
         Returns:
             request.Response: details for one linked account
         """
-        return self._request('GET', f'/trader/v1/accounts/{accountHash}', 
-                             params=self._parse_params({'fields': fields}))
+        return self._call(endpoints.ACCOUNT_DETAILS, accountHash, fields, stream=stream)
 
-    def account_orders(self, accountHash: str, fromEnteredTime: datetime.datetime | str, toEnteredTime: datetime.datetime | str, maxResults: int | None = None, status: str | None = None) -> requests.Response:
+    def account_orders(self, accountHash: str, fromEnteredTime: datetime.datetime | str, toEnteredTime: datetime.datetime | str, maxResults: int | None = None, status: str | None = None, stream: bool = False) -> requests.Response:
         """
         All orders for a specific account. Orders retrieved can be filtered based on input parameters below. Maximum date range is 1 year.
 
@@ -224,16 +434,13 @@ class Client(ClientBase):
             toEnteredTime (datetime.datetime | str): end date
             maxResults (int | None): maximum number of results (set to None for default 3000)
             status (str | None): status of order
+            stream (bool): defer reading the body, iterate it with schwabdev.jsonstream.iter_items(...). Defaults to False.
 
         Returns:
             request.Response: orders for one linked account
         """
-        return self._request("GET", f'/trader/v1/accounts/{accountHash}/orders', 
-                             params=self._parse_params({'fromEnteredTime': self._time_convert(fromEnteredTime, TimeFormat.ISO_8601), 
-                                                         'toEnteredTime': self._time_convert(toEnteredTime, TimeFormat.ISO_8601), 
-                                                         'maxResults': maxResults, 
-                                                         'status': status}))
-    
+        return self._call(endpoints.ACCOUNT_ORDERS, accountHash, fromEnteredTime, toEnteredTime, maxResults, status, stream=stream)
+
     def place_order(self, accountHash: str, order: dict) -> requests.Response:
         """
         Place an order for a specific account.
@@ -245,9 +452,7 @@ class Client(ClientBase):
         Returns:
             request.Response: order number in response header (if immediately filled then order number not returned)
         """
-        return self._request("POST", f'/trader/v1/accounts/{accountHash}/orders', 
-                             headers={"Accept": "application/json", "Content-Type": "application/json"}, 
-                             json=order)
+        return self._call(endpoints.PLACE_ORDER, accountHash, json=order)
 
     def order_details(self, accountHash: str, orderId: int | str) -> requests.Response:
         """
@@ -260,7 +465,7 @@ class Client(ClientBase):
         Returns:
             request.Response: order details
         """
-        return self._request("GET", f'/trader/v1/accounts/{accountHash}/orders/{orderId}')
+        return self._call(endpoints.ORDER_DETAILS, accountHash, orderId)
 
     def cancel_order(self, accountHash: str, orderId: int | str) -> requests.Response:
         """
@@ -273,7 +478,7 @@ class Client(ClientBase):
         Returns:
             request.Response: response code
         """
-        return self._request("DELETE", f'/trader/v1/accounts/{accountHash}/orders/{orderId}')
+        return self._call(endpoints.CANCEL_ORDER, accountHash, orderId)
 
     def replace_order(self, accountHash: str, orderId: int | str, order: dict) -> requests.Response:
         """
@@ -287,11 +492,92 @@ class Client(ClientBase):
         Returns:
             request.Response: response code
         """
-        return self._request("PUT", f'/trader/v1/accounts/{accountHash}/orders/{orderId}', 
-                             headers={"Accept": "application/json", "Content-Type": "application/json"}, 
-                             json=order)
+        return self._call(endpoints.REPLACE_ORDER, accountHash, orderId, json=order)
+
+    def _order_batch(self, calls: list[tuple], max_workers: int) -> list[OrderResult]:
+        """
+        Run order calls in threads, collecting a result (or error) per call in order.
+        """
+        def run(call):
+            order_id, method, args = call
+            start = time.perf_counter()
+            try:
+                response = method(*args)
+            except Exception as e:
+                return OrderResult(order_id, None, None, time.perf_counter() - start, error=e)
+            return OrderResult(order_id, response.status_code, response.headers.get("Location"), time.perf_counter() - start, response)
+
+        if max_workers <= 1 or len(calls) <= 1:
+            return [run(call) for call in calls]
+        with futures.ThreadPoolExecutor(min(max_workers, len(calls))) as executor:
+            return list(executor.map(run, calls))
+
+    def place_orders(self, accountHash: str, orders: list[dict], max_workers: int = 8) -> list[OrderResult]:
+        """
+        Place several orders concurrently (within the order rate limit).
+
+        Args:
+            accountHash (str): account hash from account_linked()
+            orders (list[dict]): order dictionaries
+            max_workers (int): maximum concurrent requests. Defaults to 8.
+
+        Returns:
+            list[OrderResult]: result per order (in order), new_order_id is the placed order's ID
+        """
+        return self._order_batch([(None, self.place_order, (accountHash, order)) for order in orders], max_workers)
+
+    def replace_orders(self, accountHash: str, orders: dict, max_workers: int = 8) -> list[OrderResult]:
+        """
+        Replace several orders concurrently (within the order rate limit).
+
+        Args:
+            accountHash (str): account hash from account_linked()
+            orders (dict): order id -> new order dictionary
+            max_workers (int): maximum concurrent requests. Defaults to 8.
+
+        Returns:
+            list[OrderResult]: result per order (in order), new_order_id is the replacing order's ID
+        """
+        return self._order_batch([(order_id, self.replace_order, (accountHash, order_id, order)) for order_id, order in orders.items()], max_workers)
+
+    def cancel_orders(self, accountHash: str, orderIds: list[int | str], max_workers: int = 8) -> list[OrderResult]:
+        """
+        Cancel several orders concurrently (within the order rate limit).
+
+        Args:
+            accountHash (str): account hash from account_linked()
+            orderIds (list[int | str]): order ids
+            max_workers (int): maximum concurrent requests. Defaults to 8.
+
+        Returns:
+            list[OrderResult]: result per order (in order)
+        """
+        return self._order_batch([(order_id, self.cancel_order, (accountHash, order_id)) for order_id in orderIds], max_workers)
+
+    def cancel_all_orders(self, orders, accountNumber: str | None = None, symbol: str | None = None, max_workers: int = 8) -> list[OrderResult]:
+        """
+        Cancel every open order known to an OrderManager (no order lookups), optionally only for one account and/or symbol.
+
+        Args:
+            orders (schwabdev.orders.OrderManager): order state
+            accountNumber (str | None): plain account number, None for all accounts. Defaults to None.
+            symbol (str | None): symbol, None for all symbols. Defaults to None.
+            max_workers (int): maximum concurrent requests. Defaults to 8.
+
+        Returns:
+            list[OrderResult]: result per canceled order (orders of accounts that are not linked last, with an error)
+        """
+        calls, failed = [], []
+        for account, order_ids in self._open_orders_by_account(orders, accountNumber, symbol).items():
+            try:
+                account_hash = self._account_hash(account)
+            except Exception as e:  # not sent, reported per order
+                failed += [OrderResult(order_id, None, None, 0.0, error=e) for order_id in order_ids]
+                continue
+            calls += [(order_id, self.cancel_order, (account_hash, order_id)) for order_id in order_ids]
+        return self._order_batch(calls, max_workers) + failed
 
-    def account_orders_all(self, fromEnteredTime: datetime.datetime | str, toEnteredTime: datetime.datetime | str, maxResults: str | None = None, status: str | None = None) -> requests.Response:
+    def account_orders_all(self, fromEnteredTime: datetime.datetime | str, toEnteredTime: datetime.datetime | str, maxResults: str | None = None, status: str | None = None, stream: bool = False) -> requests.Response:
         """
         Get all orders for all accounts
 
@@ -300,16 +586,12 @@ class Client(ClientBase):
             toEnteredTime (datetime.datetime | str): end date
             maxResults (int | None): maximum number of results (set to None for default 3000)
             status (str | None): status of order (see documentation for possible values)
+            stream (bool): defer reading the body, iterate it with schwabdev.jsonstream.iter_items(...). Defaults to False.
 
         Returns:
             request.Response: all orders
         """
-        return self._request("GET", '/trader/v1/orders', 
-                             headers={"Accept": "application/json"},
-                             params=self._parse_params({'fromEnteredTime': self._time_convert(fromEnteredTime, TimeFormat.ISO_8601), 
-                                                         'toEnteredTime': self._time_convert(toEnteredTime, TimeFormat.ISO_8601), 
-                                                         'maxResults': maxResults, 
-                                                         'status': status}))
+        return self._call(endpoints.ACCOUNT_ORDERS_ALL, fromEnteredTime, toEnteredTime, maxResults, status, stream=stream)
 
     def preview_order(self, accountHash: str, orderObject: dict) -> requests.Response:
         """
@@ -318,11 +600,9 @@ class Client(ClientBase):
         Args:
             accountHash (str): account hash from account_linked()
         """
-        return self._request("POST", f'/trader/v1/accounts/{accountHash}/previewOrder',
-                             headers={'Content-Type': 'application/json'}, json=orderObject)
+        return self._call(endpoints.PREVIEW_ORDER, accountHash, json=orderObject)
 
-
-    def transactions(self, accountHash: str, startDate: datetime.datetime | str, endDate: datetime.datetime | str, types: str, symbol: str | None = None) -> requests.Response:
+    def transactions(self, accountHash: str, startDate: datetime.datetime | str, endDate: datetime.datetime | str, types: str, symbol: str | None = None, stream: bool = False) -> requests.Response:
         """
         All transactions for a specific account. Maximum number of transactions in response is 3000. Maximum date range is 1 year.
 
@@ -332,15 +612,12 @@ class Client(ClientBase):
             endDate (datetime.datetime | str): end date
             types (str): transaction type (see documentation for possible values)
             symbol (str | None): symbol
+            stream (bool): defer reading the body, iterate it with schwabdev.jsonstream.iter_items(...). Defaults to False.
 
         Returns:
             request.Response: list of transactions for a specific account
         """
-        return self._request("GET", f'/trader/v1/accounts/{accountHash}/transactions',
-                             params=self._parse_params({'startDate': self._time_convert(startDate, TimeFormat.ISO_8601), 
-                                                         'endDate': self._time_convert(endDate, TimeFormat.ISO_8601), 
-                                                         'types': types,
-                                                         'symbol': symbol}))
+        return self._call(endpoints.TRANSACTIONS, accountHash, startDate, endDate, types, symbol, stream=stream)
 
     def transaction_details(self, accountHash: str, transactionId: str | int) -> requests.Response:
         """
@@ -353,7 +630,7 @@ class Client(ClientBase):
         Returns:
             request.Response: transaction details of transaction id using accountHash
         """
-        return self._request("GET", f'/trader/v1/accounts/{accountHash}/transactions/{transactionId}')
+        return self._call(endpoints.TRANSACTION_DETAILS, accountHash, transactionId)
 
     def preferences(self) -> requests.Response:
         """
@@ -362,7 +639,7 @@ class Client(ClientBase):
         Returns:
             request.Response: User preferences and streaming info
         """
-        return self._request("GET", '/trader/v1/userPreference')
+        return self._call(endpoints.PREFERENCES)
 
     """
     Market Data
@@ -380,10 +657,7 @@ class Client(ClientBase):
         Returns:
             request.Response: list of quotes
         """
-        return self._request("GET", '/marketdata/v1/quotes',
-                             params=self._parse_params({'symbols': self._format_list(symbols),
-                                                         'fields': fields,
-                                                         'indicative': indicative}))
+        return self._call(endpoints.QUOTES, symbols, fields, indicative)
 
     def quote(self, symbol_id: str, fields: str | None = None) -> requests.Response:
         """
@@ -396,14 +670,13 @@ class Client(ClientBase):
         Returns:
             request.Response: quote for a single symbol
         """
-        return self._request("GET", f'/marketdata/v1/{urllib.parse.quote(symbol_id,safe="")}/quotes', 
-                             params=self._parse_params({'fields': fields}))
+        return self._call(endpoints.QUOTE, symbol_id, fields)
 
     def option_chains(self, symbol: str, contractType: str | None = None, strikeCount: int | None = None, includeUnderlyingQuote: bool | None = None, 
                       strategy: str | None = None, interval: str | None = None, strike: float | None = None, range: str | None = None, 
                       fromDate: datetime.datetime | datetime.date | str | None = None, toDate: datetime.datetime | datetime.date | str | None = None, 
                       volatility: float | None = None, underlyingPrice: float | None = None, interestRate: float | None = None, daysToExpiration: int | None = None, 
-                      expMonth: str | None = None, optionType: str | None = None, entitlement: str | None = None) -> requests.Response:
+                      expMonth: str | None = None, optionType: str | None = None, entitlement: str | None = None, stream: bool = False) -> requests.Response:
         """
         Get Option Chain including information on options contracts associated with each expiration for a ticker.
 
@@ -425,6 +698,7 @@ class Client(ClientBase):
             expMonth (str): expiration month
             optionType (str): option type ("ALL"|"CALL"|"PUT")
             entitlement (str): entitlement ("ALL"|"AMERICAN"|"EUROPEAN")
+            stream (bool): defer reading the body, iterate it with schwabdev.jsonstream.iter_items(...). Defaults to False.
 
         Notes:
             1. Some calls can exceed the amount of data that can be returned which results in a "Body buffer overflow"
@@ -435,25 +709,8 @@ class Client(ClientBase):
         Returns:
             request.Response: option chain
         """
-        return self._request("GET", '/marketdata/v1/chains',
-                            params=self._parse_params(
-                                {'symbol': symbol,
-                                 'contractType': contractType,
-                                 'strikeCount': strikeCount,
-                                 'includeUnderlyingQuote': includeUnderlyingQuote,
-                                 'strategy': strategy,
-                                 'interval': interval,
-                                 'strike': strike,
-                                 'range': range,
-                                 'fromDate': self._time_convert(fromDate, TimeFormat.YYYY_MM_DD),
-                                 'toDate': self._time_convert(toDate, TimeFormat.YYYY_MM_DD),
-                                 'volatility': volatility,
-                                 'underlyingPrice': underlyingPrice,
-                                 'interestRate': interestRate,
-                                 'daysToExpiration': daysToExpiration,
-                                 'expMonth': expMonth,
-                                 'optionType': optionType,
-                                 'entitlement': entitlement}))
+        return self._call(endpoints.OPTION_CHAINS, symbol, contractType, strikeCount, includeUnderlyingQuote, strategy, interval, strike, range, fromDate, toDate,
+                          volatility, underlyingPrice, interestRate, daysToExpiration, expMonth, optionType, entitlement, stream=stream)
 
     def option_expiration_chain(self, symbol: str) -> requests.Response:
         """
@@ -465,8 +722,45 @@ class Client(ClientBase):
         Returns:
             request.Response: Option expiration chain
         """
-        return self._request("GET", '/marketdata/v1/expirationchain', 
-                             params=self._parse_params({'symbol': symbol}))
+        return self._call(endpoints.OPTION_EXPIRATION_CHAIN, symbol)
+
+    def full_chain(self, symbol: str, contractType: str | None = None, includeUnderlyingQuote: bool | None = None,
+                   optionType: str | None = None, entitlement: str | None = None, max_workers: int = 8) -> dict:
+        """
+        Get the complete option chain (every expiration) for a ticker.
+        The chain is requested per expiration (split further by contract type and strike range if the server returns "Body buffer overflow"),
+        the parts are fetched concurrently under the client's rate limiter and merged into one chain.
+
+        Args:
+            symbol (str): ticker symbol
+            contractType (str): contract type ("CALL"|"PUT"|"ALL")
+            includeUnderlyingQuote (bool): include underlying quote (True|False)
+            optionType (str): option type ("ALL"|"CALL"|"PUT")
+            entitlement (str): entitlement ("ALL"|"AMERICAN"|"EUROPEAN")
+            max_workers (int): maximum number of concurrent requests. Defaults to 8.
+
+        Returns:
+            dict: option chain (same format as option_chains().json())
+        """
+        response = self.option_expiration_chain(symbol)
+        response.raise_for_status()
+        base = {key: value for key, value in (('symbol', symbol), ('contractType', contractType), ('includeUnderlyingQuote', includeUnderlyingQuote),
+                                              ('optionType', optionType), ('entitlement', entitlement)) if value is not None}
+
+        def fetch(params: dict) -> list[dict]:
+            response = self.option_chains(**params)
+            if response.ok:
+                return [response.json()]
+            splits = self._split_chain_params(params) if self._is_buffer_overflow(response.text) else []
+            if not splits:
+                response.raise_for_status()
+            self.logger.debug(f"Option chain too large, splitting request {params}")
+            return [part for split in splits for part in fetch(split)]
+
+        expirations = self._chain_expirations(response.json())
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            parts = executor.map(fetch, [base | {'fromDate': exp, 'toDate': exp} for exp in expirations])
+            return self._merge_chains([part for result in parts for part in result])
 
     def price_history(self, symbol: str, periodType: str | None = None, period: str | None = None, frequencyType: str | None = None, 
                       frequency: int | None = None, startDate: datetime.datetime | str | None = None, endDate: datetime.datetime | str | None = None, 
@@ -488,17 +782,8 @@ class Client(ClientBase):
         Returns:
             request.Response: Dictionary containing candle history
         """
-        return self._request("GET", '/marketdata/v1/pricehistory',
-                             params=self._parse_params({'symbol': symbol,
-                                                         'periodType': periodType,
-                                                         'period': period,
-                                                         'frequencyType': frequencyType,
-                                                         'frequency': frequency,
-                                                         'startDate': self._time_convert(startDate, TimeFormat.EPOCH_MS),
-                                                         'endDate': self._time_convert(endDate, TimeFormat.EPOCH_MS),
-                                                         'needExtendedHoursData': needExtendedHoursData,
-                                                         'needPreviousClose': needPreviousClose}))
-    
+        return self._call(endpoints.PRICE_HISTORY, symbol, periodType, period, frequencyType, frequency, startDate, endDate, needExtendedHoursData,
+                          needPreviousClose)
 
     def movers(self, symbol: str, sort: str | None = None, frequency: int | None = None) -> requests.Response:
         """
@@ -515,9 +800,7 @@ class Client(ClientBase):
         Returns:
             request.Response: Movers
         """
-        return self._request("GET", f'/marketdata/v1/movers/{symbol}', 
-                             headers={"accept": "application/json"}, 
-                             params=self._parse_params({'sort': sort, 'frequency': frequency}))
+        return self._call(endpoints.MOVERS, symbol, sort, frequency)
 
     def market_hours(self, symbols: list[str], date: datetime.datetime | datetime.date | str | None = None) -> requests.Response:
         """
@@ -530,9 +813,7 @@ class Client(ClientBase):
         Returns:
             request.Response: Market hours
         """
-        return self._request("GET", '/marketdata/v1/markets', 
-                             params=self._parse_params({'markets': self._format_list(symbols), 
-                                                         'date': self._time_convert(date, TimeFormat.YYYY_MM_DD)}))
+        return self._call(endpoints.MARKET_HOURS, symbols, date)
 
     def market_hour(self, market_id: str, date: datetime.datetime | datetime.date | str | None = None) -> requests.Response:
         """
@@ -545,8 +826,7 @@ class Client(ClientBase):
         Returns:
             request.Response: Market hours
         """
-        return self._request("GET", f'/marketdata/v1/markets/{market_id}', 
-                             params=self._parse_params({'date': self._time_convert(date, TimeFormat.YYYY_MM_DD)}))
+        return self._call(endpoints.MARKET_HOUR, market_id, date)
 
     def instruments(self, symbols: str, projection: str) -> requests.Response:
         """
@@ -559,8 +839,7 @@ class Client(ClientBase):
         Returns:
             request.Response: Instruments
         """
-        return self._request("GET", '/marketdata/v1/instruments', 
-                             params={'symbol': self._format_list(symbols), 'projection': projection})
+        return self._call(endpoints.INSTRUMENTS, symbols, projection)
 
     def instrument_cusip(self, cusip_id: str | int) -> requests.Response:
         """
@@ -572,19 +851,19 @@ class Client(ClientBase):
         Returns:
             request.Response: Instrument
         """
-        return self._request("GET", f'/marketdata/v1/instruments/{cusip_id}')
+        return self._call(endpoints.INSTRUMENT_CUSIP, cusip_id)
 
 class ClientAsync(ClientBase):
 
-    def __init__(self, app_key:str, app_secret:str, callback_url:str="https://127.0.0.1", tokens_db: str="~/.schwabdev/tokens.db", encryption:str=None, timeout:int=10, call_on_auth:callable=None, parsed: bool = False,):
-        if aiohttp is None:
+    def __init__(self, app_key:str, app_secret:str, callback_url:str="https://127.0.0.1", tokens_db: str="~/.schwabdev/tokens.db", encryption:str=None, timeout:int=10, call_on_auth:callable=None, parsed: bool | str = False, rate_limit:int | None=120, base_url:str | None=None, order_rate_limit:int | None=120, transport: Transport | None=None):
+        if transport is None and aiohttp is None:
             raise ImportError("aiohttp is required to use ClientAsync")
-        super().__init__(app_key, app_secret, callback_url, tokens_db, encryption, timeout, call_on_auth)
+        super().__init__(app_key, app_secret, callback_url, tokens_db, encryption, timeout, call_on_auth, rate_limit, base_url, order_rate_limit)
         self._parsed = parsed
-        self._session = aiohttp.ClientSession(base_url=self._base_api_url,
-                                              headers={'Authorization': f'Bearer {self.tokens.access_token}'}, 
-                                              timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self._transport = transport if transport is not None else AiohttpTransport()  # http transport (schwabdev.transport)
+        self._transport.open(self._base_api_url, {'Authorization': f'Bearer {self.tokens.access_token}'}, self.timeout)
         self._session_lock = threading.RLock()
+        self._tracing = False                                               # transport records timings, enabled with the first hook
         
     def update_tokens(self, force_access_token:bool=False, force_refresh_token:bool=False) -> bool:
         """
@@ -595,7 +874,7 @@ class ClientAsync(ClientBase):
         """
         if self.tokens.update_tokens(force_access_token, force_refresh_token):
             with self._session_lock:
-                self._session.headers['Authorization'] = f'Bearer {self.tokens.access_token}'
+                self._transport.headers['Authorization'] = f'Bearer {self.tokens.access_token}'
             return True
         else:
             return False
@@ -613,23 +892,104 @@ class ClientAsync(ClientBase):
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         self._checker_task.cancel()
-        await asyncio.shield(self._session.close())
+        await asyncio.shield(self._transport.close())
         retval = await self._task_group.__aexit__(exc_type, exc_val, exc_tb)
         return retval
     
-    async def _parse_response(self, response: aiohttp.ClientResponse, parsed: bool | None = None) -> aiohttp.ClientResponse | dict:
-        if (parsed is None and self._parsed) or (parsed is True):
+    def add_hook(self, hook: hooks.Hook) -> hooks.Hook:
+        if not self._tracing:
+            self._transport.enable_tracing()  # records connect/ttfb timings into the request's RequestInfo
+            self._tracing = True
+        return super().add_hook(hook)
+
+    add_hook.__doc__ = ClientBase.add_hook.__doc__
+
+    async def _request(self, method: str, path: str, **kwargs) -> aiohttp.ClientResponse:
+        if self._hooks:
+            return await self._request_hooked(method, path, **kwargs)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        return await self._transport.request(method, path, **kwargs)
+
+    async def _request_hooked(self, method: str, path: str, **kwargs) -> aiohttp.ClientResponse:
+        # same as _request but timing each step for hooks (tokens are updated by the background checker)
+        info = hooks.RequestInfo(method, path, f'{self._base_api_url}{path}')
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+            info.limiter_wait = time.perf_counter() - info.start
+        body = kwargs.get("json", kwargs.get("data"))
+        info.request_bytes = 0 if body is None else len(body) if isinstance(body, (str, bytes)) else None
+        self._call_hooks("before_request", info)
+        sent = time.perf_counter()
+        try:
+            response = await self._transport.request(method, path, trace_request_ctx=info, **kwargs)
+        except Exception as e:
+            info.error = e
+            info.timings["total"] = time.perf_counter() - sent
+            self._call_hooks("on_error", info, e)
+            raise
+        info.timings["total"] = time.perf_counter() - sent  # headers received, the body is read by the caller
+        info.url = str(response.url)
+        info.status = response.status
+        info.response_bytes = response.content_length
+        self._call_hooks("after_response", info, response)
+        return response
+
+    async def _order_request(self, method: str, path: str, **kwargs) -> aiohttp.ClientResponse:
+        if self.order_rate_limiter is not None:
+            await self.order_rate_limiter.acquire_async()
+        return await self._request(method, path, **kwargs)
+
+    async def _call(self, endpoint: endpoints.Endpoint, parsed: bool | str | None, *args, **kwargs) -> aiohttp.ClientResponse | dict:
+        # args are the endpoint's path arguments and query parameters, kwargs go to the request (json)
+        request = self._order_request if endpoint.order else self._request
+        response = await request(endpoint.method, endpoint.build(*args), headers=endpoint.headers, **kwargs)
+        return await self._parse_response(response, parsed, endpoint.model)
+
+    async def batch(self, calls: list, max_concurrency: int = 8) -> list[CallResult]:
+        """
+        Run many (different) api calls concurrently as tasks, under the client's rate limiter.
+
+        Args:
+            calls (list[Call | str | tuple]): calls, each a schwabdev.batch.Call, a method name or a tuple of (method name, *args),
+                e.g. [("quotes", ["AAPL", "AMD"]), "linked_accounts", Call("account_details_all", fields="positions", parsed=True)]
+            max_concurrency (int): maximum concurrent calls. Defaults to 8.
+
+        Returns:
+            list[CallResult]: result per call (in order) with the response (or parsed data), status, timing and error (calls do not raise)
+        """
+        resolved = self._batch_calls(calls)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        batch_start = time.perf_counter()
+
+        async def run(call, func):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    value = await func(*call.args, **call.kwargs)
+                    if hasattr(value, "read"):
+                        await value.read()  # release the connection, the body stays available
+                except Exception as e:
+                    return CallResult(call, None, None, start - batch_start, time.perf_counter() - start, e)
+                return CallResult(call, value, _response_status.get(), start - batch_start, time.perf_counter() - start)
+
+        return list(await asyncio.gather(*(run(call, func) for call, func in resolved)))
+
+    async def _parse_response(self, response: aiohttp.ClientResponse, parsed: bool | str | None = None, model: type | None = None) -> aiohttp.ClientResponse | dict:
+        _response_status.set(response.status)
+        if parsed is None:
+            parsed = self._parsed
+        if parsed:
             content_type = response.headers.get("Content-Type", "").lower()
             if content_type.startswith("application/json"):
+                if parsed == "model" and model is not None and response.ok:
+                    return model.decode(await response.read())
                 return await response.json()
             else: # assume "text/html" | "text/plain" | etc.
                 return await response.text()
         else:
             return response
             
-    def _handle_aiohttp_bool(self, value: bool) -> str:
-        if value is None: return None
-        return "true" if value else "false"
 
     """
     Accounts and Trading Production
@@ -643,10 +1003,22 @@ class ClientAsync(ClientBase):
         Return:
             aiohttp.ClientResponse: All linked account numbers and hashes
         """
-        return await self._parse_response(
-            await self._session.get('/trader/v1/accounts/accountNumbers'),
-            parsed,
-        )
+        return await self._call(endpoints.LINKED_ACCOUNTS, parsed)
+
+    async def _account_hash(self, accountNumber: str) -> str:
+        """
+        Account hash of a plain account number, cached from linked_accounts() and refreshed when the account is not cached.
+
+        Raises:
+            ValueError: linked_accounts() failed or the account is not linked
+        """
+        accountNumber = str(accountNumber)
+        if accountNumber not in self._account_hashes:
+            response = await self.linked_accounts(parsed=False)
+            self._cache_account_hashes(response.status, await response.json() if response.ok else await response.text())
+            if accountNumber not in self._account_hashes:
+                raise self._unknown_account(accountNumber)
+        return self._account_hashes[accountNumber]
 
     async def account_details_all(self, fields: str = None, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -658,14 +1030,8 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: details for all linked accounts
         """
-        return await self._parse_response(
-            await self._session.get(
-                '/trader/v1/accounts/',
-                params=self._parse_params({'fields': fields}),
-            ),
-            parsed,
-        )
-        
+        return await self._call(endpoints.ACCOUNT_DETAILS_ALL, parsed, fields)
+
     async def account_details(self, accountHash: str, fields: str = None, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
         Specific account information with balances and positions. The balance information on these accounts is displayed by default but Positions will be returned based on the "positions" flag.
@@ -677,13 +1043,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: details for one linked account
         """
-        return await self._parse_response(
-            await self._session.get(
-                f'/trader/v1/accounts/{accountHash}',
-                params=self._parse_params({'fields': fields}),
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.ACCOUNT_DETAILS, parsed, accountHash, fields)
 
     async def account_orders(self, accountHash: str, 
                              fromEnteredTime: datetime.datetime | str, 
@@ -702,21 +1062,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: orders for one linked account
         """
-        return await self._parse_response(
-            await self._session.get(
-                f'/trader/v1/accounts/{accountHash}/orders',
-                headers={"Accept": "application/json"},
-                params=self._parse_params(
-                    {
-                        'maxResults': maxResults,
-                        'fromEnteredTime': self._time_convert(fromEnteredTime, TimeFormat.ISO_8601),
-                        'toEnteredTime': self._time_convert(toEnteredTime, TimeFormat.ISO_8601),
-                        'status': status,
-                    }
-                ),
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.ACCOUNT_ORDERS, parsed, accountHash, fromEnteredTime, toEnteredTime, maxResults, status)
 
     async def place_order(self, accountHash: str, order: dict) -> aiohttp.ClientResponse:
         """
@@ -729,14 +1075,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: order number in response header (if immediately filled then order number not returned)
         """
-        return await self._parse_response(
-            await self._session.post(
-                f'/trader/v1/accounts/{accountHash}/orders',
-                headers={"Accept": "application/json", "Content-Type": "application/json"},
-                json=order,
-            ),
-            False, # must be raw to get headers
-        )
+        return await self._call(endpoints.PLACE_ORDER, False, accountHash, json=order)
 
     async def order_details(self, accountHash: str, orderId: int | str, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -749,13 +1088,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: order details
         """
-        return await self._parse_response(
-            await self._session.get(
-                f'/trader/v1/accounts/{accountHash}/orders/{orderId}',
-            ),
-            parsed,
-        )
-
+        return await self._call(endpoints.ORDER_DETAILS, parsed, accountHash, orderId)
 
     async def cancel_order(self, accountHash: str, orderId: int | str, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -768,12 +1101,8 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: response code
         """
-        return await self._parse_response(
-            await self._session.delete(
-                f'/trader/v1/accounts/{accountHash}/orders/{orderId}',
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.CANCEL_ORDER, parsed, accountHash, orderId)
+
     async def replace_order(self, accountHash: str, orderId: int | str, order: dict) -> aiohttp.ClientResponse:
         """
         Replace an existing order for an account. The existing order will be replaced by the new order. Once replaced, the old order will be canceled and a new order will be created.
@@ -786,14 +1115,90 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: response code
         """
-        return await self._parse_response(
-            await self._session.put(
-                f'/trader/v1/accounts/{accountHash}/orders/{orderId}',
-                headers={"Accept": "application/json", "Content-Type": "application/json"},
-                json=order,
-            ),
-            False, # must be raw to get headers
-        )
+        return await self._call(endpoints.REPLACE_ORDER, False, accountHash, orderId, json=order)
+
+    async def _order_batch(self, calls: list[tuple], max_concurrency: int) -> list[OrderResult]:
+        """
+        Run order calls as tasks, collecting a result (or error) per call in order.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(order_id, method, args):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await method(*args)
+                    await response.read()  # release the connection
+                except Exception as e:
+                    return OrderResult(order_id, None, None, time.perf_counter() - start, error=e)
+                return OrderResult(order_id, response.status, response.headers.get("Location"), time.perf_counter() - start, response)
+
+        return list(await asyncio.gather(*(run(*call) for call in calls)))
+
+    async def place_orders(self, accountHash: str, orders: list[dict], max_concurrency: int = 8) -> list[OrderResult]:
+        """
+        Place several orders concurrently (within the order rate limit).
+
+        Args:
+            accountHash (str): account hash from account_linked()
+            orders (list[dict]): order dictionaries
+            max_concurrency (int): maximum concurrent requests. Defaults to 8.
+
+        Returns:
+            list[OrderResult]: result per order (in order), new_order_id is the placed order's ID
+        """
+        return await self._order_batch([(None, self.place_order, (accountHash, order)) for order in orders], max_concurrency)
+
+    async def replace_orders(self, accountHash: str, orders: dict, max_concurrency: int = 8) -> list[OrderResult]:
+        """
+        Replace several orders concurrently (within the order rate limit).
+
+        Args:
+            accountHash (str): account hash from account_linked()
+            orders (dict): order id -> new order dictionary
+            max_concurrency (int): maximum concurrent requests. Defaults to 8.
+
+        Returns:
+            list[OrderResult]: result per order (in order), new_order_id is the replacing order's ID
+        """
+        return await self._order_batch([(order_id, self.replace_order, (accountHash, order_id, order)) for order_id, order in orders.items()], max_concurrency)
+
+    async def cancel_orders(self, accountHash: str, orderIds: list[int | str], max_concurrency: int = 8) -> list[OrderResult]:
+        """
+        Cancel several orders concurrently (within the order rate limit).
+
+        Args:
+            accountHash (str): account hash from account_linked()
+            orderIds (list[int | str]): order ids
+            max_concurrency (int): maximum concurrent requests. Defaults to 8.
+
+        Returns:
+            list[OrderResult]: result per order (in order)
+        """
+        return await self._order_batch([(order_id, self.cancel_order, (accountHash, order_id, False)) for order_id in orderIds], max_concurrency)
+
+    async def cancel_all_orders(self, orders, accountNumber: str | None = None, symbol: str | None = None, max_concurrency: int = 8) -> list[OrderResult]:
+        """
+        Cancel every open order known to an OrderManager (no order lookups), optionally only for one account and/or symbol.
+
+        Args:
+            orders (schwabdev.orders.OrderManager): order state
+            accountNumber (str | None): plain account number, None for all accounts. Defaults to None.
+            symbol (str | None): symbol, None for all symbols. Defaults to None.
+            max_concurrency (int): maximum concurrent requests. Defaults to 8.
+
+        Returns:
+            list[OrderResult]: result per canceled order (orders of accounts that are not linked last, with an error)
+        """
+        calls, failed = [], []
+        for account, order_ids in self._open_orders_by_account(orders, accountNumber, symbol).items():
+            try:
+                account_hash = await self._account_hash(account)
+            except Exception as e:  # not sent, reported per order
+                failed += [OrderResult(order_id, None, None, 0.0, error=e) for order_id in order_ids]
+                continue
+            calls += [(order_id, self.cancel_order, (account_hash, order_id, False)) for order_id in order_ids]
+        return await self._order_batch(calls, max_concurrency) + failed
 
     async def account_orders_all(self, fromEnteredTime: datetime.datetime | str, 
                                  toEnteredTime: datetime.datetime | str, 
@@ -810,34 +1215,20 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: all orders
         """
-        return await self._parse_response(
-            await self._session.get(
-                '/trader/v1/orders',
-                headers={"Accept": "application/json"},
-                params=self._parse_params(
-                    {
-                        'maxResults': maxResults,
-                        'fromEnteredTime': self._time_convert(fromEnteredTime, TimeFormat.ISO_8601),
-                        'toEnteredTime': self._time_convert(toEnteredTime, TimeFormat.ISO_8601),
-                        'status': status,
-                    }
-                ),
-            ),
-            parsed,
-        )
-
+        return await self._call(endpoints.ACCOUNT_ORDERS_ALL, parsed, fromEnteredTime, toEnteredTime, maxResults, status)
 
     async def preview_order(self, accountHash: str, order: dict, parsed: bool | None = None) -> aiohttp.ClientResponse:
-        return await self._parse_response(
-            await self._session.post(
-                f'/trader/v1/accounts/{accountHash}/previewOrder',
-                headers={'Content-Type': 'application/json'},
-                json=order,
-            ),            
-            parsed,
-        )
-        
+        """
+        Preview an order for a specific account.
+
+        Args:
+            accountHash (str): account hash from account_linked()
+            order (dict): order dictionary (format examples in github documentation)
 
+        Returns:
+            aiohttp.ClientResponse: order preview
+        """
+        return await self._call(endpoints.PREVIEW_ORDER, parsed, accountHash, json=order)
 
     async def transactions(self, accountHash: str, startDate: datetime.datetime | str, 
                            endDate: datetime.datetime | str, types: str, symbol: str = None, parsed: bool | None = None) -> aiohttp.ClientResponse:
@@ -854,20 +1245,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: list of transactions for a specific account
         """
-        return await self._parse_response(
-            await self._session.get(
-                f'/trader/v1/accounts/{accountHash}/transactions',
-                params=self._parse_params(
-                    {
-                        'startDate': self._time_convert(startDate, TimeFormat.ISO_8601),
-                        'endDate': self._time_convert(endDate, TimeFormat.ISO_8601),
-                        'symbol': symbol,
-                        'types': types,
-                    }
-                ),
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.TRANSACTIONS, parsed, accountHash, startDate, endDate, types, symbol)
 
     async def transaction_details(self, accountHash: str, transactionId: str | int, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -880,12 +1258,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: transaction details of transaction id using accountHash
         """
-        return await self._parse_response(
-            await self._session.get(
-                f'/trader/v1/accounts/{accountHash}/transactions/{transactionId}',
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.TRANSACTION_DETAILS, parsed, accountHash, transactionId)
 
     async def preferences(self, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -894,11 +1267,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: User preferences and streaming info
         """
-        return await self._parse_response(
-            await self._session.get('/trader/v1/userPreference'),
-            parsed,
-        )
-
+        return await self._call(endpoints.PREFERENCES, parsed)
 
     """
     Market Data
@@ -916,19 +1285,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: list of quotes
         """
-        return await self._parse_response(
-            await self._session.get(
-                '/marketdata/v1/quotes',
-                params=self._parse_params(
-                    {
-                        'symbols': self._format_list(symbols),
-                        'fields': fields,
-                        'indicative': self._handle_aiohttp_bool(indicative),
-                    }
-                ),
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.QUOTES, parsed, symbols, fields, indicative)
 
     async def quote(self, symbol_id: str, fields: str = None, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -941,13 +1298,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: quote for a single symbol
         """
-        return await self._parse_response(
-            await self._session.get(
-                f'/marketdata/v1/{urllib.parse.quote(symbol_id, safe="")}/quotes',
-                params=self._parse_params({'fields': fields}),
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.QUOTE, parsed, symbol_id, fields)
 
     async def option_chains(self, symbol: str, contractType: str | None = None, strikeCount: int | None = None, includeUnderlyingQuote: bool | None = None, 
                       strategy: str | None = None, interval: str | None = None, strike: float | None = None, range: str | None = None, 
@@ -985,34 +1336,8 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: option chain
         """
-        return await self._parse_response(
-            await self._session.get(
-                '/marketdata/v1/chains',
-                params=self._parse_params(
-                    {
-                        'symbol': symbol,
-                        'contractType': contractType,
-                        'strikeCount': strikeCount,
-                        'includeUnderlyingQuote': self._handle_aiohttp_bool(includeUnderlyingQuote),
-                        'strategy': strategy,
-                        'interval': interval,
-                        'strike': strike,
-                        'range': range,
-                        'fromDate': self._time_convert(fromDate, TimeFormat.YYYY_MM_DD),
-                        'toDate': self._time_convert(toDate, TimeFormat.YYYY_MM_DD),
-                        'volatility': volatility,
-                        'underlyingPrice': underlyingPrice,
-                        'interestRate': interestRate,
-                        'daysToExpiration': daysToExpiration,
-                        'expMonth': expMonth,
-                        'optionType': optionType,
-                        'entitlement': entitlement,
-                    }
-                ),
-            ),
-            parsed,
-        )
-
+        return await self._call(endpoints.OPTION_CHAINS, parsed, symbol, contractType, strikeCount, includeUnderlyingQuote, strategy, interval, strike, range, fromDate, toDate,
+                                volatility, underlyingPrice, interestRate, daysToExpiration, expMonth, optionType, entitlement)
 
     async def option_expiration_chain(self, symbol: str, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -1024,13 +1349,47 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: Option expiration chain
         """
-        return await self._parse_response(
-            await self._session.get(
-                '/marketdata/v1/expirationchain',
-                params=self._parse_params({'symbol': symbol}),
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.OPTION_EXPIRATION_CHAIN, parsed, symbol)
+
+    async def full_chain(self, symbol: str, contractType: str | None = None, includeUnderlyingQuote: bool | None = None,
+                         optionType: str | None = None, entitlement: str | None = None, max_concurrency: int = 8) -> dict:
+        """
+        Get the complete option chain (every expiration) for a ticker.
+        The chain is requested per expiration (split further by contract type and strike range if the server returns "Body buffer overflow"),
+        the parts are fetched concurrently under the client's rate limiter and merged into one chain.
+
+        Args:
+            symbol (str): ticker symbol
+            contractType (str): contract type ("CALL"|"PUT"|"ALL")
+            includeUnderlyingQuote (bool): include underlying quote (True|False)
+            optionType (str): option type ("ALL"|"CALL"|"PUT")
+            entitlement (str): entitlement ("ALL"|"AMERICAN"|"EUROPEAN")
+            max_concurrency (int): maximum number of concurrent requests. Defaults to 8.
+
+        Returns:
+            dict: option chain (same format as option_chains())
+        """
+        response = await self.option_expiration_chain(symbol, parsed=False)
+        response.raise_for_status()
+        base = {key: value for key, value in (('symbol', symbol), ('contractType', contractType), ('includeUnderlyingQuote', includeUnderlyingQuote),
+                                              ('optionType', optionType), ('entitlement', entitlement)) if value is not None}
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(params: dict) -> list[dict]:
+            async with semaphore:
+                response = await self.option_chains(**params, parsed=False)
+                if response.ok:
+                    return [await response.json()]
+                text = await response.text()
+            splits = self._split_chain_params(params) if self._is_buffer_overflow(text) else []
+            if not splits:
+                response.raise_for_status()
+            self.logger.debug(f"Option chain too large, splitting request {params}")
+            return [part for parts in await asyncio.gather(*(fetch(split) for split in splits)) for part in parts]
+
+        expirations = self._chain_expirations(await response.json())
+        results = await asyncio.gather(*(fetch(base | {'fromDate': exp, 'toDate': exp}) for exp in expirations))
+        return self._merge_chains([part for result in results for part in result])
         
     async def price_history(self, symbol: str, periodType: str | None = None, period: str | None = None, frequencyType: str | None = None, 
                       frequency: int | None = None, startDate: datetime.datetime | str | None = None, endDate: datetime.datetime | str | None = None, 
@@ -1052,25 +1411,8 @@ class ClientAsync(ClientBase):
             Returns:
                 aiohttp.ClientResponse: Dictionary containing candle history
             """
-            return await self._parse_response(
-            await self._session.get(
-                '/marketdata/v1/pricehistory',
-                params=self._parse_params(
-                    {
-                        'symbol': symbol,
-                        'periodType': periodType,
-                        'period': period,
-                        'frequencyType': frequencyType,
-                        'frequency': frequency,
-                        'startDate': self._time_convert(startDate, TimeFormat.EPOCH_MS),
-                        'endDate': self._time_convert(endDate, TimeFormat.EPOCH_MS),
-                        'needExtendedHoursData': self._handle_aiohttp_bool(needExtendedHoursData),
-                        'needPreviousClose': self._handle_aiohttp_bool(needPreviousClose),
-                    }
-                ),
-            ),
-            parsed,
-        )
+            return await self._call(endpoints.PRICE_HISTORY, parsed, symbol, periodType, period, frequencyType, frequency, startDate, endDate, needExtendedHoursData,
+                                    needPreviousClose)
 
     async def movers(self, symbol: str, sort: str = None, frequency: int | None = None, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -1087,14 +1429,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: Movers
         """
-        return await self._parse_response(
-            await self._session.get(
-                f'/marketdata/v1/movers/{symbol}',
-                headers={"accept": "application/json"},
-                params=self._parse_params({'sort': sort, 'frequency': frequency}),
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.MOVERS, parsed, symbol, sort, frequency)
 
     async def market_hours(self, symbols: list[str], date: datetime.datetime | datetime.date | str = None, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -1107,18 +1442,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: Market hours
         """
-        return await self._parse_response(
-            await self._session.get(
-                '/marketdata/v1/markets',
-                params=self._parse_params(
-                    {
-                        'markets': symbols,
-                        'date': self._time_convert(date, TimeFormat.YYYY_MM_DD),
-                    }
-                ),
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.MARKET_HOURS, parsed, symbols, date)
 
     async def market_hour(self, market_id: str, date: datetime.datetime | datetime.date | str = None, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -1131,13 +1455,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: Market hours
         """
-        return await self._parse_response(
-            await self._session.get(
-                f'/marketdata/v1/markets/{market_id}',
-                params=self._parse_params({'date': self._time_convert(date, TimeFormat.YYYY_MM_DD)}),
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.MARKET_HOUR, parsed, market_id, date)
 
     async def instruments(self, symbol: str, projection: str, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -1150,13 +1468,7 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: Instruments
         """
-        return await self._parse_response(
-            await self._session.get(
-                '/marketdata/v1/instruments',
-                params={'symbol': symbol, 'projection': projection},
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.INSTRUMENTS, parsed, symbol, projection)
 
     async def instrument_cusip(self, cusip_id: str | int, parsed: bool | None = None) -> aiohttp.ClientResponse:
         """
@@ -1168,9 +1480,4 @@ class ClientAsync(ClientBase):
         Returns:
             aiohttp.ClientResponse: Instrument
         """
-        return await self._parse_response(
-            await self._session.get(
-                f'/marketdata/v1/instruments/{cusip_id}',
-            ),
-            parsed,
-        )
+        return await self._call(endpoints.INSTRUMENT_CUSIP, parsed, cusip_id)
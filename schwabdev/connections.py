@@ -0,0 +1,278 @@
+"""
+Schwabdev Connections Module.
+Keeps the client's pooled connections open: pre-opens and validates them at startup and before a scheduled time (e.g.
+the market open), then sends keep-alive requests so the first order or quote does not pay DNS/TCP/TLS setup.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import datetime
+import threading
+import time
+import zoneinfo
+
+from ._lazy import lazy_import
+
+asyncio = lazy_import("asyncio")
+futures = lazy_import("concurrent.futures")
+requests = lazy_import("requests")
+
+
+class ConnectionManagerBase:
+
+    def __init__(self, client, connections: int = 4, keepalive: float = 30.0, start_time: datetime.time = datetime.time(9, 29, 30),
+                 stop_time: datetime.time = datetime.time(16, 0, 0), on_days: list[int] | tuple[int] = (0, 1, 2, 3, 4),
+                 now_timezone: zoneinfo.ZoneInfo = zoneinfo.ZoneInfo("America/New_York"), path: str = "/"):
+        """
+        Shared scheduling and statistics of ConnectionManager and ConnectionManagerAsync.
+
+        Args:
+            client (Client | OrderEntry | ClientAsync): client whose connections are kept open
+            connections (int): number of pooled connections to keep open. Defaults to 4.
+            keepalive (float): seconds between keep-alive requests while in hours. Defaults to 30.
+            start_time (datetime.time): time to (re)open the connections, keep-alives are sent from then until stop_time. Defaults to 9:29:30.
+            stop_time (datetime.time): time to stop sending keep-alives. Defaults to 16:00.
+            on_days (list[int]): day(s) to open the connections (0 = Monday, ..., 6 = Sunday). Defaults to (0,1,2,3,4).
+            now_timezone (zoneinfo.ZoneInfo): timezone of start_time and stop_time. Defaults to ZoneInfo("America/New_York").
+            path (str): path requested to open connections (relative to the base url, not an api call so it does not count
+                against the rate limit). Defaults to "/".
+        """
+        self._client = getattr(client, "_client", client)              # Client/ClientAsync (of an OrderEntry)
+        self._logger = self._client.logger
+        self.connections = connections                                  # pooled connections kept open
+        self.keepalive = keepalive                                      # seconds between keep-alives
+        self.start_time = start_time                                    # time connections are opened
+        self.stop_time = stop_time                                      # time keep-alives stop
+        self.on_days = on_days                                          # days connections are opened
+        self.now_timezone = now_timezone                                # timezone of start/stop times
+        self.path = path                                                # path of warm-up requests
+        self.warms = 0                                                  # warm-ups (startup and scheduled)
+        self.keepalives = 0                                             # keep-alive rounds
+        self.failures = 0                                               # connections that did not answer
+        self.last_warm = None                                           # time.monotonic() of the last round
+        self.warm_time = None                                           # seconds the last round took
+
+    def _next_round(self) -> tuple[float, bool]:
+        """
+        Seconds until the next round and whether it is the scheduled warm-up (else a keep-alive).
+        """
+        now = datetime.datetime.now(self.now_timezone)
+        for days in range(8):
+            scheduled = datetime.datetime.combine(now.date() + datetime.timedelta(days=days), self.start_time, tzinfo=self.now_timezone)
+            if scheduled > now and scheduled.weekday() in self.on_days:
+                break
+        until_scheduled = (scheduled - now).total_seconds()
+        in_hours = (self.start_time <= now.time() <= self.stop_time) and (now.weekday() in self.on_days)
+        if in_hours and self.keepalive < until_scheduled:
+            return self.keepalive, False
+        return until_scheduled, True
+
+    def _record(self, answered: int, elapsed: float, scheduled: bool | None):
+        if scheduled is False:
+            self.keepalives += 1
+        else:
+            self.warms += 1
+        self.failures += self.connections - answered
+        self.last_warm = time.monotonic()
+        self.warm_time = elapsed
+        if answered < self.connections:
+            self._logger.warning(f"{self.connections - answered} of {self.connections} connections did not answer the warm-up request")
+        elif scheduled is not False:
+            self._logger.info(f"Opened {answered} connections in {elapsed * 1000:.1f}ms")
+
+    def _stats(self, pool: dict) -> dict:
+        pool.update(warms=self.warms, keepalives=self.keepalives, failures=self.failures, warm_time=self.warm_time,
+                    since_warm=None if self.last_warm is None else time.monotonic() - self.last_warm)
+        return pool
+
+
+class ConnectionManager(ConnectionManagerBase):
+
+    def __init__(self, client, connections: int = 4, keepalive: float = 30.0, start_time: datetime.time = datetime.time(9, 29, 30),
+                 stop_time: datetime.time = datetime.time(16, 0, 0), on_days: list[int] | tuple[int] = (0, 1, 2, 3, 4),
+                 now_timezone: zoneinfo.ZoneInfo = zoneinfo.ZoneInfo("America/New_York"), path: str = "/"):
+        """
+        Keep the pooled connections of a Client (or OrderEntry) open, see ConnectionManagerBase for the arguments.
+        The requests session pool is enlarged if it holds fewer than the given number of connections.
+        """
+        super().__init__(client, connections, keepalive, start_time, stop_time, on_days, now_timezone, path)
+        self._session = client._session                                  # requests.Session of the client/order entry
+        self._url = self._client._base_api_url + path
+        self._executor = None                                           # threads opening connections concurrently
+        self._stop = threading.Event()
+        self._thread = None
+        adapter = self._session.get_adapter(self._url)
+        if adapter._pool_maxsize < connections:
+            self._session.mount(self._client._base_api_url, requests.adapters.HTTPAdapter(pool_maxsize=connections))
+
+    def _head(self):
+        return self._session.head(self._url, stream=True, timeout=self._client.timeout)
+
+    def warm(self, scheduled: bool | None = None) -> float:
+        """
+        Open (or keep open) the connections with concurrent lightweight requests, each holds its connection until all
+        have answered so every pooled connection is used.
+
+        Args:
+            scheduled (bool | None): whether this is the scheduled warm-up (True), a keep-alive (False) or manual (None). Defaults to None.
+
+        Returns:
+            float: seconds taken
+        """
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(max_workers=self.connections, thread_name_prefix="schwabdev-warm")
+        start = time.perf_counter()
+        pending = [self._executor.submit(self._head) for _ in range(self.connections)]
+        futures.wait(pending)  # release connections only once every request has one
+        answered = 0
+        for future in pending:
+            try:
+                future.result().content  # reading the (empty) body returns the connection to the pool
+                answered += 1
+            except Exception as e:
+                self._logger.debug(f"Warm-up request failed: {e}")
+        elapsed = time.perf_counter() - start
+        self._record(answered, elapsed, scheduled)
+        return elapsed
+
+    def _run(self):
+        while True:
+            delay, scheduled = self._next_round()
+            if self._stop.wait(delay):
+                return
+            self.warm(scheduled)
+
+    def start(self, daemon: bool = True):
+        """
+        Open the connections now, then in a background thread at start_time on on_days with keep-alives until stop_time.
+
+        Args:
+            daemon (bool): whether to run the thread in the background (as a daemon). Defaults to True.
+        """
+        self.warm()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="schwabdev-connections", daemon=daemon)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread (the connections stay open until they time out).
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """
+        Connection pool statistics.
+
+        Returns:
+            dict: {"limit": maximum pooled connections, "open": open connections, "idle": open connections not in use,
+                "in_use": connections with a request in flight, "opened": connections opened since the pool was made,
+                "requests": requests sent by the pool, "warms", "keepalives", "failures": warm-up rounds and connections
+                that did not answer, "warm_time": seconds the last round took, "since_warm": seconds since the last round}
+        """
+        prepared = self._session.prepare_request(requests.Request("HEAD", self._url))
+        settings = self._session.merge_environment_settings(prepared.url, {}, None, None, None)
+        adapter = self._session.get_adapter(self._url)
+        if hasattr(adapter, "get_connection_with_tls_context"):  # requests >= 2.32.2
+            pool = adapter.get_connection_with_tls_context(prepared, settings["verify"], settings["proxies"], settings["cert"])
+        else:
+            pool = adapter.get_connection(self._url, settings["proxies"])
+        if pool.pool is None:  # closed
+            return self._stats({"limit": 0, "open": 0, "idle": 0, "in_use": 0, "opened": pool.num_connections, "requests": pool.num_requests})
+        idle = sum(connection is not None and connection.is_connected for connection in list(pool.pool.queue))
+        in_use = pool.pool.maxsize - pool.pool.qsize()
+        return self._stats({"limit": pool.pool.maxsize, "open": idle + in_use, "idle": idle, "in_use": in_use,
+                            "opened": pool.num_connections, "requests": pool.num_requests})
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class ConnectionManagerAsync(ConnectionManagerBase):
+
+    def __init__(self, client, connections: int = 4, keepalive: float = 30.0, start_time: datetime.time = datetime.time(9, 29, 30),
+                 stop_time: datetime.time = datetime.time(16, 0, 0), on_days: list[int] | tuple[int] = (0, 1, 2, 3, 4),
+                 now_timezone: zoneinfo.ZoneInfo = zoneinfo.ZoneInfo("America/New_York"), path: str = "/"):
+        """
+        Keep the pooled connections of a ClientAsync open, see ConnectionManagerBase for the arguments.
+        keepalive is lowered below the transport's idle timeout (e.g. AiohttpTransport(keepalive_timeout=15)) so
+        connections are not closed between keep-alives.
+        """
+        super().__init__(client, connections, keepalive, start_time, stop_time, on_days, now_timezone, path)
+        self._transport = client._transport                              # schwabdev.transport.Transport
+        idle_timeout = self._transport.idle_timeout
+        if idle_timeout is not None and keepalive >= idle_timeout:
+            self.keepalive = idle_timeout * 0.8
+            self._logger.debug(f"Keep-alive interval lowered to {self.keepalive:.1f}s (transport idle timeout is {idle_timeout}s)")
+        self._task = None
+
+    async def warm(self, scheduled: bool | None = None) -> float:
+        """
+        Open (or keep open) the connections with concurrent lightweight requests.
+
+        Args:
+            scheduled (bool | None): whether this is the scheduled warm-up (True), a keep-alive (False) or manual (None). Defaults to None.
+
+        Returns:
+            float: seconds taken
+        """
+        start = time.perf_counter()
+        answered = await self._transport.warm(self.path, self.connections)
+        elapsed = time.perf_counter() - start
+        self._record(answered, elapsed, scheduled)
+        return elapsed
+
+    async def _run(self):
+        while True:
+            delay, scheduled = self._next_round()
+            await asyncio.sleep(delay)
+            try:
+                await self.warm(scheduled)
+            except Exception as e:
+                self._logger.error(f"Connection warm-up failed: {e}")
+
+    async def start(self):
+        """
+        Open the connections now, then in a background task at start_time on on_days with keep-alives until stop_time.
+        """
+        await self.warm()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background task (the connections stay open until they time out).
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        """
+        Connection pool statistics.
+
+        Returns:
+            dict: {"limit": maximum connections (None for no limit), "open": open connections, "idle": open connections
+                not in use, "in_use": connections with a request in flight, "warms", "keepalives", "failures": warm-up
+                rounds and connections that did not answer, "warm_time": seconds the last round took, "since_warm":
+                seconds since the last round}
+        """
+        return self._stats(self._transport.pool_stats())
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
@@ -0,0 +1,190 @@
+"""
+Schwabdev Endpoints Module.
+Api endpoints declared once (method, path template, query parameters and their converters) and compiled into request
+builders shared by Client and ClientAsync, query strings are built directly instead of filtering a params dict per call.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import datetime
+import re
+import urllib.parse
+
+from . import models
+from .enums import TimeFormat
+
+_quote = urllib.parse.quote
+_plain = re.compile(r"[A-Za-z0-9_.,:~-]*").fullmatch  # values that need no quoting
+_time_types = (datetime.datetime, datetime.date)
+
+
+def iso_8601(value):
+    """
+    datetime/date -> "YYYY-MM-DDTHH:MM:SS.mmmZ" (aware datetimes are converted to UTC), other values (e.g. preformatted
+    strings) pass through.
+    """
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc)
+        return (f"{value.year:04d}-{value.month:02d}-{value.day:02d}T{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
+                f".{value.microsecond // 1000:03d}Z")
+    if isinstance(value, datetime.date):
+        return f"{value.year:04d}-{value.month:02d}-{value.day:02d}T00:00:00.000Z"
+    return value
+
+
+def epoch(value):
+    """
+    datetime/date (local midnight) -> epoch seconds, other values pass through.
+    """
+    if isinstance(value, _time_types):
+        if not isinstance(value, datetime.datetime):
+            value = datetime.datetime.combine(value, datetime.time())
+        return int(value.timestamp())
+    return value
+
+
+def epoch_ms(value):
+    """
+    datetime/date (local midnight) -> epoch milliseconds, other values pass through.
+    """
+    if isinstance(value, _time_types):
+        if not isinstance(value, datetime.datetime):
+            value = datetime.datetime.combine(value, datetime.time())
+        return int(value.timestamp() * 1000)
+    return value
+
+
+def yyyy_mm_dd(value):
+    """
+    datetime/date -> "YYYY-MM-DD", other values pass through.
+    """
+    if isinstance(value, _time_types):
+        return f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+    return value
+
+
+def csv(value):
+    """
+    list -> "a,b,c", other values pass through.
+    """
+    if isinstance(value, (list, tuple)):
+        return ",".join(value)
+    return value
+
+
+def boolean(value):
+    """
+    bool -> "true"/"false", other values pass through.
+    """
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return value
+
+
+# TimeFormat -> converter
+TIME_CONVERTERS = {TimeFormat.ISO_8601: iso_8601, TimeFormat.EPOCH: epoch, TimeFormat.EPOCH_MS: epoch_ms, TimeFormat.YYYY_MM_DD: yyyy_mm_dd}
+
+
+class Endpoint:
+    __slots__ = ("method", "path", "params", "headers", "model", "order", "_format", "_path_args", "_quoted", "_query")
+
+    def __init__(self, method: str, path: str, params: tuple = (), headers: dict | None = None, model: type | None = None,
+                 quoted: tuple[str] = (), order: bool = False):
+        """
+        Api endpoint spec, compiled into a request builder.
+
+        Args:
+            method (str): HTTP method
+            path (str): path template, e.g. "/trader/v1/accounts/{accountHash}/orders"
+            params (tuple): query parameters in argument order, each a name or (name, converter); None values are left out
+            headers (dict | None): request headers. Defaults to None.
+            model (type | None): schwabdev.models class of the parsed="model" response. Defaults to None.
+            quoted (tuple[str]): path arguments that are url-quoted (e.g. symbols). Defaults to ().
+            order (bool): places, replaces or cancels orders (uses the order rate limit). Defaults to False.
+        """
+        self.method = method                                        # HTTP method
+        self.path = path                                            # path template
+        self.params = tuple(p if isinstance(p, tuple) else (p, None) for p in params)  # (name, converter)
+        self.headers = headers                                      # request headers
+        self.model = model                                          # parsed="model" class
+        self.order = order                                          # uses the order rate limit
+        self._path_args = re.findall(r"\{(\w+)\}", path)
+        self._format = re.sub(r"\{\w+\}", "{}", path).format
+        self._quoted = tuple(i for i, name in enumerate(self._path_args) if name in quoted)
+        self._query = tuple((f"{name}=", converter) for name, converter in self.params)
+
+    def build(self, *args) -> str:
+        """
+        Build the request path with its query string.
+
+        Args:
+            *args: path arguments then query parameters, in order (as the client method takes them)
+
+        Returns:
+            str: path and query string, e.g. "/marketdata/v1/quotes?symbols=AMD,INTC&indicative=false"
+
+        Example:
+            QUOTES.build(["AMD", "INTC"], None, False)
+            "/marketdata/v1/quotes?symbols=AMD,INTC&indicative=false"
+        """
+        count = len(self._path_args)
+        if count:
+            values = list(args[:count])
+            for i in self._quoted:
+                values[i] = _quote(values[i], safe="")
+            path = self._format(*values)
+        else:
+            path = self.path
+        query = []
+        for (key, converter), value in zip(self._query, args[count:]):
+            if value is None:
+                continue
+            if converter is not None:
+                value = converter(value)
+            if value.__class__ is not str:
+                value = str(value)
+            query.append(key + (value if _plain(value) else _quote(value, safe=",:")))
+        return f"{path}?{'&'.join(query)}" if query else path
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.method} {self.path})"
+
+
+_JSON = {"Accept": "application/json"}
+_JSON_BODY = {"Accept": "application/json", "Content-Type": "application/json"}
+
+# Accounts and Trading Production
+LINKED_ACCOUNTS = Endpoint("GET", "/trader/v1/accounts/accountNumbers")
+ACCOUNT_DETAILS_ALL = Endpoint("GET", "/trader/v1/accounts/", ("fields",), model=models.Account)
+ACCOUNT_DETAILS = Endpoint("GET", "/trader/v1/accounts/{accountHash}", ("fields",), model=models.Account)
+ACCOUNT_ORDERS = Endpoint("GET", "/trader/v1/accounts/{accountHash}/orders",
+                          (("fromEnteredTime", iso_8601), ("toEnteredTime", iso_8601), "maxResults", "status"), _JSON, models.Order)
+PLACE_ORDER = Endpoint("POST", "/trader/v1/accounts/{accountHash}/orders", headers=_JSON_BODY, order=True)
+ORDER_DETAILS = Endpoint("GET", "/trader/v1/accounts/{accountHash}/orders/{orderId}", model=models.Order)
+CANCEL_ORDER = Endpoint("DELETE", "/trader/v1/accounts/{accountHash}/orders/{orderId}", order=True)
+REPLACE_ORDER = Endpoint("PUT", "/trader/v1/accounts/{accountHash}/orders/{orderId}", headers=_JSON_BODY, order=True)
+ACCOUNT_ORDERS_ALL = Endpoint("GET", "/trader/v1/orders", (("fromEnteredTime", iso_8601), ("toEnteredTime", iso_8601), "maxResults", "status"),
+                              _JSON, models.Order)
+PREVIEW_ORDER = Endpoint("POST", "/trader/v1/accounts/{accountHash}/previewOrder", headers={"Content-Type": "application/json"})
+TRANSACTIONS = Endpoint("GET", "/trader/v1/accounts/{accountHash}/transactions",
+                        (("startDate", iso_8601), ("endDate", iso_8601), "types", "symbol"), model=models.Transaction)
+TRANSACTION_DETAILS = Endpoint("GET", "/trader/v1/accounts/{accountHash}/transactions/{transactionId}", model=models.Transaction)
+PREFERENCES = Endpoint("GET", "/trader/v1/userPreference")
+
+# Market Data
+QUOTES = Endpoint("GET", "/marketdata/v1/quotes", (("symbols", csv), "fields", ("indicative", boolean)), model=models.Quote)
+QUOTE = Endpoint("GET", "/marketdata/v1/{symbol_id}/quotes", ("fields",), model=models.Quote, quoted=("symbol_id",))
+OPTION_CHAINS = Endpoint("GET", "/marketdata/v1/chains",
+                         ("symbol", "contractType", "strikeCount", ("includeUnderlyingQuote", boolean), "strategy", "interval", "strike",
+                          "range", ("fromDate", yyyy_mm_dd), ("toDate", yyyy_mm_dd), "volatility", "underlyingPrice", "interestRate",
+                          "daysToExpiration", "expMonth", "optionType", "entitlement"))
+OPTION_EXPIRATION_CHAIN = Endpoint("GET", "/marketdata/v1/expirationchain", ("symbol",))
+PRICE_HISTORY = Endpoint("GET", "/marketdata/v1/pricehistory",
+                         ("symbol", "periodType", "period", "frequencyType", "frequency", ("startDate", epoch_ms), ("endDate", epoch_ms),
+                          ("needExtendedHoursData", boolean), ("needPreviousClose", boolean)), model=models.PriceHistory)
+MOVERS = Endpoint("GET", "/marketdata/v1/movers/{symbol_id}", ("sort", "frequency"), _JSON)
+MARKET_HOURS = Endpoint("GET", "/marketdata/v1/markets", (("markets", csv), ("date", yyyy_mm_dd)))
+MARKET_HOUR = Endpoint("GET", "/marketdata/v1/markets/{market_id}", (("date", yyyy_mm_dd),))
+INSTRUMENTS = Endpoint("GET", "/marketdata/v1/instruments", (("symbol", csv), "projection"))
+INSTRUMENT_CUSIP = Endpoint("GET", "/marketdata/v1/instruments/{cusip_id}")
@@ -0,0 +1,182 @@
+"""
+Schwabdev Hooks Module.
+Tracing and profiling hooks called around every api request.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import re
+import time
+
+# (path pattern, endpoint template), checked in order
+_TEMPLATES = [(re.compile(pattern), template) for pattern, template in (
+    (r"^/trader/v1/accounts/accountNumbers$", "/trader/v1/accounts/accountNumbers"),
+    (r"^/trader/v1/accounts/[^/]+/orders/[^/]+$", "/trader/v1/accounts/{accountHash}/orders/{orderId}"),
+    (r"^/trader/v1/accounts/[^/]+/orders$", "/trader/v1/accounts/{accountHash}/orders"),
+    (r"^/trader/v1/accounts/[^/]+/previewOrder$", "/trader/v1/accounts/{accountHash}/previewOrder"),
+    (r"^/trader/v1/accounts/[^/]+/transactions/[^/]+$", "/trader/v1/accounts/{accountHash}/transactions/{transactionId}"),
+    (r"^/trader/v1/accounts/[^/]+/transactions$", "/trader/v1/accounts/{accountHash}/transactions"),
+    (r"^/trader/v1/accounts/[^/]+$", "/trader/v1/accounts/{accountHash}"),
+    (r"^/marketdata/v1/movers/[^/]+$", "/marketdata/v1/movers/{symbol_id}"),
+    (r"^/marketdata/v1/markets/[^/]+$", "/marketdata/v1/markets/{market_id}"),
+    (r"^/marketdata/v1/instruments/[^/]+$", "/marketdata/v1/instruments/{cusip_id}"),
+    (r"^/marketdata/v1/(?!quotes$|chains$|expirationchain$|pricehistory$|markets$|instruments$)[^/]+/quotes$", "/marketdata/v1/{symbol_id}/quotes"),
+)]
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Endpoint template of a request path, e.g. "/trader/v1/accounts/ABC/orders/123" -> "/trader/v1/accounts/{accountHash}/orders/{orderId}"
+
+    Args:
+        path (str): request path
+
+    Returns:
+        str: endpoint template (the path itself if it has no parameters)
+    """
+    for pattern, template in _TEMPLATES:
+        if pattern.match(path):
+            return template
+    return path
+
+
+class RequestInfo:
+    __slots__ = ("method", "path", "endpoint", "url", "start", "start_ns", "token_wait", "limiter_wait", "lock_wait",
+                 "status", "request_bytes", "response_bytes", "timings", "error", "context")
+
+    def __init__(self, method: str, path: str, url: str):
+        """
+        Information about one api request, passed to every hook call for that request.
+        """
+        self.method = method                            # HTTP method
+        self.path = path                                # request path (and query string)
+        self.endpoint = endpoint_template(path.partition("?")[0])  # endpoint template (low cardinality, for grouping)
+        self.url = url                                  # full url
+        self.start = time.perf_counter()                # perf_counter() at the start of the call
+        self.start_ns = time.time_ns()                  # wall clock at the start of the call (ns)
+        self.token_wait = 0.0                           # seconds spent checking/updating tokens
+        self.limiter_wait = 0.0                         # seconds spent waiting on the rate limiter
+        self.lock_wait = 0.0                            # seconds spent waiting on the session lock (or connection pool)
+        self.status = None                              # HTTP status
+        self.request_bytes = None                       # request body size
+        self.response_bytes = None                      # response body size (if known)
+        self.timings = {}                               # seconds: dns, connect (including TLS, except httpx: tls), ttfb, total
+        self.error = None                               # exception (on_error)
+        self.context = {}                               # free for hooks to keep state in
+
+    def __repr__(self) -> str:
+        return (f"RequestInfo({self.method} {self.endpoint}, status={self.status}, "
+                f"timings={ {k: round(v * 1000, 3) for k, v in self.timings.items()} }ms)")
+
+
+class Hook:
+    """
+    Base class for hooks, override any of the methods and register with client.add_hook(hook).
+    Hook methods are called in the thread (or event loop) making the request and should be quick, exceptions are logged and ignored.
+    """
+
+    def before_request(self, info: RequestInfo):
+        """
+        Called before a request is sent (after waiting for tokens and the rate limiter).
+        """
+
+    def after_response(self, info: RequestInfo, response):
+        """
+        Called when the response headers have been received.
+
+        Args:
+            info (RequestInfo): request information (status, bytes and timings are set)
+            response (requests.Response | aiohttp.ClientResponse): the response
+        """
+
+    def on_error(self, info: RequestInfo, error: Exception):
+        """
+        Called when the request failed without a response (e.g. connection error or timeout).
+        """
+
+
+class OpenTelemetryHook(Hook):
+
+    def __init__(self, tracer=None):
+        """
+        Hook that emits an OpenTelemetry client span for every api request.
+
+        Args:
+            tracer (opentelemetry.trace.Tracer | None): tracer to use. Defaults to trace.get_tracer("schwabdev").
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError("opentelemetry-api is required to use OpenTelemetryHook (pip install schwabdev[otel])")
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("schwabdev")
+
+    def before_request(self, info: RequestInfo):
+        info.context["span"] = self._tracer.start_span(
+            f"{info.method} {info.endpoint}", kind=self._trace.SpanKind.CLIENT, start_time=info.start_ns,
+            attributes={"http.request.method": info.method, "url.full": info.url, "url.template": info.endpoint,
+                        "schwabdev.token_wait_ms": info.token_wait * 1000,
+                        "schwabdev.limiter_wait_ms": info.limiter_wait * 1000,
+                        "schwabdev.lock_wait_ms": info.lock_wait * 1000})
+
+    def after_response(self, info: RequestInfo, response):
+        span = info.context.pop("span", None)
+        if span is None:
+            return
+        span.set_attribute("http.response.status_code", info.status)
+        if info.request_bytes is not None:
+            span.set_attribute("http.request.body.size", info.request_bytes)
+        if info.response_bytes is not None:
+            span.set_attribute("http.response.body.size", info.response_bytes)
+        for name, value in info.timings.items():
+            span.set_attribute(f"schwabdev.{name}_ms", value * 1000)
+        if info.status >= 400:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end()
+
+    def on_error(self, info: RequestInfo, error: Exception):
+        span = info.context.pop("span", None)
+        if span is None:
+            return
+        span.record_exception(error)
+        span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(error)))
+        span.end()
+
+
+def trace_config():
+    """
+    Make an aiohttp.TraceConfig that records DNS, connect, connection pool wait and TTFB timings into the RequestInfo
+    passed as trace_request_ctx.
+
+    Returns:
+        aiohttp.TraceConfig: trace config
+    """
+    import aiohttp
+
+    def marker(name: str):
+        async def handler(session, ctx, params):
+            info = ctx.trace_request_ctx
+            if info is not None:
+                info.context[name] = time.perf_counter()
+        return handler
+
+    def duration(name: str, started: str, key: str | None = None):
+        async def handler(session, ctx, params):
+            info = ctx.trace_request_ctx
+            if info is not None and started in info.context:
+                elapsed = time.perf_counter() - info.context.pop(started)
+                if key is None:
+                    info.timings[name] = elapsed
+                else:
+                    setattr(info, key, getattr(info, key) + elapsed)
+        return handler
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(marker("_request_start"))
+    config.on_dns_resolvehost_start.append(marker("_dns_start"))
+    config.on_dns_resolvehost_end.append(duration("dns", "_dns_start"))
+    config.on_connection_queued_start.append(marker("_queued_start"))
+    config.on_connection_queued_end.append(duration("queued", "_queued_start", "lock_wait"))
+    config.on_connection_create_start.append(marker("_connect_start"))
+    config.on_connection_create_end.append(duration("connect", "_connect_start"))
+    config.on_request_end.append(duration("ttfb", "_request_start"))
+    config.freeze()
+    return config
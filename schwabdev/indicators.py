@@ -0,0 +1,377 @@
+"""
+Schwabdev Indicators Module.
+Incremental (O(1) per bar or tick) technical indicators with state kept in NumPy arrays, one slot per symbol.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import abc
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (pip install schwabdev[numpy])
+    np = None
+
+
+def _grow(array, size: int, initial):
+    grown = np.full((size,) + array.shape[1:], initial, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class Indicator(abc.ABC):
+
+    outputs = ("value",)    # names of the values computed
+    _state = {}             # state array name: initial value
+
+    def __init__(self):
+        """
+        Base class of incremental indicators. State arrays hold one slot per symbol (the engine assigns slots).
+        """
+        if np is None:
+            raise ImportError("numpy is required to use schwabdev.indicators (pip install schwabdev[numpy])")
+        for name, initial in self._state.items():
+            setattr(self, name, np.full(0, initial, dtype=np.int64 if isinstance(initial, int) else np.float64))
+
+    def resize(self, size: int):
+        """
+        Grow the state arrays to size slots.
+
+        Args:
+            size (int): number of slots
+        """
+        for name, initial in self._state.items():
+            setattr(self, name, _grow(getattr(self, name), size, initial))
+
+    def reset(self, index):
+        """
+        Clear the state of some slots (e.g. after a gap in the data).
+
+        Args:
+            index (numpy.ndarray | slice): slots
+        """
+        for name, initial in self._state.items():
+            getattr(self, name)[index] = initial
+
+    @abc.abstractmethod
+    def update(self, index, time, high, low, close, volume):
+        """
+        Add one bar (or tick) to each slot in index, every argument is an array aligned with index.
+
+        Args:
+            index (numpy.ndarray): slots (each at most once)
+            time (numpy.ndarray): bar times (epoch ms, NaN if unknown)
+            high (numpy.ndarray): highs
+            low (numpy.ndarray): lows
+            close (numpy.ndarray): closes (or trade prices)
+            volume (numpy.ndarray): volumes
+        """
+
+    @abc.abstractmethod
+    def values(self, index) -> dict:
+        """
+        Current values of some slots, NaN while warming up.
+
+        Args:
+            index (numpy.ndarray | slice): slots
+
+        Returns:
+            dict[str, numpy.ndarray]: output name -> values
+        """
+
+
+class EMA(Indicator):
+
+    _state = {"ema": float("nan"), "count": 0}
+
+    def __init__(self, period: int):
+        """
+        Exponential moving average of closes, seeded with the simple average of the first period closes.
+
+        Args:
+            period (int): number of bars
+        """
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        super().__init__()
+
+    def update(self, index, time, high, low, close, volume):
+        ema, count = self.ema[index], self.count[index]
+        warm = count < self.period
+        self.ema[index] = np.where(warm, np.nan_to_num(ema) + (close - np.nan_to_num(ema)) / (count + 1), ema + self.alpha * (close - ema))
+        self.count[index] = count + 1
+
+    def values(self, index) -> dict:
+        return {"value": np.where(self.count[index] >= self.period, self.ema[index], np.nan)}
+
+
+class RSI(Indicator):
+
+    _state = {"previous": float("nan"), "gain": 0.0, "loss": 0.0, "count": 0}
+
+    def __init__(self, period: int = 14):
+        """
+        Relative strength index of closes with Wilder's smoothing.
+
+        Args:
+            period (int): number of changes. Defaults to 14.
+        """
+        self.period = period
+        super().__init__()
+
+    def update(self, index, time, high, low, close, volume):
+        change = np.nan_to_num(close - self.previous[index])  # 0 for the first close
+        first = np.isnan(self.previous[index])
+        gain, loss, count = self.gain[index], self.loss[index], self.count[index]
+        warm = count < self.period
+        p = self.period
+        self.gain[index] = np.where(first, gain, np.where(warm, gain + np.maximum(change, 0) / p, (gain * (p - 1) + np.maximum(change, 0)) / p))
+        self.loss[index] = np.where(first, loss, np.where(warm, loss + np.maximum(-change, 0) / p, (loss * (p - 1) + np.maximum(-change, 0)) / p))
+        self.count[index] = count + ~first
+        self.previous[index] = close
+
+    def values(self, index) -> dict:
+        gain, loss = self.gain[index], self.loss[index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(loss > 0, 100.0 - 100.0 / (1.0 + gain / loss), np.where(gain > 0, 100.0, 50.0))
+        return {"value": np.where(self.count[index] >= self.period, rsi, np.nan)}
+
+
+class ATR(Indicator):
+
+    _state = {"previous": float("nan"), "atr": 0.0, "count": 0}
+
+    def __init__(self, period: int = 14):
+        """
+        Average true range with Wilder's smoothing.
+
+        Args:
+            period (int): number of bars. Defaults to 14.
+        """
+        self.period = period
+        super().__init__()
+
+    def update(self, index, time, high, low, close, volume):
+        previous = self.previous[index]
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))  # high - low for the first bar
+        atr, count = self.atr[index], self.count[index]
+        p = self.period
+        self.atr[index] = np.where(count < p, atr + true_range / p, (atr * (p - 1) + true_range) / p)
+        self.count[index] = count + 1
+        self.previous[index] = close
+
+    def values(self, index) -> dict:
+        return {"value": np.where(self.count[index] >= self.period, self.atr[index], np.nan)}
+
+
+class Bollinger(Indicator):
+
+    outputs = ("middle", "upper", "lower")
+    _state = {"total": 0.0, "squares": 0.0, "count": 0}
+
+    def __init__(self, period: int = 20, deviations: float = 2.0):
+        """
+        Bollinger bands: simple moving average of closes plus/minus a multiple of their (population) standard deviation.
+        Running sums over a per-symbol window make each update O(1).
+
+        Args:
+            period (int): number of bars. Defaults to 20.
+            deviations (float): band width in standard deviations. Defaults to 2.0.
+        """
+        self.period = period
+        self.deviations = deviations
+        super().__init__()
+        self.window = np.zeros((0, period))     # last period closes per slot (ring)
+
+    def resize(self, size: int):
+        super().resize(size)
+        self.window = _grow(self.window, size, 0.0)
+
+    def reset(self, index):
+        super().reset(index)
+        self.window[index] = 0.0
+
+    def update(self, index, time, high, low, close, volume):
+        position = self.count[index] % self.period
+        oldest = self.window[index, position]   # 0 until the window is full
+        self.total[index] += close - oldest
+        self.squares[index] += close * close - oldest * oldest
+        self.window[index, position] = close
+        self.count[index] += 1
+
+    def values(self, index) -> dict:
+        middle = self.total[index] / self.period
+        deviation = np.sqrt(np.maximum(self.squares[index] / self.period - middle * middle, 0.0)) * self.deviations
+        ready = self.count[index] >= self.period
+        return {"middle": np.where(ready, middle, np.nan), "upper": np.where(ready, middle + deviation, np.nan),
+                "lower": np.where(ready, middle - deviation, np.nan)}
+
+
+class VWAP(Indicator):
+
+    _state = {"price_volume": 0.0, "volume": 0.0, "session": float("nan")}
+
+    def __init__(self, session: int = 86400000, offset: int = 0):
+        """
+        Volume weighted average price of typical prices ((high + low + close) / 3), restarted every session.
+
+        Args:
+            session (int): session length in milliseconds. Defaults to one day.
+            offset (int): added to times before splitting them into sessions (epoch ms), e.g. to start sessions at a
+                time other than 00:00 UTC. Defaults to 0.
+        """
+        self.session_length = session
+        self.offset = offset
+        super().__init__()
+
+    def update(self, index, time, high, low, close, volume):
+        session = (time + self.offset) // self.session_length
+        new = session != self.session[index]
+        new &= ~np.isnan(session)  # unknown time: keep the session
+        price_volume = (high + low + close) / 3.0 * volume
+        self.price_volume[index] = np.where(new, price_volume, self.price_volume[index] + price_volume)
+        self.volume[index] = np.where(new, volume, self.volume[index] + volume)
+        self.session[index] = np.where(new, session, self.session[index])
+
+    def values(self, index) -> dict:
+        volume = self.volume[index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {"value": np.where(volume > 0, self.price_volume[index] / volume, np.nan)}
+
+
+class IndicatorEngine:
+
+    def __init__(self, indicators: dict, timeframe: str | None = None, capacity: int = 64):
+        """
+        Keep indicators for many symbols, updated for a whole universe with one vectorized call (or per bar from
+        BarAggregator(on_bar=engine.on_bar)).
+
+        Args:
+            indicators (dict): name -> Indicator, e.g. {"ema20": EMA(20), "rsi": RSI(14), "bb": Bollinger(20, 2)}
+            timeframe (str | None): only bars of this timeframe are used by on_bar, None for all. Defaults to None.
+            capacity (int): initial number of symbol slots (grows as needed). Defaults to 64.
+        """
+        if np is None:
+            raise ImportError("numpy is required to use schwabdev.indicators (pip install schwabdev[numpy])")
+        self.indicators = dict(indicators)                          # name -> Indicator
+        self.timeframe = timeframe                                  # timeframe used by on_bar
+        self.lock = threading.RLock()                               # held while updating or reading
+        self.symbols = []                                           # symbol of each slot
+        self._slots = {}                                            # symbol -> slot
+        self._capacity = 0                                          # allocated slots
+        self._resize(capacity)
+
+    def _resize(self, size: int):
+        for indicator in self.indicators.values():
+            indicator.resize(size)
+        self._capacity = size
+
+    def indices(self, symbols: list[str]):
+        """
+        Slots of symbols (new symbols get slots), reuse the result to skip the lookup on every update.
+
+        Args:
+            symbols (list[str]): symbols
+
+        Returns:
+            numpy.ndarray: slots
+        """
+        with self.lock:
+            slots = self._slots
+            for symbol in symbols:
+                if symbol not in slots:
+                    slots[symbol] = len(self.symbols)
+                    self.symbols.append(symbol)
+            if len(self.symbols) > self._capacity:
+                self._resize(max(len(self.symbols), 2 * self._capacity))
+            return np.fromiter((slots[symbol] for symbol in symbols), dtype=np.int64, count=len(symbols))
+
+    def update(self, symbols, close, high=None, low=None, volume=None, time=None):
+        """
+        Add one bar (or trade) for each symbol, O(1) per symbol and indicator.
+
+        Args:
+            symbols (list[str] | numpy.ndarray): symbols, or slots from indices() (each symbol at most once per call)
+            close (array-like): closes (or trade prices)
+            high (array-like | None): highs, None to use close. Defaults to None.
+            low (array-like | None): lows, None to use close. Defaults to None.
+            volume (array-like | None): volumes, None for 0. Defaults to None.
+            time (array-like | None): bar times (epoch ms), None if unknown. Defaults to None.
+        """
+        index = symbols if isinstance(symbols, np.ndarray) else self.indices(symbols)
+        close = np.asarray(close, dtype=np.float64)
+        high = close if high is None else np.asarray(high, dtype=np.float64)
+        low = close if low is None else np.asarray(low, dtype=np.float64)
+        volume = np.zeros(len(index)) if volume is None else np.asarray(volume, dtype=np.float64)
+        time = np.full(len(index), np.nan) if time is None else np.asarray(time, dtype=np.float64)
+        with self.lock:
+            for indicator in self.indicators.values():
+                indicator.update(index, time, high, low, close, volume)
+
+    def on_bar(self, symbol: str, timeframe: str, bar: dict):
+        """
+        BarAggregator on_bar callback that adds completed bars.
+
+        Args:
+            symbol (str): symbol
+            timeframe (str): timeframe of the bar
+            bar (dict): time, open, high, low, close, volume
+        """
+        if self.timeframe is None or timeframe == self.timeframe:
+            self.update([symbol], [bar["close"]], [bar["high"]], [bar["low"]], [bar["volume"]], [bar["time"]])
+
+    def seed(self, symbol: str, bars: dict):
+        """
+        Warm up a symbol's indicators from history, e.g. BarAggregator.bars(symbol, timeframe).
+
+        Args:
+            symbol (str): symbol
+            bars (dict): time, high, low, close and volume arrays, oldest first
+        """
+        index = self.indices([symbol])
+        with self.lock:
+            for i in range(len(bars["close"])):
+                self.update(index, bars["close"][i:i + 1], bars["high"][i:i + 1], bars["low"][i:i + 1],
+                            bars["volume"][i:i + 1], bars["time"][i:i + 1])
+
+    def reset(self, symbols: list[str]):
+        """
+        Clear the indicators of some symbols (they warm up again).
+
+        Args:
+            symbols (list[str]): symbols
+        """
+        index = self.indices(symbols)
+        with self.lock:
+            for indicator in self.indicators.values():
+                indicator.reset(index)
+
+    def values(self, name: str) -> dict:
+        """
+        Values of one indicator for every symbol, aligned with engine.symbols.
+
+        Args:
+            name (str): indicator name
+
+        Returns:
+            dict[str, numpy.ndarray]: output name (e.g. "value", or "middle"/"upper"/"lower") -> values
+        """
+        with self.lock:
+            return self.indicators[name].values(slice(0, len(self.symbols)))
+
+    def value(self, symbol: str, name: str) -> float | dict | None:
+        """
+        Current value of one indicator for one symbol.
+
+        Args:
+            symbol (str): symbol
+            name (str): indicator name
+
+        Returns:
+            float | dict | None: value (NaN while warming up), a dict for indicators with several outputs, None for an unknown symbol
+        """
+        with self.lock:
+            slot = self._slots.get(symbol)
+            if slot is None:
+                return None
+            values = {output: float(value[0]) for output, value in self.indicators[name].values(np.array([slot])).items()}
+            return values["value"] if list(values) == ["value"] else values
@@ -0,0 +1,303 @@
+"""
+Schwabdev JSON Stream Module.
+Incrementally parses large api responses, yielding items (contracts, positions, transactions) as they arrive.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import codecs
+import json
+import re
+
+# common item paths ("*" matches any key or array index)
+CHAIN_CONTRACTS = ("callExpDateMap.*.*.*", "putExpDateMap.*.*.*")     # option_chains()
+ACCOUNT_POSITIONS = ("*.securitiesAccount.positions.*",)               # account_details_all(fields="positions")
+POSITIONS = ("securitiesAccount.positions.*",)                         # account_details(fields="positions")
+LIST_ITEMS = ("*",)                                                    # transactions(), account_orders(), account_orders_all()
+
+_WHITESPACE = re.compile(r"\s*")
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+_STRING_END = re.compile(r'["\\]')
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_SCALAR_END = re.compile(r"[,\]}\s]")
+_DECODER = json.JSONDecoder()
+_SCAN_AFTER = 1 << 20   # items larger than this (bytes buffered) are scanned for their end before decoding
+
+
+class ItemParser:
+
+    def __init__(self, *paths: str | tuple):
+        """
+        Initialize an incremental (push) parser that yields the values found at the given paths.
+        Only the item currently being parsed is kept in memory so memory use does not grow with the response size.
+
+        Args:
+            *paths (str | tuple): dotted paths to the items (e.g. "callExpDateMap.*.*.*"), "*" matches any key or array index.
+        """
+        if not paths:
+            raise ValueError("[Schwabdev] At least one item path is required.")
+        self._patterns = [tuple(p.split(".")) if isinstance(p, str) and p else tuple(p) if p else () for p in paths]
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""          # unparsed text
+        self._pos = 0           # parse position in the buffer
+        self._stack = []        # open containers: [is_object, key or index, expecting]
+        self._scan = None       # value being captured or skipped: [start, position, depth, in_string, escape, scalar, capture, scanning]
+        self._done = False      # whether the top level value has ended
+
+    def _match(self, path: tuple) -> str | None:
+        """
+        Returns:
+            str | None: "item" if the path is an item, "prefix" if items are inside it, None otherwise
+        """
+        result = None
+        for pattern in self._patterns:
+            if len(path) > len(pattern):
+                continue
+            if all(p == "*" or p == str(k) for p, k in zip(pattern, path)):
+                if len(path) == len(pattern):
+                    return "item"
+                result = "prefix"
+        return result
+
+    def _value_done(self):
+        if self._stack:
+            self._stack[-1][2] = "comma"
+        else:
+            self._done = True
+
+    def _continue_scan(self, final: bool) -> int:
+        """
+        Continue scanning the current value.
+
+        Returns:
+            int: end position of the value, -1 if more data is needed
+        """
+        buf = self._buf
+        scan = self._scan
+        p, depth, in_string, escape, scalar = scan[1], scan[2], scan[3], scan[4], scan[5]
+        while True:
+            if escape:
+                if p >= len(buf):
+                    break
+                p += 1
+                escape = False
+            if in_string:
+                m = _STRING_END.search(buf, p)
+                if m is None:
+                    p = len(buf)
+                    break
+                p = m.end()
+                if m.group() == "\\":
+                    escape = True
+                    continue
+                in_string = False
+                if depth == 0:
+                    return p
+            elif scalar:
+                m = _SCALAR_END.search(buf, p)
+                if m is not None:
+                    return m.start()
+                p = len(buf)
+                if final:
+                    return p
+                break
+            else:
+                m = _STRUCTURE.search(buf, p)
+                if m is None:
+                    p = len(buf)
+                    break
+                p = m.end()
+                c = m.group()
+                if c == '"':
+                    in_string = True
+                elif c in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return p
+        scan[1], scan[2], scan[3], scan[4] = p, depth, in_string, escape
+        return -1
+
+    def _parse(self, final: bool) -> list:
+        items = []
+        buf = self._buf
+        pos = self._pos
+        while True:
+            if self._scan is not None:
+                start, scalar, capture = self._scan[0], self._scan[5], self._scan[6]
+                if capture and not self._scan[7]:  # try to decode the item directly (fast path)
+                    try:
+                        value, end = _DECODER.raw_decode(buf, start)
+                    except json.JSONDecodeError:
+                        end = -1
+                        if final:
+                            raise ValueError(f"[Schwabdev] Invalid or incomplete JSON at position {start}.")
+                        if len(buf) - start > _SCAN_AFTER:
+                            self._scan[7] = True
+                            continue
+                    if end < 0 or (scalar and not final and not _SCALAR_END.match(buf, end)):  # a number could continue in the next chunk
+                        pos = len(buf)
+                        break
+                else:
+                    end = self._continue_scan(final)
+                    if end < 0:
+                        pos = len(buf)
+                        break
+                    if capture:
+                        value = json.loads(buf[start:end])
+                if capture:
+                    items.append((tuple(frame[1] for frame in self._stack), value))
+                self._scan = None
+                pos = end
+                self._value_done()
+                continue
+
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            ch = buf[pos]
+            if self._done:
+                raise ValueError(f"[Schwabdev] Unexpected data after JSON value at position {pos}.")
+
+            if self._stack:
+                frame = self._stack[-1]
+                expecting = frame[2]
+                if expecting == "key":
+                    if ch == "}":
+                        self._stack.pop()
+                        pos += 1
+                        self._value_done()
+                        continue
+                    m = _STRING.match(buf, pos)
+                    if m is None:
+                        break  # key not complete yet
+                    frame[1] = json.loads(m.group())
+                    frame[2] = "colon"
+                    pos = m.end()
+                    continue
+                elif expecting == "colon":
+                    if ch != ":":
+                        raise ValueError(f"[Schwabdev] Expected ':' at position {pos}.")
+                    frame[2] = "value"
+                    pos += 1
+                    continue
+                elif expecting == "comma":
+                    if ch == ",":
+                        if frame[0]:
+                            frame[2] = "key"
+                        else:
+                            frame[1] += 1
+                            frame[2] = "value"
+                    elif ch in "}]":
+                        self._stack.pop()
+                        self._value_done()
+                    else:
+                        raise ValueError(f"[Schwabdev] Expected ',' at position {pos}.")
+                    pos += 1
+                    continue
+                elif ch == "]" and not frame[0] and frame[1] == 0:  # empty array
+                    self._stack.pop()
+                    pos += 1
+                    self._value_done()
+                    continue
+
+            # start of a value
+            match = self._match(tuple(frame[1] for frame in self._stack))
+            if match == "prefix" and ch in "{[":
+                self._stack.append([True, None, "key"] if ch == "{" else [False, 0, "value"])
+                pos += 1
+            else:
+                is_string = ch == '"'
+                is_container = ch in "{["
+                self._scan = [pos, pos + 1 if (is_string or is_container) else pos, 1 if is_container else 0,
+                              is_string, False, not (is_string or is_container), match == "item", False]
+        self._pos = pos
+        return items
+
+    def _trim(self):
+        """
+        Drop text that is no longer needed.
+        """
+        keep = self._pos
+        if self._scan is not None:
+            keep = self._scan[0] if self._scan[6] else self._scan[1]
+            self._scan[0] -= keep
+            self._scan[1] -= keep
+        if keep:
+            self._buf = self._buf[keep:]
+            self._pos -= keep
+
+    def feed(self, data: bytes | str) -> list[tuple[tuple, object]]:
+        """
+        Feed the next chunk of the response body.
+
+        Args:
+            data (bytes | str): next chunk
+
+        Returns:
+            list[tuple[tuple, object]]: (path, value) for each item completed by this chunk
+        """
+        self._buf += self._decoder.decode(data) if isinstance(data, (bytes, bytearray)) else data
+        items = self._parse(final=False)
+        self._trim()
+        return items
+
+    def close(self) -> list[tuple[tuple, object]]:
+        """
+        Finish parsing (end of the response body).
+
+        Returns:
+            list[tuple[tuple, object]]: (path, value) for each remaining item
+        """
+        self._buf += self._decoder.decode(b"", final=True)
+        items = self._parse(final=True)
+        if not self._done or self._scan is not None:
+            raise ValueError("[Schwabdev] Incomplete JSON response.")
+        return items
+
+
+def iter_items(response, *paths: str | tuple, chunk_size: int = 65536, with_path: bool = False):
+    """
+    Iterate over items in a requests.Response made with stream=True as the body arrives.
+
+    Args:
+        response (requests.Response): response from a client call made with stream=True
+        *paths (str | tuple): item paths (e.g. jsonstream.CHAIN_CONTRACTS), "*" matches any key or array index.
+        chunk_size (int): bytes to read at a time. Defaults to 65536.
+        with_path (bool): yield (path, item) instead of item. Defaults to False.
+
+    Yields:
+        object | tuple[tuple, object]: items (or (path, item))
+    """
+    parser = ItemParser(*paths)
+    with response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size):
+            for path, item in parser.feed(chunk):
+                yield (path, item) if with_path else item
+        for path, item in parser.close():
+            yield (path, item) if with_path else item
+
+
+async def aiter_items(response, *paths: str | tuple, chunk_size: int = 65536, with_path: bool = False):
+    """
+    Iterate over items in an aiohttp.ClientResponse (from ClientAsync with parsed=False) as the body arrives.
+
+    Args:
+        response (aiohttp.ClientResponse): unparsed response from ClientAsync
+        *paths (str | tuple): item paths (e.g. jsonstream.CHAIN_CONTRACTS), "*" matches any key or array index.
+        chunk_size (int): bytes to read at a time. Defaults to 65536.
+        with_path (bool): yield (path, item) instead of item. Defaults to False.
+
+    Yields:
+        object | tuple[tuple, object]: items (or (path, item))
+    """
+    parser = ItemParser(*paths)
+    try:
+        response.raise_for_status()
+        async for chunk in response.content.iter_chunked(chunk_size):
+            for path, item in parser.feed(chunk):
+                yield (path, item) if with_path else item
+        for path, item in parser.close():
+            yield (path, item) if with_path else item
+    finally:
+        response.release()
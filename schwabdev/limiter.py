@@ -0,0 +1,83 @@
+"""
+Schwabdev Rate Limiter Module.
+Keeps api calls within Schwab's request limits.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import threading
+import time
+
+from ._lazy import lazy_import
+
+asyncio = lazy_import("asyncio")  # only needed by acquire_async
+
+
+class RateLimiter:
+
+    def __init__(self, calls: int = 120, period: float = 60.0):
+        """
+        Initialize a token bucket rate limiter (shared by threads and coroutines).
+
+        Args:
+            calls (int): number of calls allowed per period, this is also the burst size. Defaults to 120.
+            period (float): length of the period in seconds. Defaults to 60.
+        """
+        if calls <= 0 or period <= 0:
+            raise ValueError("[Schwabdev] Rate limit calls and period must be greater than 0.")
+
+        self.calls = calls                              # calls allowed per period
+        self.period = period                            # period in seconds
+        self._rate = calls / period                     # tokens added per second
+        self._tokens = float(calls)                     # tokens currently in the bucket (negative when callers are queued)
+        self._updated = time.monotonic()                # last time the bucket was refilled
+        self._lock = threading.Lock()                   # lock for bucket operations
+
+    def _reserve(self) -> float:
+        """
+        Take a token from the bucket.
+
+        Returns:
+            float: seconds the caller must wait before using the token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.calls, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    @property
+    def available(self) -> float:
+        """
+        Number of calls that can be made right now without waiting.
+
+        Returns:
+            float: available tokens
+        """
+        with self._lock:
+            return max(0.0, min(self.calls, self._tokens + (time.monotonic() - self._updated) * self._rate))
+
+    def acquire(self) -> float:
+        """
+        Block until a call is allowed.
+
+        Returns:
+            float: seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Wait (without blocking the event loop) until a call is allowed.
+
+        Returns:
+            float: seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
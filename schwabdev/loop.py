@@ -0,0 +1,164 @@
+"""
+Schwabdev Loop Module.
+One background thread running one asyncio loop that hosts many streams (instead of a thread and loop per Stream and
+per start_auto restart) and optionally a ClientAsync, whose calls can be made from any thread.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import asyncio
+import threading
+
+from .stream import Stream
+
+
+class SharedLoop:
+
+    def __init__(self, client=None, name: str = "schwabdev-loop"):
+        """
+        Shared background event loop, started on first use (or with start()).
+
+        Args:
+            client (ClientAsync | callable | None): async client to host in the loop (entered on start and closed on stop),
+                or a function making it in the loop (e.g. lambda: ClientAsync(app_key, app_secret), a ClientAsync can only
+                be made in a running loop). Its calls are made from other threads with loop.call(...). Defaults to None.
+            name (str): name of the loop thread. Defaults to "schwabdev-loop".
+        """
+        self.client = client                                        # hosted ClientAsync
+        self.name = name                                            # thread name
+        self.streams = []                                           # streams made with stream()
+        self._loop = None                                           # the asyncio loop
+        self._thread = None                                         # the thread running the loop
+        self._ready = threading.Event()                             # set once the loop runs
+        self._lock = threading.Lock()                               # held while starting or stopping
+        self._client_task = None                                    # task holding the client open
+        self._closing = None                                        # asyncio.Event set to close the client
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        The running loop (started if needed).
+        """
+        self.start()
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Start the loop thread (and enter the client) if it is not running.
+        """
+        with self._lock:
+            if self.running:
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            self._ready.wait()
+        if self.client is not None:
+            self.call(self._enter_client())
+
+    def _run(self):
+        loop = self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.call_soon(self._ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    async def _enter_client(self):
+        entered = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        if callable(self.client):
+            self.client = self.client()
+
+        async def hold():  # enter and exit the client in one task
+            async with self.client:
+                entered.set_result(None)
+                await self._closing.wait()
+
+        self._client_task = asyncio.create_task(hold())
+        await asyncio.wait((entered, self._client_task), return_when=asyncio.FIRST_COMPLETED)
+        if not entered.done():
+            self._client_task.result()  # raises why the client could not be entered
+
+    async def _exit_client(self):
+        self._closing.set()
+        await self._client_task
+        self._client_task = None
+
+    def submit(self, coro):
+        """
+        Run a coroutine in the loop from another thread without waiting for it.
+
+        Args:
+            coro (coroutine): coroutine, e.g. client.quotes(["AMD"])
+
+        Returns:
+            concurrent.futures.Future: future of the result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, coro, timeout: float | None = None):
+        """
+        Run a coroutine in the loop from another thread and wait for its result.
+
+        Args:
+            coro (coroutine): coroutine, e.g. client.quotes(["AMD"], parsed=True)
+            timeout (float | None): seconds to wait, None to wait until done. Defaults to None.
+
+        Returns:
+            the result of the coroutine
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("[Schwabdev] SharedLoop.call() would block its own loop, await the coroutine instead.")
+        return self.submit(coro).result(timeout)
+
+    def stream(self, client, streamer_url: str | None = None, resync: bool = False) -> Stream:
+        """
+        Make a Stream that runs in this loop, used like any Stream (start, send, stop) from any thread.
+        Receivers of every hosted stream run in the loop thread, so they should return quickly.
+
+        Args:
+            client (Client): client needed to get streamer info
+            streamer_url (str | None): websocket url override. Defaults to None.
+            resync (bool): send reset, snapshot and gap events to the receiver. Defaults to False.
+
+        Returns:
+            Stream: stream
+        """
+        stream = Stream(client, streamer_url, resync, loop=self)
+        self.streams.append(stream)
+        return stream
+
+    def stop(self):
+        """
+        Stop the hosted streams (keeping their subscriptions), close the client and stop the loop thread.
+        """
+        for stream in self.streams:
+            stream.stop(clear_subscriptions=False)
+        with self._lock:
+            if not self.running:
+                return
+            if self._client_task is not None:
+                try:
+                    asyncio.run_coroutine_threadsafe(self._exit_client(), self._loop).result(10)
+                except Exception as e:
+                    self.client.logger.error(f"Error closing the client: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
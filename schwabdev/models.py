@@ -0,0 +1,304 @@
+"""
+Schwabdev Models Module.
+Typed response models (quotes, positions, orders, transactions and candles): msgspec.Struct types decoded straight from
+the response bytes if msgspec is installed, otherwise light views over the parsed dictionaries.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import json
+from typing import Any
+
+try:
+    import msgspec
+except ImportError:  # msgspec is an optional dependency (pip install schwabdev[msgspec])
+    msgspec = None
+
+_TEXT = (bytes, bytearray, memoryview, str)
+_decoders = {}      # model -> msgspec.json.Decoder of its response body
+
+
+if msgspec is not None:
+
+    class Model(msgspec.Struct, gc=False):  # decoded JSON never holds reference cycles, so the gc does not track models
+        _by_key = False     # response is {key: object} (e.g. quotes by symbol)
+        _wrapper = None     # key wrapping each object in the response (e.g. "securitiesAccount")
+
+        @classmethod
+        def _body_type(cls):
+            if cls._by_key:
+                return dict[str, cls]
+            if cls._wrapper is not None:
+                wrapped = msgspec.defstruct(f"_{cls.__name__}Response", [(cls._wrapper, cls)], gc=False)
+                return list[wrapped] | wrapped
+            return list[cls] | cls
+
+        @classmethod
+        def _unwrap(cls, value):
+            if cls._wrapper is None:
+                return value
+            if isinstance(value, list):
+                return [getattr(item, cls._wrapper) for item in value]
+            return getattr(value, cls._wrapper)
+
+        @classmethod
+        def from_dict(cls, data: dict, lazy: bool = True):
+            """
+            Make a model from a parsed response object.
+
+            Args:
+                data (dict): parsed response object
+                lazy (bool): unused, kept for compatibility. Defaults to True.
+
+            Returns:
+                Model: model instance
+            """
+            if cls._wrapper is not None:
+                data = data.get(cls._wrapper, data)
+            return msgspec.convert(data, cls)
+
+        @classmethod
+        def decode(cls, data, lazy: bool = True):
+            """
+            Decode a response body (or parsed body) into models.
+
+            Args:
+                data (bytes | str | dict | list): response body
+                lazy (bool): unused, kept for compatibility. Defaults to True.
+
+            Returns:
+                Model | list[Model] | dict[str, Model]: model(s)
+            """
+            if isinstance(data, _TEXT):
+                decoder = _decoders.get(cls)
+                if decoder is None:
+                    decoder = _decoders[cls] = msgspec.json.Decoder(cls._body_type())
+                return cls._unwrap(decoder.decode(data))
+            if cls._wrapper is not None:
+                return [cls.from_dict(item) for item in data] if isinstance(data, list) else cls.from_dict(data)
+            return msgspec.convert(data, cls._body_type())
+
+        def to_dict(self) -> dict:
+            """
+            Convert the model back to a dictionary (with the response's keys).
+
+            Returns:
+                dict: model as a dictionary
+            """
+            return msgspec.to_builtins(self)
+
+        def __repr__(self) -> str:
+            shown = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr in self.__struct_fields__ if getattr(self, attr) is not None)
+            return f"{type(self).__name__}({shown})"
+
+else:
+
+    class _Field:
+
+        def __init__(self, key: str):
+            """
+            Descriptor for a value read from the parsed object.
+
+            Args:
+                key (str): key in the response
+            """
+            self.key = key
+
+        def __get__(self, obj, owner=None):
+            if obj is None:
+                return self
+            return obj._data.get(self.key)
+
+        def __set__(self, obj, value):
+            obj._data[self.key] = value
+
+    class _Nested:
+
+        def __init__(self, name: str, key: str, model, many: bool = False):
+            """
+            Descriptor for a nested object that is wrapped into a model when first accessed.
+
+            Args:
+                name (str): attribute name
+                key (str): key in the response
+                model (type | str): model class of the nested object(s), or its name in this module
+                many (bool): whether the nested value is a list of objects. Defaults to False.
+            """
+            self.name = name
+            self.key = key
+            self.model = model
+            self.many = many
+
+        def __get__(self, obj, owner=None):
+            if obj is None:
+                return self
+            try:
+                cache = obj._cache
+            except AttributeError:
+                cache = obj._cache = {}
+            if self.name in cache:
+                return cache[self.name]
+            if isinstance(self.model, str):
+                self.model = globals()[self.model]
+            value = obj._data.get(self.key)
+            if self.many and value:
+                value = [self.model.from_dict(v) if type(v) is dict else v for v in value]
+            elif type(value) is dict:
+                value = self.model.from_dict(value)
+            cache[self.name] = value
+            return value
+
+        def __set__(self, obj, value):
+            try:
+                obj._cache[self.name] = value
+            except AttributeError:
+                obj._cache = {self.name: value}
+
+    class Model:
+        __slots__ = ("_data", "_cache")
+        _fields = {}        # attribute: key in the response (scalars and plain dicts)
+        _nested = ()        # nested attributes (see _Nested)
+        _by_key = False     # response is {key: object} (e.g. quotes by symbol)
+        _wrapper = None     # key wrapping each object in the response (e.g. "securitiesAccount")
+        __hash__ = None     # compared by value (like the msgspec models), so not hashable
+
+        @classmethod
+        def from_dict(cls, data: dict, lazy: bool = True):
+            """
+            Make a model viewing a parsed response object (not copied, setting attributes changes it).
+
+            Args:
+                data (dict): parsed response object
+                lazy (bool): unused, kept for compatibility. Defaults to True.
+
+            Returns:
+                Model: model instance
+            """
+            obj = cls.__new__(cls)
+            obj._data = data.get(cls._wrapper, data) if cls._wrapper is not None else data
+            return obj
+
+        @classmethod
+        def decode(cls, data, lazy: bool = True):
+            """
+            Decode a response body (or parsed body) into models.
+
+            Args:
+                data (bytes | str | dict | list): response body
+                lazy (bool): unused, kept for compatibility. Defaults to True.
+
+            Returns:
+                Model | list[Model] | dict[str, Model]: model(s)
+            """
+            if isinstance(data, _TEXT):
+                data = json.loads(data)
+            from_dict = cls.from_dict
+            if cls._by_key:
+                return {key: from_dict(value) if isinstance(value, dict) else value for key, value in data.items()}
+            if isinstance(data, list):
+                return [from_dict(item) for item in data]
+            return from_dict(data)
+
+        def to_dict(self) -> dict:
+            """
+            Convert the model back to a dictionary (with the response's keys).
+
+            Returns:
+                dict: model as a dictionary
+            """
+            get = self._data.get
+            data = {key: get(key) for key in self._fields.values()}
+            for attr in self._nested:
+                nested = getattr(type(self), attr)
+                value = getattr(self, attr)
+                if nested.many:
+                    value = [v.to_dict() if isinstance(v, Model) else v for v in value] if value is not None else None
+                elif isinstance(value, Model):
+                    value = value.to_dict()
+                data[nested.key] = value
+            return data
+
+        def __repr__(self) -> str:
+            shown = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr in self._fields if getattr(self, attr) is not None)
+            return f"{type(self).__name__}({shown})"
+
+        def __eq__(self, other) -> bool:
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+
+def _model(name: str, fields: tuple[str], nested: dict | None = None, rename: dict | None = None, **options) -> type:
+    """
+    Make a model class (a msgspec.Struct if msgspec is installed, otherwise a view over parsed dictionaries).
+
+    Args:
+        name (str): class name
+        fields (tuple[str]): attributes of scalars and plain objects (response keys unless renamed)
+        nested (dict | None): attribute -> model, [model] for a list of them (a model may be given by its name). Defaults to None.
+        rename (dict | None): attribute -> response key where they differ. Defaults to None.
+        **options: class attributes, e.g. _by_key=True or _wrapper="securitiesAccount"
+
+    Returns:
+        type: model class
+    """
+    nested, rename = nested or {}, rename or {}
+    if msgspec is not None:
+        def annotation(model):
+            many = isinstance(model, list)
+            model = model[0] if many else model
+            return (list[model] if many else model) | None  # a name (str) is resolved by msgspec in this module
+        return msgspec.defstruct(name, [(attr, Any, None) for attr in fields] +
+                                 [(attr, annotation(model), None) for attr, model in nested.items()],
+                                 bases=(Model,), namespace=options, module=__name__, rename=rename or None, gc=False)
+    namespace = {"__slots__": (), "__module__": __name__, "_fields": {attr: rename.get(attr, attr) for attr in fields},
+                 "_nested": tuple(nested), **options}
+    namespace.update({attr: _Field(key) for attr, key in namespace["_fields"].items()})
+    for attr, model in nested.items():
+        many = isinstance(model, list)
+        namespace[attr] = _Nested(attr, rename.get(attr, attr), model[0] if many else model, many)
+    return type(name, (Model,), namespace)
+
+
+Instrument = _model("Instrument", ("assetType", "cusip", "symbol", "description", "instrumentId", "netChange", "type",
+                                   "putCall", "underlyingSymbol", "closingPrice", "status"))
+
+QuoteData = _model("QuoteData", ("askPrice", "askSize", "bidPrice", "bidSize", "closePrice", "highPrice", "lastPrice", "lastSize",
+                                 "lowPrice", "mark", "markChange", "markPercentChange", "netChange", "netPercentChange", "openPrice",
+                                 "quoteTime", "tradeTime", "totalVolume", "volatility", "securityStatus", "askMICId", "bidMICId",
+                                 "lastMICId", "delta", "gamma", "theta", "vega", "rho", "openInterest", "underlyingPrice",
+                                 "high52Week", "low52Week"),
+                   rename={"high52Week": "52WeekHigh", "low52Week": "52WeekLow"})
+
+Quote = _model("Quote", ("assetMainType", "assetSubType", "symbol", "quoteType", "realtime", "ssid", "reference", "regular",
+                         "fundamental", "extended"),
+               {"quote": QuoteData}, _by_key=True)  # decode() returns dict[str, Quote] (quotes by symbol)
+
+Position = _model("Position", ("shortQuantity", "averagePrice", "currentDayProfitLoss", "currentDayProfitLossPercentage",
+                               "longQuantity", "settledLongQuantity", "settledShortQuantity", "agedQuantity", "marketValue",
+                               "maintenanceRequirement", "averageLongPrice", "averageShortPrice", "taxLotAverageLongPrice",
+                               "taxLotAverageShortPrice", "longOpenProfitLoss", "shortOpenProfitLoss",
+                               "previousSessionLongQuantity", "previousSessionShortQuantity", "currentDayCost"),
+                  {"instrument": Instrument})
+
+Account = _model("Account", ("type", "accountNumber", "roundTrips", "isDayTrader", "isClosingOnlyRestricted", "pfcbFlag",
+                             "initialBalances", "currentBalances", "projectedBalances"),
+                 {"positions": [Position]}, _wrapper="securitiesAccount")
+
+OrderLeg = _model("OrderLeg", ("orderLegType", "legId", "instruction", "positionEffect", "quantity", "quantityType",
+                               "divCapGains", "toSymbol"),
+                  {"instrument": Instrument})
+
+Order = _model("Order", ("session", "duration", "orderType", "cancelTime", "complexOrderStrategyType", "quantity",
+                         "filledQuantity", "remainingQuantity", "requestedDestination", "destinationLinkName", "releaseTime",
+                         "stopPrice", "stopPriceLinkBasis", "stopPriceLinkType", "stopPriceOffset", "stopType",
+                         "priceLinkBasis", "priceLinkType", "price", "taxLotMethod", "activationPrice", "specialInstruction",
+                         "orderStrategyType", "orderId", "cancelable", "editable", "status", "enteredTime", "closeTime", "tag",
+                         "accountNumber", "statusDescription", "orderActivityCollection", "replacingOrderCollection"),
+               {"orderLegCollection": [OrderLeg], "childOrderStrategies": ["Order"]})
+
+TransferItem = _model("TransferItem", ("amount", "cost", "price", "feeType", "positionEffect"), {"instrument": Instrument})
+
+Transaction = _model("Transaction", ("activityId", "time", "user", "description", "accountNumber", "type", "status", "subAccount",
+                                     "tradeDate", "settlementDate", "positionId", "orderId", "netAmount", "activityType"),
+                     {"transferItems": [TransferItem]})
+
+Candle = _model("Candle", ("open", "high", "low", "close", "volume", "datetime"))
+
+PriceHistory = _model("PriceHistory", ("symbol", "empty", "previousClose", "previousCloseDate"), {"candles": [Candle]})
@@ -0,0 +1,725 @@
+"""
+Schwabdev Orders Module.
+Order state kept current from the ACCT_ACTIVITY stream (indexed per account by order ID, status and symbol) and a
+low-latency order entry path with pre-serialized order templates.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import datetime
+import json
+import logging
+import math
+import re
+import threading
+import time
+
+from . import hooks
+from ._lazy import lazy_import
+from .translate import iter_data
+
+asyncio = lazy_import("asyncio")
+requests = lazy_import("requests")
+aiohttp = lazy_import("aiohttp")
+
+# statuses of orders that can still change (the rest are final)
+OPEN_STATUSES = frozenset({"NEW", "AWAITING_PARENT_ORDER", "AWAITING_CONDITION", "AWAITING_STOP_CONDITION",
+                           "AWAITING_MANUAL_REVIEW", "ACCEPTED", "AWAITING_UR_OUT", "PENDING_ACTIVATION", "QUEUED",
+                           "WORKING", "PENDING_CANCEL", "PENDING_REPLACE", "PENDING_RECALL", "AWAITING_RELEASE_TIME",
+                           "PENDING_ACKNOWLEDGEMENT", "UNKNOWN"})
+
+# ACCT_ACTIVITY message type: order status after it (message types that are not listed do not change the status)
+_EVENT_STATUS = {"OrderCreated": "NEW",
+                 "OrderAccepted": "WORKING",
+                 "OrderFillCompleted": "FILLED",
+                 "CancelAccepted": "PENDING_CANCEL",
+                 "OrderUROutCompleted": "CANCELED",
+                 "ChangeCreated": "PENDING_REPLACE",
+                 "ChangeAccepted": "WORKING",
+                 "OrderRejected": "REJECTED",
+                 "OrderExpired": "EXPIRED"}
+
+# Message Data keys read into OrderEvent attributes
+_EVENT_KEYS = ("ExecutionQuantity", "ExecutionPrice", "CumulativeQuantity", "LeavesQuantity", "ExecutionId", "ExecutionID",
+               "Symbol")
+
+
+def _decimal(value) -> float | None:
+    """
+    Decode a Message Data number, e.g. {"lo": "1000000", "signScale": 12} (scale in the upper bits, sign in the lowest) -> 1.0.
+    """
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        sign_scale = int(value.get("signScale", 0))
+        number = (int(value.get("hi", 0)) << 64) + int(value.get("lo", 0))
+        return (-number if sign_scale & 1 else number) / 10 ** (sign_scale >> 1)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _find(data, keys: tuple) -> dict:
+    """
+    First value of each key anywhere in nested Message Data.
+    """
+    found = {}
+    stack = [data]
+    while stack and len(found) < len(keys):
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in keys and key not in found and not isinstance(item, list):
+                    found[key] = item
+                if isinstance(item, (dict, list)):
+                    stack.append(item)
+        elif isinstance(value, list):
+            stack.extend(value)
+    return found
+
+
+class OrderEvent:
+    __slots__ = ("account", "message_type", "order_id", "sequence", "timestamp", "status", "symbol", "execution_id",
+                 "quantity", "price", "filled_quantity", "remaining_quantity", "order", "data")
+
+    def __init__(self, content: dict, timestamp: int | None = None):
+        """
+        One ACCT_ACTIVITY message with its Message Data decoded.
+
+        Args:
+            content (dict): content item of an ACCT_ACTIVITY message
+            timestamp (int | None): message timestamp (epoch ms). Defaults to None.
+        """
+        self.account = str(content.get("1", ""))                    # account number
+        self.message_type = content.get("2")                        # e.g. "OrderAccepted" (see stream docs)
+        self.sequence = content.get("seq")                          # stream sequence number
+        self.timestamp = timestamp                                  # message timestamp (epoch ms)
+        try:
+            data = json.loads(content.get("3") or "{}")
+        except json.JSONDecodeError:
+            data = {}
+        self.data = data                                            # decoded Message Data
+        order_id = data.get("SchwabOrderID")
+        self.order_id = int(order_id) if order_id and str(order_id).isdigit() else None
+        base = data.get("BaseEvent", {})
+        order = base.get("Order") if isinstance(base, dict) else None
+        self.order = order if isinstance(order, dict) and "orderId" in order else None  # full order (REST format) when sent
+        found = _find(base, _EVENT_KEYS)
+        self.status = _EVENT_STATUS.get(self.message_type)          # status after this event, None if unchanged
+        if self.order is not None:
+            self.status = self.order.get("status", self.status)
+        self.symbol = found.get("Symbol")
+        self.execution_id = found.get("ExecutionId", found.get("ExecutionID"))
+        self.quantity = _decimal(found.get("ExecutionQuantity"))    # quantity of this execution
+        self.price = _decimal(found.get("ExecutionPrice"))          # price of this execution
+        self.filled_quantity = _decimal(found.get("CumulativeQuantity"))
+        self.remaining_quantity = _decimal(found.get("LeavesQuantity"))
+        if self.message_type == "ExecutionCreated" and self.remaining_quantity == 0:
+            self.status = self.status or "FILLED"
+
+    def __repr__(self) -> str:
+        return f"OrderEvent({self.message_type}, order_id={self.order_id}, status={self.status})"
+
+
+class TrackedOrder:
+    __slots__ = ("order_id", "account", "status", "symbol", "quantity", "filled_quantity", "remaining_quantity",
+                 "price", "updated", "order", "_executions")
+
+    def __init__(self, order_id: int, account: str):
+        """
+        Local state of one order.
+
+        Args:
+            order_id (int): order ID
+            account (str): account number
+        """
+        self.order_id = order_id                                    # order ID
+        self.account = account                                      # account number
+        self.status = None                                          # latest status, None until known
+        self.symbol = None                                          # symbol (of the first leg)
+        self.quantity = None                                        # ordered quantity
+        self.filled_quantity = 0.0                                  # filled quantity
+        self.remaining_quantity = None                              # quantity still working
+        self.price = None                                           # limit price
+        self.updated = None                                         # timestamp of the latest event (epoch ms)
+        self.order = None                                           # latest full order (REST format), None if only known from events
+        self._executions = set()                                    # execution IDs counted in filled_quantity
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether the order can still change (None status counts as open).
+        """
+        return self.status is None or self.status in OPEN_STATUSES
+
+    def __repr__(self) -> str:
+        return f"TrackedOrder({self.order_id}, {self.symbol}, {self.status}, filled={self.filled_quantity}/{self.quantity})"
+
+
+class OrderManager:
+
+    def __init__(self, client=None, on_event=None, reconcile: bool = True):
+        """
+        Keep every order's state from the ACCT_ACTIVITY stream, pass manager.on_stream as (or call it from) the stream receiver
+        and subscribe with streamer.account_activity("Account Activity", "0,1,2,3").
+
+        Args:
+            client (Client | ClientAsync | None): client used to fetch orders that events do not fully describe. Defaults to None.
+            on_event (function | None): called with (event, order) after each event is applied. Defaults to None.
+            reconcile (bool): fetch unknown orders with order_details() when an event arrives for them. Defaults to True.
+        """
+        self._client = client
+        self.on_event = on_event                                    # event callback
+        self.reconcile = reconcile and client is not None           # fetch unknown orders
+        self.lock = threading.RLock()                               # held while updating or reading
+        self.orders = {}                                            # order ID -> TrackedOrder
+        self._by_account = {}                                       # account number -> set of order IDs
+        self._by_status = {}                                        # status -> set of order IDs
+        self._by_symbol = {}                                        # symbol -> set of order IDs
+        self._unknown = set()                                       # IDs of orders without a status yet
+        self._pending = set()                                       # order IDs being fetched
+        self._tasks = set()                                         # running reconcile tasks (ClientAsync)
+        self._logger = logging.getLogger("Schwabdev.OrderManager")
+
+    def _index(self, index: dict, key, order_id: int, old_key=None):
+        if old_key == key:
+            return
+        if old_key is not None:
+            ids = index.get(old_key)
+            if ids is not None:
+                ids.discard(order_id)
+                if not ids:
+                    del index[old_key]
+        if key is not None:
+            index.setdefault(key, set()).add(order_id)
+
+    def _get_order(self, order_id: int, account: str) -> TrackedOrder:
+        order = self.orders.get(order_id)
+        if order is None:
+            order = self.orders[order_id] = TrackedOrder(order_id, account)
+            self._index(self._by_account, account, order_id)
+            self._unknown.add(order_id)
+        return order
+
+    def _set(self, order: TrackedOrder, status: str | None = None, symbol: str | None = None):
+        if status is not None:
+            self._index(self._by_status, status, order.order_id, order.status)
+            self._unknown.discard(order.order_id)
+            order.status = status
+        if symbol is not None:
+            self._index(self._by_symbol, symbol, order.order_id, order.symbol)
+            order.symbol = symbol
+
+    def _apply_order(self, tracked: TrackedOrder, order: dict):
+        """
+        Update from a full order (REST format).
+        """
+        legs = order.get("orderLegCollection") or [{}]
+        status = order.get("status")
+        if not tracked.is_open and status in OPEN_STATUSES:
+            status = None  # an older snapshot than the final event already applied
+        self._set(tracked, status, legs[0].get("instrument", {}).get("symbol"))
+        tracked.order = order
+        tracked.quantity = order.get("quantity", tracked.quantity)
+        tracked.filled_quantity = order.get("filledQuantity", tracked.filled_quantity)
+        tracked.remaining_quantity = order.get("remainingQuantity", tracked.remaining_quantity)
+        tracked.price = order.get("price", tracked.price)
+
+    def load(self, orders: list[dict]):
+        """
+        Add or refresh orders from REST, e.g. account_orders(...).json() at startup.
+
+        Args:
+            orders (list[dict]): orders (REST format)
+        """
+        with self.lock:
+            for order in orders:
+                self._apply_order(self._get_order(int(order["orderId"]), str(order.get("accountNumber", ""))), order)
+
+    def apply(self, event: OrderEvent) -> TrackedOrder | None:
+        """
+        Apply one event to the order it is about.
+
+        Args:
+            event (OrderEvent): event
+
+        Returns:
+            TrackedOrder | None: updated order, None if the event has no order ID
+        """
+        if event.order_id is None:
+            return None
+        with self.lock:
+            known = event.order_id in self.orders
+            order = self._get_order(event.order_id, event.account)
+            if event.order is not None:
+                self._apply_order(order, event.order)
+            else:
+                self._set(order, event.status if order.is_open else None, event.symbol)  # final statuses do not change
+                if event.filled_quantity is not None:
+                    order.filled_quantity = event.filled_quantity
+                elif event.quantity is not None and event.execution_id not in order._executions:
+                    order.filled_quantity += event.quantity
+                if event.execution_id is not None:
+                    order._executions.add(event.execution_id)
+                if event.remaining_quantity is not None:
+                    order.remaining_quantity = event.remaining_quantity
+            order.updated = event.timestamp
+            if self.reconcile and not known and event.order is None:
+                self._fetch(order)
+        if self.on_event is not None:
+            self.on_event(event, order)
+        return order
+
+    def on_stream(self, message, **kwargs):
+        """
+        Stream receiver that applies ACCT_ACTIVITY messages.
+
+        Args:
+            message (str | dict): message from the stream
+        """
+        for service, timestamp, content in iter_data(message):
+            if service == "ACCT_ACTIVITY":
+                self.apply(OrderEvent(content, timestamp))
+
+    def _fetch(self, order: TrackedOrder):
+        """
+        Fetch an order that was first seen in an event (in the background, the stream is not blocked).
+        """
+        if order.order_id in self._pending:
+            return
+        self._pending.add(order.order_id)
+        if asyncio.iscoroutinefunction(self._client.order_details):  # ClientAsync, the receiver runs in its loop
+            task = asyncio.ensure_future(self._fetch_async(order))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            threading.Thread(target=self._fetch_sync, args=(order,), daemon=True).start()
+
+    def _fetch_sync(self, order: TrackedOrder):
+        try:
+            response = self._client.order_details(self._client._account_hash(order.account), order.order_id)
+            if response.ok:
+                self.load([response.json()])
+            else:
+                self._logger.warning(f"Could not fetch order {order.order_id}: {response.status_code}")
+        except Exception as e:
+            self._logger.error(f"Could not fetch order {order.order_id}: {e}")
+        finally:
+            self._pending.discard(order.order_id)
+
+    async def _fetch_async(self, order: TrackedOrder):
+        try:
+            result = await self._client.order_details(await self._client._account_hash(order.account), order.order_id, parsed=True)
+            if isinstance(result, dict) and "orderId" in result:
+                self.load([result])
+            else:
+                self._logger.warning(f"Could not fetch order {order.order_id}: {result}")
+        except Exception as e:
+            self._logger.error(f"Could not fetch order {order.order_id}: {e}")
+        finally:
+            self._pending.discard(order.order_id)
+
+    def get(self, order_id: int | str) -> TrackedOrder | None:
+        """
+        Returns:
+            TrackedOrder | None: order by ID, None if unknown
+        """
+        return self.orders.get(int(order_id))
+
+    def find(self, account: str | None = None, status: str | None = None, symbol: str | None = None) -> list[TrackedOrder]:
+        """
+        Orders matching every given filter (indexed lookups, no API calls).
+
+        Args:
+            account (str | None): account number. Defaults to None.
+            status (str | None): status, e.g. "WORKING". Defaults to None.
+            symbol (str | None): symbol. Defaults to None.
+
+        Returns:
+            list[TrackedOrder]: orders sorted by order ID
+        """
+        with self.lock:
+            sets = [index.get(key, set()) for index, key in ((self._by_account, account), (self._by_status, status),
+                                                              (self._by_symbol, symbol)) if key is not None]
+            ids = set.intersection(*sets) if sets else self.orders.keys()
+            return [self.orders[order_id] for order_id in sorted(ids)]
+
+    def open_orders(self, account: str | None = None, symbol: str | None = None) -> list[TrackedOrder]:
+        """
+        Orders that can still change (working, queued, pending...).
+
+        Args:
+            account (str | None): account number. Defaults to None.
+            symbol (str | None): symbol. Defaults to None.
+
+        Returns:
+            list[TrackedOrder]: open orders sorted by order ID
+        """
+        with self.lock:
+            if account is not None or symbol is not None:
+                return [order for order in self.find(account=account, symbol=symbol) if order.is_open]
+            ids = self._unknown.union(*(self._by_status[status] for status in OPEN_STATUSES if status in self._by_status))
+            return [self.orders[order_id] for order_id in sorted(ids)]
+
+
+def _template_value(name: str, value) -> bytes:
+    """
+    JSON of one order template value (bools before numbers as bool is an int, NaN and infinity are not JSON).
+    """
+    if isinstance(value, bool):
+        return b"true" if value else b"false"
+    if isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise ValueError(f"[Schwabdev] Order template value {name} is not a finite number: {value}")
+        return str(value).encode()
+    return json.dumps(value).encode()
+
+
+class OrderTemplate:
+
+    _placeholder = re.compile(r'"\{(\w+)\}"')
+
+    def __init__(self, order: dict):
+        """
+        An order serialized once into byte segments around placeholders, string values like "{price}" become arguments of render().
+
+        Args:
+            order (dict): order with placeholders, e.g. {"orderType": "LIMIT", "price": "{price}", ...}
+        """
+        text = json.dumps(order, separators=(",", ":"))
+        parts = self._placeholder.split(text)
+        self._segments = [part.encode() for part in parts[::2]]     # literal JSON between placeholders
+        self.fields = tuple(parts[1::2])                            # placeholder names in order
+
+    def render(self, **values) -> bytes:
+        """
+        Fill in the placeholders, numbers are written as JSON numbers (NaN and infinity raise ValueError), bools as
+        JSON booleans and strings as JSON strings.
+
+        Returns:
+            bytes: order JSON
+        """
+        try:
+            filled = [_template_value(name, values[name]) for name in self.fields]
+        except KeyError as e:
+            raise ValueError(f"[Schwabdev] Missing order template value: {e.args[0]}") from None
+        segments = self._segments
+        out = [segments[0]]
+        for value, segment in zip(filled, segments[1:]):
+            out.append(value)
+            out.append(segment)
+        return b"".join(out)
+
+
+class OrderAck:
+    __slots__ = ("status", "order_id", "elapsed", "response")
+
+    def __init__(self, status: int, location: str | None, elapsed: float, response):
+        """
+        Result of an order submission.
+
+        Args:
+            status (int): HTTP status
+            location (str | None): Location header (ends with the order ID)
+            elapsed (float): seconds from sending the order until the response
+            response (requests.Response | aiohttp.ClientResponse): response
+        """
+        self.status = status                                        # HTTP status
+        order_id = location.rsplit("/", 1)[-1] if location else None
+        self.order_id = int(order_id) if order_id and order_id.isdigit() else None  # new order ID (None if not returned)
+        self.elapsed = elapsed                                      # submit to ack (seconds)
+        self.response = response                                    # raw response
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def __repr__(self) -> str:
+        return f"OrderAck(status={self.status}, order_id={self.order_id}, elapsed={self.elapsed * 1000:.2f}ms)"
+
+
+class OrderResult:
+    __slots__ = ("order_id", "status", "new_order_id", "elapsed", "response", "error")
+
+    def __init__(self, order_id: int | str | None, status: int | None, location: str | None, elapsed: float, response=None,
+                 error: Exception | None = None):
+        """
+        Result of one order in a batch (place_orders, replace_orders, cancel_orders).
+
+        Args:
+            order_id (int | str | None): order replaced/canceled (None when placing)
+            status (int | None): HTTP status, None if the request failed
+            location (str | None): Location header (ends with the new order ID)
+            elapsed (float): seconds taken (including waiting for the rate limiters)
+            response (requests.Response | aiohttp.ClientResponse | None): response, None if the request failed. Defaults to None.
+            error (Exception | None): exception raised by the request. Defaults to None.
+        """
+        self.order_id = order_id                                    # order replaced/canceled
+        self.status = status                                        # HTTP status
+        new_order_id = location.rsplit("/", 1)[-1] if location else None
+        self.new_order_id = int(new_order_id) if new_order_id and new_order_id.isdigit() else None  # placed/replacing order ID
+        self.elapsed = elapsed                                      # seconds taken
+        self.response = response                                    # raw response
+        self.error = error                                          # exception, if any
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+    def __repr__(self) -> str:
+        return f"OrderResult(order_id={self.order_id}, status={self.status}, new_order_id={self.new_order_id}, error={self.error!r})"
+
+
+def _order_body(order, values: dict) -> bytes:
+    if isinstance(order, OrderTemplate):
+        return order.render(**values)
+    if isinstance(order, bytes):
+        return order
+    return json.dumps(order, separators=(",", ":")).encode()
+
+
+class OrderEntry:
+
+    def __init__(self, client, account_hash: str, token_margin: float = 120):
+        """
+        Order entry for one account on its own warm connection, separate from the client's session and lock.
+        Tokens are refreshed by a background thread before they expire, so submitting does not check them.
+        Hooks added with client.add_hook are called around every order.
+
+        Args:
+            client (Client): client (for tokens, the rate limiter and the base url)
+            account_hash (str): account hash from linked_accounts()
+            token_margin (float): refresh the access token this many seconds before it expires. Defaults to 120.
+        """
+        self._client = client
+        self.token_margin = token_margin                            # seconds before expiry to refresh
+        self._path = f"/trader/v1/accounts/{account_hash}/orders"   # orders path (for hooks)
+        self._url = f"{client._base_api_url}{self._path}"
+        self._session = requests.Session()                          # dedicated session (connection pool)
+        self._session.headers.update({"Accept": "application/json", "Content-Type": "application/json"})
+        self._settings = self._session.merge_environment_settings(self._url, {}, False, None, None)  # looked up once
+        self._token = None                                          # access token in the prepared requests
+        self._prepared = {}                                         # method -> prepared request to copy
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._keep_tokens, name="Schwabdev-OrderEntry-Tokens", daemon=True)
+        self._thread.start()
+
+    def _prepare(self):
+        token = self._client.tokens.access_token
+        self._session.headers["Authorization"] = f"Bearer {token}"
+        self._prepared = {method: self._session.prepare_request(requests.Request(method, self._url, data=b"{}"))
+                          for method in ("POST", "PUT")}
+        self._token = token
+
+    def _expires_in(self) -> float:
+        return (self._client.tokens.access_token_expires - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+
+    def _keep_tokens(self):
+        while not self._stop.wait(max(self._expires_in() - self.token_margin, 5)):
+            try:
+                self._client.update_tokens(force_access_token=self._expires_in() <= self.token_margin)
+            except Exception as e:
+                self._client.logger.error(f"[Schwabdev] Could not refresh tokens for order entry: {e}")
+
+    def warm(self) -> float:
+        """
+        Open (or keep open) the connection with a lightweight request so the next order does not pay DNS/TCP/TLS setup.
+
+        Returns:
+            float: seconds taken
+        """
+        start = time.perf_counter()
+        self._session.head(self._client._base_api_url + "/", timeout=self._client.timeout)
+        return time.perf_counter() - start
+
+    def _send(self, method: str, path: str, body: bytes) -> OrderAck:
+        client = self._client
+        info = hooks.RequestInfo(method, path, self._url + path[len(self._path):]) if client._hooks else None
+        if client.tokens.access_token is not self._token:  # refreshed since the requests were prepared
+            self._prepare()
+        if client.order_rate_limiter is not None:
+            client.order_rate_limiter.acquire()
+        if client.rate_limiter is not None:
+            client.rate_limiter.acquire()
+        prepared = self._prepared[method].copy()
+        prepared.body = body
+        prepared.headers["Content-Length"] = str(len(body))
+        if path != self._path:
+            prepared.url = self._url + path[len(self._path):]
+        if info is not None:
+            info.limiter_wait = time.perf_counter() - info.start
+            info.request_bytes = len(body)
+            client._call_hooks("before_request", info)
+        start = time.perf_counter()
+        try:
+            response = self._session.send(prepared, timeout=client.timeout, **self._settings)
+        except Exception as e:
+            if info is not None:
+                info.error = e
+                info.timings["total"] = time.perf_counter() - start
+                client._call_hooks("on_error", info, e)
+            raise
+        elapsed = time.perf_counter() - start
+        if info is not None:
+            info.timings["ttfb"] = response.elapsed.total_seconds()
+            info.timings["total"] = elapsed
+            info.status = response.status_code
+            info.response_bytes = len(response.content)
+            client._call_hooks("after_response", info, response)
+        return OrderAck(response.status_code, response.headers.get("Location"), elapsed, response)
+
+    def submit(self, order: OrderTemplate | bytes | dict, **values) -> OrderAck:
+        """
+        Place an order.
+
+        Args:
+            order (OrderTemplate | bytes | dict): template (filled with values), order JSON or order dictionary
+            **values: template values, e.g. price=10.5, quantity=3, symbol="AMD"
+
+        Returns:
+            OrderAck: status, new order ID and submit-to-ack time
+        """
+        return self._send("POST", self._path, _order_body(order, values))
+
+    def replace(self, order_id: int | str, order: OrderTemplate | bytes | dict, **values) -> OrderAck:
+        """
+        Replace an order.
+
+        Args:
+            order_id (int | str): order ID to replace
+            order (OrderTemplate | bytes | dict): template (filled with values), order JSON or order dictionary
+            **values: template values
+
+        Returns:
+            OrderAck: status, new order ID and submit-to-ack time
+        """
+        return self._send("PUT", f"{self._path}/{order_id}", _order_body(order, values))
+
+    def close(self):
+        """
+        Stop the token thread and close the connection.
+        """
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class OrderEntryAsync:
+
+    def __init__(self, client, account_hash: str):
+        """
+        Order entry for one account on its own warm connection (separate from the client's session and connection pool).
+        Tokens are kept current by the client's background checker (async with client), so submitting does not check them.
+        Hooks added with client.add_hook are called around every order.
+
+        Args:
+            client (ClientAsync): client (for tokens, the rate limiter and the base url)
+            account_hash (str): account hash from linked_accounts()
+        """
+        self._client = client
+        self._path = f"/trader/v1/accounts/{account_hash}/orders"   # orders path (for hooks)
+        self._url = f"{client._base_api_url}{self._path}"
+        self._session = None                                        # dedicated session, created in the event loop
+        self._headers = None                                        # request headers with the current access token
+        self._token = None                                          # access token in the headers
+
+    def _get_session(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(keepalive_timeout=300),
+                                                  timeout=aiohttp.ClientTimeout(total=self._client.timeout))
+        return self._session
+
+    async def warm(self) -> float:
+        """
+        Open (or keep open) the connection with a lightweight request so the next order does not pay DNS/TCP/TLS setup.
+
+        Returns:
+            float: seconds taken
+        """
+        start = time.perf_counter()
+        async with self._get_session().head(self._client._base_api_url + "/"):
+            pass
+        return time.perf_counter() - start
+
+    async def _send(self, method: str, path: str, body: bytes) -> OrderAck:
+        client = self._client
+        url = self._url + path[len(self._path):]
+        info = hooks.RequestInfo(method, path, url) if client._hooks else None
+        token = client.tokens.access_token
+        if token is not self._token:
+            self._headers = {"Authorization": f"Bearer {token}", "Accept": "application/json", "Content-Type": "application/json"}
+            self._token = token
+        if client.order_rate_limiter is not None:
+            await client.order_rate_limiter.acquire_async()
+        if client.rate_limiter is not None:
+            await client.rate_limiter.acquire_async()
+        session = self._get_session()
+        if info is not None:
+            info.limiter_wait = time.perf_counter() - info.start
+            info.request_bytes = len(body)
+            client._call_hooks("before_request", info)
+        start = time.perf_counter()
+        try:
+            async with session.request(method, url, data=body, headers=self._headers) as response:
+                elapsed = time.perf_counter() - start
+                await response.read()
+        except Exception as e:
+            if info is not None:
+                info.error = e
+                info.timings["total"] = time.perf_counter() - start
+                client._call_hooks("on_error", info, e)
+            raise
+        if info is not None:
+            info.timings["ttfb"] = elapsed
+            info.timings["total"] = time.perf_counter() - start
+            info.status = response.status
+            info.response_bytes = response.content_length
+            client._call_hooks("after_response", info, response)
+        return OrderAck(response.status, response.headers.get("Location"), elapsed, response)
+
+    async def submit(self, order: OrderTemplate | bytes | dict, **values) -> OrderAck:
+        """
+        Place an order.
+
+        Args:
+            order (OrderTemplate | bytes | dict): template (filled with values), order JSON or order dictionary
+            **values: template values, e.g. price=10.5, quantity=3, symbol="AMD"
+
+        Returns:
+            OrderAck: status, new order ID and submit-to-ack time
+        """
+        return await self._send("POST", self._path, _order_body(order, values))
+
+    async def replace(self, order_id: int | str, order: OrderTemplate | bytes | dict, **values) -> OrderAck:
+        """
+        Replace an order.
+
+        Args:
+            order_id (int | str): order ID to replace
+            order (OrderTemplate | bytes | dict): template (filled with values), order JSON or order dictionary
+            **values: template values
+
+        Returns:
+            OrderAck: status, new order ID and submit-to-ack time
+        """
+        return await self._send("PUT", f"{self._path}/{order_id}", _order_body(order, values))
+
+    async def close(self):
+        """
+        Close the connection.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,424 @@
+"""
+Schwabdev Poller Module.
+Polls REST-only data (balances, positions, movers, ...) at given intervals within a share of the rate limit and only
+during market hours, hashing response bodies so callbacks only run (with a structured diff) when the data changed.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import datetime
+import hashlib
+import json
+import threading
+import time
+
+from ._lazy import lazy_import
+from .batch import Call
+from .calendar import MarketCalendar
+
+asyncio = lazy_import("asyncio")
+
+# keys (dotted paths) identifying the items of lists, so list diffs follow items instead of positions
+ITEM_KEYS = ("symbol", "instrument.symbol", "securitiesAccount.accountNumber", "accountNumber", "orderId", "activityId", "cusip")
+
+
+class Change:
+    __slots__ = ("kind", "path", "old", "new")
+
+    def __init__(self, kind: str, path: tuple, old, new):
+        """
+        One difference between two polls.
+
+        Args:
+            kind (str): "added", "removed" or "changed"
+            path (tuple): keys from the root to the value, list items are keyed by their ITEM_KEYS value (e.g. a symbol) or index
+            old: previous value (None if added)
+            new: current value (None if removed)
+        """
+        self.kind = kind                                            # added, removed or changed
+        self.path = path                                            # keys to the value
+        self.old = old                                              # previous value
+        self.new = new                                              # current value
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Change) and (self.kind, self.path, self.old, self.new) == (other.kind, other.path, other.old, other.new)
+
+    def __repr__(self) -> str:
+        return f"Change({self.kind} {'/'.join(map(str, self.path))}: {self.old!r} -> {self.new!r})"
+
+
+def _item_key(item):
+    if isinstance(item, dict):
+        for key in ITEM_KEYS:
+            value = item
+            for part in key.split("."):
+                value = value.get(part) if isinstance(value, dict) else None
+            if value is not None:
+                return value
+    return None
+
+
+def diff(old, new, path: tuple = ()) -> list[Change]:
+    """
+    Structured difference between two parsed responses.
+
+    Args:
+        old: previous value (parsed JSON)
+        new: current value (parsed JSON)
+        path (tuple): path of the values. Defaults to ().
+
+    Returns:
+        list[Change]: changes (empty if equal)
+
+    Example:
+        diff({"positions": [{"symbol": "AMD", "qty": 1}]}, {"positions": [{"symbol": "AMD", "qty": 2}]})
+        [Change(changed positions/AMD/qty: 1 -> 2)]
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key, value in new.items():
+            if key not in old:
+                changes.append(Change("added", path + (key,), None, value))
+            else:
+                changes += diff(old[key], value, path + (key,))
+        changes += [Change("removed", path + (key,), value, None) for key, value in old.items() if key not in new]
+        return changes
+    if isinstance(old, list) and isinstance(new, list):
+        old_items = {_item_key(item): item for item in old}
+        new_items = {_item_key(item): item for item in new}
+        if None in old_items or None in new_items or len(old_items) != len(old) or len(new_items) != len(new):
+            old_items, new_items = dict(enumerate(old)), dict(enumerate(new))  # not identifiable, compare by index
+        return diff(old_items, new_items, path)
+    return [Change("changed", path, old, new)]
+
+
+class Poll:
+    __slots__ = ("call", "func", "interval", "callback", "market", "sessions", "select", "digest", "value", "due", "polls",
+                 "changes", "errors", "last")
+
+    def __init__(self, call: Call, func, interval: float, callback, market: str | None, sessions: tuple[str], select):
+        """
+        A registered poll (returned by poller.add), see Poller.add for the arguments.
+        """
+        self.call = call                                            # api call
+        self.func = func                                            # bound client method
+        self.interval = interval                                    # requested seconds between polls
+        self.callback = callback                                    # called with (poll, value, changes)
+        self.market = market                                        # market whose hours limit polling
+        self.sessions = sessions                                    # sessions polled in
+        self.select = select                                        # parsed value -> compared value
+        self.digest = None                                          # hash of the last body
+        self.value = None                                           # last (selected) value
+        self.due = 0.0                                              # time.monotonic() of the next poll
+        self.polls = 0                                              # requests made
+        self.changes = 0                                            # polls whose body changed
+        self.errors = 0                                             # failed polls
+        self.last = None                                            # time.monotonic() of the last poll
+
+    def __repr__(self) -> str:
+        return f"Poll({self.call.name}, every {self.interval}s, polls={self.polls}, changes={self.changes}, errors={self.errors})"
+
+
+class PollerBase:
+
+    def __init__(self, client, budget: float = 0.5, calendar: MarketCalendar | None = None):
+        """
+        Shared scheduling and change detection of Poller and PollerAsync.
+
+        Args:
+            client (Client | ClientAsync): client to poll with (requests go through its rate limiter)
+            budget (float): share of the client's rate limit polls may use, intervals are stretched evenly when the polls
+                need more. Defaults to 0.5.
+            calendar (MarketCalendar | None): market calendar to poll in the sessions of (markets of the polls are added to
+                it), None for a new one. Defaults to None.
+        """
+        self._client = client
+        self._logger = client.logger
+        self.budget = budget                                        # share of the rate limit used by polls
+        self.polls = []                                             # registered polls
+        self.calendar = calendar or MarketCalendar(client, markets=())  # market sessions
+        self._stretch = 1.0                                         # interval multiplier keeping polls within the budget
+        self._spacing = 0.0                                         # minimum seconds between polls
+        self._last = 0.0                                            # time.monotonic() of the last poll
+
+    def add(self, call, interval: float, callback, market: str | None = "equity", sessions: tuple[str] = ("regularMarket",),
+            select=None) -> Poll:
+        """
+        Register a poll.
+
+        Args:
+            call (Call | str | tuple): api call (as for client.batch), e.g. ("account_details_all", "positions")
+            interval (float): seconds between polls (stretched if all polls need more than the budget)
+            callback (callable): called with (poll, value, changes) when the response changed, value is the parsed
+                (and selected) response and changes the list[Change] since the last value (None for the first value)
+            market (str | None): market ("equity", "option", "bond", "future", "forex") to poll only during the hours of,
+                None to always poll. Defaults to "equity".
+            sessions (tuple[str]): sessions of the market to poll in ("preMarket", "regularMarket", "postMarket").
+                Defaults to ("regularMarket",).
+            select (callable | None): function of the parsed response returning the part to compare and pass to the
+                callback (e.g. to drop fields that always change). Defaults to None.
+
+        Returns:
+            Poll: the poll (remove with poller.remove(poll))
+        """
+        if interval <= 0:
+            raise ValueError("[Schwabdev] Poll interval must be greater than 0.")
+        (call, func), = self._client._batch_calls([call])
+        poll = Poll(call, func, interval, callback, market, tuple(sessions), select)
+        self.polls = self.polls + [poll]  # copy on write, the loop iterates the list without a lock
+        self._rebudget()
+        self._wake()
+        return poll
+
+    def remove(self, poll: Poll):
+        """
+        Unregister a poll.
+
+        Args:
+            poll (Poll): poll returned by add()
+        """
+        self.polls = [p for p in self.polls if p is not poll]
+        self._rebudget()
+
+    def _rebudget(self):
+        limiter = self._client.rate_limiter
+        if limiter is None or not self.polls:
+            self._stretch, self._spacing = 1.0, 0.0
+            return
+        allowed = limiter.calls / limiter.period * self.budget      # polls per second
+        demand = sum(1 / poll.interval for poll in self.polls)
+        self._stretch = max(1.0, demand / allowed)
+        self._spacing = 1 / allowed
+        if self._stretch > 1:
+            self._logger.info(f"Polls need {demand * 60:.0f} requests per minute, intervals stretched {self._stretch:.2f}x "
+                              f"to stay within {allowed * 60:.0f}")
+
+    def _wake(self):
+        pass
+
+    def _markets(self) -> set[str]:
+        return {poll.market for poll in self.polls if poll.market is not None}
+
+    def _reschedule(self, poll: Poll, now: float):
+        """
+        Set when a poll is next due: after its (stretched) interval, moved to the next session if the market is closed then.
+        """
+        due = now + poll.interval * self._stretch
+        if poll.market is not None:
+            wall = datetime.datetime.now(datetime.timezone.utc)
+            at = wall + datetime.timedelta(seconds=due - now)
+            window = self.calendar.window(poll.market, poll.sessions, at)
+            if window is None:
+                due = now + 3600  # closed for the cached days, check again later
+            elif window[0] > at:
+                due = now + (window[0] - wall).total_seconds()
+        poll.due = due
+
+    def _next(self, now: float) -> tuple[Poll | None, float]:
+        """
+        Poll due next and seconds until it may run (respecting the spacing between polls).
+        """
+        polls = self.polls
+        if not polls:
+            return None, 3600.0
+        poll = min(polls, key=lambda p: p.due)
+        return poll, max(poll.due, self._last + self._spacing) - now
+
+    def _handle(self, poll: Poll, status: int | None, body: bytes | None, error: Exception | None):
+        """
+        Record a poll result and call the callback if the body changed.
+        """
+        poll.polls += 1
+        poll.last = time.monotonic()
+        if error is not None or status is None or not 200 <= status < 300:
+            poll.errors += 1
+            self._logger.warning(f"Poll {poll.call} failed: {error if error is not None else f'HTTP {status}'}")
+            return
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if digest == poll.digest:
+            return  # unchanged, nothing is parsed
+        first = poll.digest is None
+        poll.digest = digest
+        value = json.loads(body)
+        if poll.select is not None:
+            value = poll.select(value)
+        changes = None if first else diff(poll.value, value)
+        poll.value = value
+        if changes == []:
+            return  # the selected part did not change
+        poll.changes += 1
+        try:
+            poll.callback(poll, value, changes)
+        except Exception as e:
+            self._logger.error(f"Error in poll callback for {poll.call}: {e}")
+
+    def stats(self) -> list[dict]:
+        """
+        Poll statistics.
+
+        Returns:
+            list[dict]: per poll {"call", "interval": requested seconds, "effective": seconds after stretching, "polls",
+                "changes", "errors", "due": seconds until the next poll}
+        """
+        now = time.monotonic()
+        return [{"call": poll.call.name, "interval": poll.interval, "effective": poll.interval * self._stretch, "polls": poll.polls,
+                 "changes": poll.changes, "errors": poll.errors, "due": max(0.0, poll.due - now)} for poll in self.polls]
+
+
+class Poller(PollerBase):
+
+    def __init__(self, client, budget: float = 0.5, calendar: MarketCalendar | None = None):
+        """
+        Poll api calls of a Client in a background thread, see PollerBase for the arguments.
+        """
+        super().__init__(client, budget, calendar)
+        self._condition = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+    def add(self, call, interval: float, callback, market: str | None = "equity", sessions: tuple[str] = ("regularMarket",),
+            select=None) -> Poll:
+        with self._condition:
+            return super().add(call, interval, callback, market, sessions, select)
+
+    add.__doc__ = PollerBase.add.__doc__
+
+    def _wake(self):
+        self._condition.notify()
+
+    def _load_hours(self):
+        self.calendar.markets |= self._markets()
+        self.calendar.refresh()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stop:
+                    return
+                poll, delay = self._next(time.monotonic())
+                if delay > 0:
+                    self._condition.wait(min(delay, 60))  # woken early by add() and stop()
+                    continue
+            self._last = time.monotonic()
+            error = status = body = None
+            try:
+                response = poll.func(*poll.call.args, **poll.call.kwargs)
+                status, body = response.status_code, response.content
+            except Exception as e:
+                error = e
+            self._handle(poll, status, body, error)
+            try:
+                self._load_hours()
+            except Exception as e:
+                self._logger.warning(f"Could not get market hours: {e}")
+            self._reschedule(poll, time.monotonic())
+
+    def start(self, daemon: bool = True):
+        """
+        Start polling in a background thread (polls are due right away, then at their intervals while their market is open).
+
+        Args:
+            daemon (bool): whether to run the thread in the background (as a daemon). Defaults to True.
+        """
+        self._load_hours()
+        now = time.monotonic()
+        for poll in self.polls:
+            poll.due = now
+            if poll.market is not None:  # start in the next session if the market is closed
+                self._reschedule(poll, now - poll.interval * self._stretch)
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="schwabdev-poller", daemon=daemon)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop polling.
+        """
+        with self._condition:
+            self._stop = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class PollerAsync(PollerBase):
+
+    def __init__(self, client, budget: float = 0.5, calendar: MarketCalendar | None = None):
+        """
+        Poll api calls of a ClientAsync in a background task, see PollerBase for the arguments.
+        """
+        super().__init__(client, budget, calendar)
+        self._event = None                                          # set to wake the task (add)
+        self._task = None
+
+    def _wake(self):
+        if self._event is not None:
+            self._event.set()
+
+    async def _load_hours(self):
+        self.calendar.markets |= self._markets()
+        await self.calendar.refresh()
+
+    async def _run(self):
+        while True:
+            poll, delay = self._next(time.monotonic())
+            if delay > 0:
+                self._event.clear()
+                try:
+                    await asyncio.wait_for(self._event.wait(), min(delay, 60))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._last = time.monotonic()
+            error = status = body = None
+            try:
+                response = await poll.func(*poll.call.args, **{"parsed": False, **poll.call.kwargs})
+                status, body = response.status, await response.read()
+            except Exception as e:
+                error = e
+            self._handle(poll, status, body, error)
+            try:
+                await self._load_hours()
+            except Exception as e:
+                self._logger.warning(f"Could not get market hours: {e}")
+            self._reschedule(poll, time.monotonic())
+
+    async def start(self):
+        """
+        Start polling in a background task (polls are due right away, then at their intervals while their market is open).
+        """
+        await self._load_hours()
+        now = time.monotonic()
+        for poll in self.polls:
+            poll.due = now
+            if poll.market is not None:
+                self._reschedule(poll, now - poll.interval * self._stretch)
+        self._event = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop polling.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
@@ -0,0 +1,346 @@
+"""
+Schwabdev Portfolio Module.
+Positions loaded once from REST, marked to market from the LEVELONE stream and refreshed on ACCT_ACTIVITY fills, with
+per-account and aggregate market value, P&L and greeks kept current incrementally in NumPy arrays.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import asyncio
+import logging
+import threading
+
+from .orders import OrderEvent
+from .translate import iter_data
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (pip install schwabdev[numpy])
+    np = None
+
+# aggregated measures, in column order of portfolio.contributions and the totals
+MEASURES = ("market_value", "open_pnl", "day_pnl", "delta", "gamma", "theta", "vega", "delta_dollars")
+
+# ACCT_ACTIVITY message types after which positions are refreshed
+FILL_MESSAGE_TYPES = frozenset({"ExecutionCreated", "OrderFillCompleted", "OrderPartialFillCompleted"})
+
+# instrument assetType: stream service marking it (other asset types keep their REST value)
+_SERVICES = {"EQUITY": "LEVELONE_EQUITIES", "ETF": "LEVELONE_EQUITIES", "COLLECTIVE_INVESTMENT": "LEVELONE_EQUITIES",
+             "INDEX": "LEVELONE_EQUITIES", "OPTION": "LEVELONE_OPTIONS", "FUTURE": "LEVELONE_FUTURES"}
+
+# stream service: {field number: column}
+_STREAM_COLUMNS = {"LEVELONE_EQUITIES": {"33": "mark"},
+                   "LEVELONE_OPTIONS": {"37": "mark", "28": "delta", "29": "gamma", "30": "theta", "31": "vega", "35": "underlying"},
+                   "LEVELONE_FUTURES": {"24": "mark", "31": "multiplier"}}
+_STREAM_FIELDS = {service: ",".join(["0"] + list(columns)) for service, columns in _STREAM_COLUMNS.items()}
+
+_MISSING = ("delta", "gamma", "theta", "vega")  # columns where Schwab sends -999 for missing values
+
+_FLOAT_COLUMNS = ("quantity", "multiplier", "average", "mark", "base_mark", "base_day_pnl", "delta", "gamma", "theta", "vega",
+                  "underlying")
+
+
+class Portfolio:
+
+    def __init__(self, client=None, on_update=None, refresh_on_fill: bool = True):
+        """
+        Positions of one or more accounts marked to market from the stream, usually loaded with
+        portfolio.load(client.account_details_all(fields="positions").json()). Pass portfolio.on_stream as (or call it
+        from) the stream receiver and subscribe with portfolio.subscribe(streamer).
+        Read with the methods below or while holding portfolio.lock for a consistent view of the arrays.
+
+        Args:
+            client (Client | ClientAsync | None): client used to refresh an account's positions after a fill. Defaults to None.
+            on_update (function | None): called with (portfolio, symbols) after streamed marks or a refresh changed positions. Defaults to None.
+            refresh_on_fill (bool): refresh an account's positions with account_details() on ACCT_ACTIVITY fills. Defaults to True.
+        """
+        if np is None:
+            raise ImportError("numpy is required to use Portfolio (pip install schwabdev[numpy])")
+        self._client = client
+        self.on_update = on_update                                  # update callback
+        self.refresh_on_fill = refresh_on_fill and client is not None  # refresh positions on fills
+        self.lock = threading.RLock()                               # held while updating or reading
+        self.accounts = []                                          # account numbers, index of the account totals
+        self.balances = {}                                          # account number -> currentBalances (from REST)
+        self.symbols = np.empty(0, dtype=object)                    # position symbols, one per row
+        self.columns = {name: np.empty(0) for name in _FLOAT_COLUMNS}  # column name -> array (one value per row)
+        self.account = np.empty(0, dtype=np.intp)                   # account index of each row
+        self.services = np.empty(0, dtype=object)                   # stream service of each row (None if not streamed)
+        self.index = {}                                             # symbol -> rows
+        self.contributions = np.empty((0, len(MEASURES)))           # measures of each row
+        self.account_totals = np.empty((0, len(MEASURES)))          # measures summed per account
+        self.total = np.zeros(len(MEASURES))                        # measures summed over every account
+        self._positions = {}                                        # account number -> positions (REST format)
+        self._stream = None                                         # stream used for subscriptions
+        self._subscribed = {}                                       # service -> subscribed symbols
+        self._pending = set()                                       # accounts being refreshed
+        self._stale = set()                                         # accounts filled again during a refresh
+        self._tasks = set()                                         # pending sends and refreshes (StreamAsync/ClientAsync)
+        self._logger = logging.getLogger("Schwabdev.Portfolio")
+
+    def load(self, accounts: list[dict] | dict):
+        """
+        Add or replace the positions of accounts, e.g. from account_details_all(fields="positions").json() at startup.
+        Marks and greeks already streamed for a symbol are kept.
+
+        Args:
+            accounts (list[dict] | dict): accounts (REST format, with or without the "securitiesAccount" wrapper)
+        """
+        if isinstance(accounts, dict):
+            accounts = [accounts]
+        with self.lock:
+            for account in accounts:
+                account = account.get("securitiesAccount", account)
+                number = str(account["accountNumber"])
+                self._positions[number] = account.get("positions", [])
+                self.balances[number] = account.get("currentBalances", {})
+            self._rebuild()
+        if self._stream is not None:
+            self._update_subscriptions()
+        if self.on_update is not None:
+            self.on_update(self, list(self.index))
+
+    def _rebuild(self):
+        """
+        Rebuild the arrays from the REST positions.
+        """
+        old_columns, old_index = self.columns, self.index
+        self.accounts = list(self._positions)
+        rows = [(i, position) for i, number in enumerate(self.accounts) for position in self._positions[number]]
+        symbols, services, columns = [], [], {name: np.zeros(len(rows)) for name in _FLOAT_COLUMNS}
+        for row, (_, position) in enumerate(rows):
+            instrument = position.get("instrument", {})
+            asset_type = instrument.get("assetType")
+            quantity = position.get("longQuantity", 0.0) - position.get("shortQuantity", 0.0)
+            multiplier = instrument.get("multiplier") or (100.0 if asset_type == "OPTION" else 1.0)
+            average = position.get("averagePrice", 0.0)
+            size = quantity * multiplier
+            base_mark = position.get("marketValue", 0.0) / size if size else average  # mark of the REST values
+            symbols.append(instrument.get("symbol"))
+            services.append(_SERVICES.get(asset_type))
+            for name, value in (("quantity", quantity), ("multiplier", multiplier), ("average", average), ("mark", base_mark),
+                                ("base_mark", base_mark), ("base_day_pnl", position.get("currentDayProfitLoss", 0.0)),
+                                ("delta", 1.0 if asset_type != "OPTION" else np.nan), ("gamma", 0.0), ("theta", 0.0),
+                                ("vega", 0.0), ("underlying", base_mark if asset_type != "OPTION" else np.nan)):
+                columns[name][row] = value
+        self.symbols = np.array(symbols, dtype=object)
+        self.services = np.array(services, dtype=object)
+        self.account = np.array([i for i, _ in rows], dtype=np.intp)
+        index = {}
+        for row, symbol in enumerate(symbols):
+            index.setdefault(symbol, []).append(row)
+        self.index = {symbol: np.array(symbol_rows, dtype=np.intp) for symbol, symbol_rows in index.items()}
+        for symbol, symbol_rows in self.index.items():  # keep what was streamed
+            old = old_index.get(symbol)
+            if old is not None:
+                for name in ("mark", "delta", "gamma", "theta", "vega", "underlying", "multiplier"):
+                    columns[name][symbol_rows] = old_columns[name][old[0]]
+        self.columns = columns
+        self.contributions = np.zeros((len(rows), len(MEASURES)))
+        self.account_totals = np.zeros((len(self.accounts), len(MEASURES)))
+        self.total = np.zeros(len(MEASURES))
+        self._measure(np.arange(len(rows), dtype=np.intp))
+
+    def _measure(self, rows):
+        """
+        Recompute the measures of rows and apply the differences to the account and aggregate totals.
+        """
+        c = self.columns
+        size = c["quantity"][rows] * c["multiplier"][rows]
+        mark = c["mark"][rows]
+        delta = c["delta"][rows] * size
+        new = np.column_stack((mark * size,
+                               (mark - c["average"][rows]) * size,
+                               c["base_day_pnl"][rows] + (mark - c["base_mark"][rows]) * size,
+                               delta,
+                               c["gamma"][rows] * size,
+                               c["theta"][rows] * size,
+                               c["vega"][rows] * size,
+                               delta * c["underlying"][rows]))
+        np.nan_to_num(new, copy=False)  # greeks not streamed yet count as 0
+        change = new - self.contributions[rows]
+        self.contributions[rows] = new
+        np.add.at(self.account_totals, self.account[rows], change)
+        self.total += change.sum(axis=0)
+
+    def _send(self, requests: list):
+        result = self._stream.send(requests)
+        if asyncio.iscoroutine(result):  # StreamAsync
+            task = asyncio.ensure_future(result)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _update_subscriptions(self):
+        """
+        Subscribe symbols of new positions and unsubscribe those of closed positions.
+        """
+        requests = []
+        with self.lock:
+            for service, fields in _STREAM_FIELDS.items():
+                wanted = set(self.symbols[self.services == service])
+                subscribed = self._subscribed.get(service, set())
+                added, removed = wanted - subscribed, subscribed - wanted
+                if removed:
+                    requests.append(self._stream.basic_request(service, "UNSUBS", {"keys": ",".join(sorted(removed))}))
+                if added:
+                    requests.append(self._stream.basic_request(service, "ADD", {"keys": ",".join(sorted(added)), "fields": fields}))
+                self._subscribed[service] = wanted
+        if requests:
+            self._send(requests)
+
+    def subscribe(self, stream, account_activity: bool = True):
+        """
+        Subscribe the LEVELONE services of every position, pass portfolio.on_stream as (or call it from) the stream receiver.
+        Positions opened or closed by later refreshes are subscribed and unsubscribed.
+
+        Args:
+            stream (Stream | StreamAsync): stream to subscribe with
+            account_activity (bool): also subscribe ACCT_ACTIVITY (fills refresh positions). Defaults to True.
+        """
+        self._stream = stream
+        if account_activity:
+            self._send([stream.account_activity("Account Activity", "0,1,2,3")])
+        self._update_subscriptions()
+
+    def unsubscribe(self):
+        """
+        Unsubscribe every symbol of the portfolio (ACCT_ACTIVITY is left subscribed).
+        """
+        if self._stream is None:
+            return
+        with self.lock:
+            requests = [self._stream.basic_request(service, "UNSUBS", {"keys": ",".join(sorted(symbols))})
+                        for service, symbols in self._subscribed.items() if symbols]
+            self._subscribed = {}
+        if requests:
+            self._send(requests)
+        self._stream = None
+
+    def on_stream(self, message, **kwargs):
+        """
+        Stream receiver that marks positions from LEVELONE messages and refreshes positions on ACCT_ACTIVITY fills.
+
+        Args:
+            message (str | dict): message from the stream
+        """
+        touched = []
+        with self.lock:
+            for service, timestamp, content in iter_data(message):
+                columns = _STREAM_COLUMNS.get(service)
+                if columns is not None:
+                    rows = self.index.get(content.get("key"))
+                    if rows is None:
+                        continue
+                    for field, column in columns.items():
+                        if field in content:
+                            value = content[field]
+                            self.columns[column][rows] = np.nan if value == -999 and column in _MISSING else value
+                    if service != "LEVELONE_OPTIONS" and "mark" in columns.values():
+                        self.columns["underlying"][rows] = self.columns["mark"][rows]
+                    touched.append(rows)
+                elif service == "ACCT_ACTIVITY":
+                    self.on_order_event(OrderEvent(content, timestamp))
+            if touched:
+                rows = np.unique(np.concatenate(touched)) if len(touched) > 1 else touched[0]
+                self._measure(rows)
+        if touched and self.on_update is not None:
+            self.on_update(self, list(dict.fromkeys(self.symbols[rows])))
+
+    def on_order_event(self, event: OrderEvent, order=None):
+        """
+        Refresh the positions of the event's account if it is a fill, usable as (or from) OrderManager(on_event=...)
+        instead of passing ACCT_ACTIVITY messages to on_stream.
+
+        Args:
+            event (OrderEvent): event
+            order (TrackedOrder | None): order of the event (unused). Defaults to None.
+        """
+        if self.refresh_on_fill and event.message_type in FILL_MESSAGE_TYPES:
+            self.refresh(event.account)
+
+    def refresh(self, account: str):
+        """
+        Refresh the positions of an account with account_details() (in the background, the stream is not blocked).
+        Fills during a refresh cause one more refresh after it.
+
+        Args:
+            account (str): account number
+        """
+        if account in self._pending:
+            self._stale.add(account)
+            return
+        self._pending.add(account)
+        if asyncio.iscoroutinefunction(self._client.account_details):  # ClientAsync, the receiver runs in its loop
+            task = asyncio.ensure_future(self._refresh_async(account))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            threading.Thread(target=self._refresh_sync, args=(account,), daemon=True).start()
+
+    def _refreshed(self, account: str):
+        self._pending.discard(account)
+        if account in self._stale:
+            self._stale.discard(account)
+            self.refresh(account)
+
+    def _refresh_sync(self, account: str):
+        try:
+            response = self._client.account_details(self._client._account_hash(account), fields="positions")
+            if response.ok:
+                self.load(response.json())
+            else:
+                self._logger.warning(f"Could not refresh positions of {account}: {response.status_code}")
+        except Exception as e:
+            self._logger.error(f"Could not refresh positions of {account}: {e}")
+        finally:
+            self._refreshed(account)
+
+    async def _refresh_async(self, account: str):
+        try:
+            result = await self._client.account_details(await self._client._account_hash(account), fields="positions", parsed=True)
+            if isinstance(result, dict) and "securitiesAccount" in result:
+                self.load(result)
+            else:
+                self._logger.warning(f"Could not refresh positions of {account}: {result}")
+        except Exception as e:
+            self._logger.error(f"Could not refresh positions of {account}: {e}")
+        finally:
+            self._refreshed(account)
+
+    def totals(self, account: str | None = None) -> dict:
+        """
+        Measures summed over every account or for one account.
+
+        Args:
+            account (str | None): account number, None for every account. Defaults to None.
+
+        Returns:
+            dict[str, float]: "market_value", "open_pnl", "day_pnl", "delta", "gamma", "theta", "vega", "delta_dollars"
+        """
+        with self.lock:
+            values = self.total if account is None else self.account_totals[self.accounts.index(str(account))]
+            return dict(zip(MEASURES, values.tolist()))
+
+    def by_symbol(self) -> dict:
+        """
+        Measures summed over accounts per symbol.
+
+        Returns:
+            dict[str, dict[str, float]]: symbol -> measures
+        """
+        with self.lock:
+            return {symbol: dict(zip(MEASURES, self.contributions[rows].sum(axis=0).tolist())) for symbol, rows in self.index.items()}
+
+    def positions(self, account: str | None = None) -> list[dict]:
+        """
+        Current positions with their mark and measures.
+
+        Args:
+            account (str | None): account number, None for every account. Defaults to None.
+
+        Returns:
+            list[dict]: {"account", "symbol", "quantity", "mark", "market_value", "open_pnl", ...} per position
+        """
+        with self.lock:
+            rows = range(len(self.symbols)) if account is None else np.nonzero(self.account == self.accounts.index(str(account)))[0]
+            return [{"account": self.accounts[self.account[row]], "symbol": self.symbols[row],
+                     "quantity": float(self.columns["quantity"][row]), "mark": float(self.columns["mark"][row])}
+                    | dict(zip(MEASURES, self.contributions[row].tolist())) for row in rows]
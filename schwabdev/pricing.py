@@ -0,0 +1,268 @@
+"""
+Schwabdev Pricing Module.
+Vectorized Black-Scholes/Black-76 prices, greeks and implied volatility for option chains.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import time
+
+from .translate import iter_data
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (pip install schwabdev[numpy])
+    np = None
+
+_MODELS = ("bs", "black76")
+_MIN_T = 1e-10                  # minimum time to expiration in years
+_MIN_VOL = 1e-8                 # minimum volatility
+
+
+def _check_numpy():
+    if np is None:
+        raise ImportError("numpy is required to use schwabdev.pricing (pip install schwabdev[numpy])")
+
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * x * x) / 2.5066282746310002
+
+
+def _norm_cdf(x):
+    """
+    Cumulative standard normal distribution (Hart's double precision approximation), vectorized.
+    """
+    a = np.abs(x)
+    e = np.exp(-0.5 * a * a)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        num = ((((((0.0352624965998911 * a + 0.700383064443688) * a + 6.37396220353165) * a + 33.912866078383) * a
+                 + 112.079291497871) * a + 221.213596169931) * a + 220.206867912376)
+        den = (((((((0.0883883476483184 * a + 1.75566716318264) * a + 16.064177579207) * a + 86.7807322029461) * a
+                  + 296.564248779674) * a + 637.333633378831) * a + 793.826512519948) * a + 440.413735824752)
+        tail = e / (a + 1 / (a + 2 / (a + 3 / (a + 4 / (a + 0.65))))) / 2.506628274631
+    cum = np.where(a < 7.07106781186547, e * num / den, tail)
+    cum = np.where(a > 37, 0.0, cum)
+    return np.where(x > 0, 1.0 - cum, cum)
+
+
+def _inputs(S, K, T, r, sigma, is_call, q, model):
+    """
+    Broadcast inputs to arrays and convert Black-76 to the generalized Black-Scholes form (carry q = r).
+    """
+    _check_numpy()
+    if model not in _MODELS:
+        raise ValueError(f"Unsupported pricing model: {model} (options: {_MODELS})")
+    S, K, T, r, sigma, q = (np.asarray(v, dtype=np.float64) for v in (S, K, T, r, sigma, q))
+    is_call = np.asarray(is_call, dtype=bool)
+    if model == "black76":
+        q = r
+    return S, K, np.maximum(T, _MIN_T), r, np.maximum(sigma, _MIN_VOL), is_call, q
+
+
+def _d1_d2(S, K, T, r, sigma, q):
+    sqrt_t = np.sqrt(T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / (sigma * sqrt_t)
+    return d1, d1 - sigma * sqrt_t, sqrt_t
+
+
+def price(S, K, T, r, sigma, is_call, q=0.0, model: str = "bs"):
+    """
+    Price european options.
+
+    Args:
+        S (array_like): underlying price (futures price for "black76")
+        K (array_like): strike price
+        T (array_like): time to expiration in years
+        r (array_like): risk free rate (0.05 = 5%)
+        sigma (array_like): volatility (0.2 = 20%)
+        is_call (array_like): True for calls, False for puts
+        q (array_like): continuous dividend yield, ignored for "black76". Defaults to 0.
+        model (str): pricing model ("bs"|"black76"). Defaults to "bs".
+
+    Returns:
+        numpy.ndarray: option prices
+    """
+    S, K, T, r, sigma, is_call, q = _inputs(S, K, T, r, sigma, is_call, q, model)
+    d1, d2, _ = _d1_d2(S, K, T, r, sigma, q)
+    df_s = S * np.exp(-q * T)
+    df_k = K * np.exp(-r * T)
+    return np.where(is_call,
+                    df_s * _norm_cdf(d1) - df_k * _norm_cdf(d2),
+                    df_k * _norm_cdf(-d2) - df_s * _norm_cdf(-d1))
+
+
+def greeks(S, K, T, r, sigma, is_call, q=0.0, model: str = "bs") -> dict:
+    """
+    Price and greeks of european options, scaled like Schwab's (theta per day, vega and rho per 1%).
+
+    Args:
+        S (array_like): underlying price (futures price for "black76")
+        K (array_like): strike price
+        T (array_like): time to expiration in years
+        r (array_like): risk free rate (0.05 = 5%)
+        sigma (array_like): volatility (0.2 = 20%)
+        is_call (array_like): True for calls, False for puts
+        q (array_like): continuous dividend yield, ignored for "black76". Defaults to 0.
+        model (str): pricing model ("bs"|"black76"). Defaults to "bs".
+
+    Returns:
+        dict[str, numpy.ndarray]: "price", "delta", "gamma", "theta", "vega", "rho"
+    """
+    S, K, T, r, sigma, is_call, q = _inputs(S, K, T, r, sigma, is_call, q, model)
+    d1, d2, sqrt_t = _d1_d2(S, K, T, r, sigma, q)
+    disc_q = np.exp(-q * T)
+    disc_r = np.exp(-r * T)
+    pdf_d1 = _norm_pdf(d1)
+    cdf_d1, cdf_d2 = _norm_cdf(d1), _norm_cdf(d2)
+    cdf_nd1, cdf_nd2 = 1.0 - cdf_d1, 1.0 - cdf_d2
+
+    call_price = S * disc_q * cdf_d1 - K * disc_r * cdf_d2
+    put_price = K * disc_r * cdf_nd2 - S * disc_q * cdf_nd1
+    option_price = np.where(is_call, call_price, put_price)
+    decay = -S * disc_q * pdf_d1 * sigma / (2 * sqrt_t)
+    if model == "black76":
+        rho = -T * option_price
+    else:
+        rho = np.where(is_call, K * T * disc_r * cdf_d2, -K * T * disc_r * cdf_nd2)
+
+    return {
+        "price": option_price,
+        "delta": np.where(is_call, disc_q * cdf_d1, -disc_q * cdf_nd1),
+        "gamma": disc_q * pdf_d1 / (S * sigma * sqrt_t),
+        "theta": np.where(is_call,
+                          decay - r * K * disc_r * cdf_d2 + q * S * disc_q * cdf_d1,
+                          decay + r * K * disc_r * cdf_nd2 - q * S * disc_q * cdf_nd1) / 365.0,
+        "vega": S * disc_q * pdf_d1 * sqrt_t / 100.0,
+        "rho": rho / 100.0,
+    }
+
+
+def implied_volatility(option_price, S, K, T, r, is_call, q=0.0, model: str = "bs", tol: float = 1e-8,
+                       max_iter: int = 100, low: float = 1e-4, high: float = 5.0):
+    """
+    Implied volatility of european options using Newton's method with a bisection fallback, vectorized.
+
+    Args:
+        option_price (array_like): option prices to solve for
+        S (array_like): underlying price (futures price for "black76")
+        K (array_like): strike price
+        T (array_like): time to expiration in years
+        r (array_like): risk free rate (0.05 = 5%)
+        is_call (array_like): True for calls, False for puts
+        q (array_like): continuous dividend yield, ignored for "black76". Defaults to 0.
+        model (str): pricing model ("bs"|"black76"). Defaults to "bs".
+        tol (float): price tolerance. Defaults to 1e-8.
+        max_iter (int): maximum iterations. Defaults to 100.
+        low (float): lowest volatility searched. Defaults to 1e-4.
+        high (float): highest volatility searched. Defaults to 5.0.
+
+    Returns:
+        numpy.ndarray: implied volatilities (NaN where the price is outside of no-arbitrage bounds or missing)
+    """
+    S, K, T, r, _, is_call, q = _inputs(S, K, T, r, 0.0, is_call, q, model)
+    arrays = np.broadcast_arrays(S, K, T, r, is_call, q, np.asarray(option_price, dtype=np.float64))
+    shape = arrays[0].shape
+    S, K, T, r, is_call, q, target = (np.ravel(v) for v in arrays)
+    disc_s = S * np.exp(-q * T)
+    disc_k = K * np.exp(-r * T)
+    lower_bound = np.where(is_call, np.maximum(disc_s - disc_k, 0.0), np.maximum(disc_k - disc_s, 0.0))
+    upper_bound = np.where(is_call, disc_s, disc_k)
+    valid = np.isfinite(target) & (target > lower_bound) & (target < upper_bound)
+
+    lo = np.full(target.shape, low)
+    hi = np.full(target.shape, high)
+    sigma = np.full(target.shape, 0.3)
+    idx = np.nonzero(valid)[0]   # contracts still being solved
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+        s, c, ds, dk = sigma[idx], is_call[idx], disc_s[idx], disc_k[idx]
+        d1, d2, sqrt_t = _d1_d2(S[idx], K[idx], T[idx], r[idx], s, q[idx])
+        diff = np.where(c, ds * _norm_cdf(d1) - dk * _norm_cdf(d2), dk * _norm_cdf(-d2) - ds * _norm_cdf(-d1)) - target[idx]
+        vega = ds * _norm_pdf(d1) * sqrt_t
+
+        # price is increasing in volatility so the sign of diff tightens the bracket
+        lo[idx] = np.where(diff < 0, s, lo[idx])
+        hi[idx] = np.where(diff > 0, s, hi[idx])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = s - diff / vega
+        bisect = ~np.isfinite(step) | (step <= lo[idx]) | (step >= hi[idx])
+        done = (np.abs(diff) < tol) | (hi[idx] - lo[idx] < tol)
+        sigma[idx] = np.where(done, s, np.where(bisect, 0.5 * (lo[idx] + hi[idx]), step))
+        idx = idx[~done]
+
+    return np.where(valid, sigma, np.nan).reshape(shape)
+
+
+class ChainPricer:
+
+    def __init__(self, chain, rate: float | None = None, dividend_yield: float = 0.0, model: str = "bs",
+                 price_column: str = "mark", underlying_fields: dict | None = None):
+        """
+        Reprice an option chain (see schwabdev.OptionChain) from a new underlying price, keeping each contract's implied volatility (sticky strike).
+
+        Args:
+            chain (OptionChain): columnar option chain
+            rate (float | None): risk free rate (0.05 = 5%), None to use the chain's interest rate. Defaults to None.
+            dividend_yield (float): continuous dividend yield. Defaults to 0.
+            model (str): pricing model ("bs"|"black76"). Defaults to "bs".
+            price_column (str): chain column to solve implied volatility from. Defaults to "mark".
+            underlying_fields (dict | None): stream service to field number for the underlying price. Defaults to last price of LEVELONE_EQUITIES/LEVELONE_FUTURES.
+        """
+        _check_numpy()
+        self.chain = chain
+        self.rate = rate if rate is not None else chain.interest_rate
+        self.dividend_yield = dividend_yield
+        self.model = model
+        self.price_column = price_column
+        self.underlying_fields = underlying_fields or {"LEVELONE_EQUITIES": "3", "LEVELONE_FUTURES": "3"}
+        self.iv = None              # implied volatilities (solved on first reprice)
+        self.latest = None          # latest repriced values
+
+    def implied_volatility(self, now: float | None = None):
+        """
+        Solve implied volatilities from the chain's market prices.
+
+        Args:
+            now (float | None): epoch seconds to measure time to expiration from. Defaults to now.
+
+        Returns:
+            numpy.ndarray: implied volatilities
+        """
+        c = self.chain
+        self.iv = implied_volatility(c[self.price_column], c.underlying_price, c["strike"], c.time_to_expiration(now),
+                                     self.rate, c["is_call"], self.dividend_yield, self.model)
+        return self.iv
+
+    def reprice(self, underlying_price: float | None = None, now: float | None = None) -> dict:
+        """
+        Compute prices and greeks for every contract in the chain.
+
+        Args:
+            underlying_price (float | None): new underlying price, None to use the chain's. Defaults to None.
+            now (float | None): epoch seconds to measure time to expiration from. Defaults to now.
+
+        Returns:
+            dict[str, numpy.ndarray]: "iv", "price", "delta", "gamma", "theta", "vega", "rho"
+        """
+        c = self.chain
+        if self.iv is None:
+            self.implied_volatility(now)
+        if underlying_price is not None:
+            c.underlying_price = underlying_price
+        values = greeks(c.underlying_price, c["strike"], c.time_to_expiration(now), self.rate, self.iv,
+                        c["is_call"], self.dividend_yield, self.model)
+        values["iv"] = self.iv
+        self.latest = values
+        return values
+
+    def on_stream(self, message, **kwargs):
+        """
+        Stream receiver that reprices the chain when the underlying price changes.
+
+        Args:
+            message (str | dict): message from the stream
+        """
+        for service, _, content in iter_data(message):
+            field = self.underlying_fields.get(service)
+            if field is not None and content.get("key") == self.chain.underlying_symbol and field in content:
+                self.reprice(content[field], time.time())
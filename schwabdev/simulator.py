@@ -0,0 +1,1098 @@
+"""
+Schwabdev Simulator Module.
+Local stand-in for the Schwab API (REST, OAuth and streamer) with synthetic data, for offline testing and benchmarking.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import asyncio
+import datetime
+import hashlib
+import json
+import math
+import random
+import secrets
+import threading
+import time
+import urllib.parse
+import zlib
+import zoneinfo
+
+import aiohttp
+from aiohttp import web
+
+from .translate import stream_fields
+
+_NY = zoneinfo.ZoneInfo("America/New_York")
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S+0000"
+
+# streamer messages per second for each service (one data frame per message)
+DEFAULT_RATES = {"LEVELONE_EQUITIES": 10.0, "LEVELONE_OPTIONS": 10.0, "LEVELONE_FUTURES": 10.0,
+                 "LEVELONE_FUTURES_OPTIONS": 10.0, "LEVELONE_FOREX": 10.0, "NYSE_BOOK": 5.0, "NASDAQ_BOOK": 5.0,
+                 "OPTIONS_BOOK": 5.0, "CHART_EQUITY": 1.0, "CHART_FUTURES": 1.0, "SCREENER_EQUITY": 0.2,
+                 "SCREENER_OPTION": 0.2}
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _field_kind(name: str) -> str:
+    """
+    Kind of value to generate for a LEVELONE field name from translate.stream_fields.
+    """
+    n = name.strip().lower()
+    if n in ("marginable", "shortable", "hard to borrow", "ispennypilot", "future is tradable", "is tradable",
+             "future is active", "quoted in session", "regular market quote", "regular market trade"):
+        return "bool"
+    if "change" in n or "percent" in n or "yield" in n or "ratio" in n or "rate" in n:
+        return "change"
+    if n in ("delta", "gamma", "theta", "vega", "rho", "volatility"):
+        return "greek"
+    if "price" in n or n in ("mark", "nav", "tick", "tick amount", "time value", "money intrinsic value",
+                             "theoretical option value", "52 week high", "52 week low", "annual dividend amount"):
+        return "price"
+    if "size" in n or "volume" in n or "interest" in n or "quantity" in n:
+        return "size"
+    if "time" in n or n in ("dividend date", "last trading day", "future expiration date", "settlement date"):
+        return "time"
+    if n in ("multiplier", "future multiplier", "digits", "days to expiration", "expiration year",
+             "expiration month", "expiration day"):
+        return "int"
+    return "str"
+
+
+# field number: (name, kind) for each LEVELONE service
+_LEVEL_ONE = {service: {str(i): (name, _field_kind(name)) for i, name in enumerate(names) if i}
+              for service, names in stream_fields.items() if service.startswith("LEVELONE")}
+_DYNAMIC = ("price", "change", "greek", "size", "time")     # kinds sent in every update (others only in the first)
+
+
+class _StreamSession:
+
+    def __init__(self, ws: web.WebSocketResponse):
+        self.ws = ws                                    # websocket of the session
+        self.logged_in = False                          # whether LOGIN succeeded
+        self.subscriptions = {}                         # service -> {key: fields}
+        self.snapshot = set()                           # (service, key) that still need all (static) fields
+        self.bars = {}                                  # (service, key) -> [minute, open, high, low, close, volume]
+        self.seqs = {}                                  # (service, key) -> sequence number of CHART/ACCT_ACTIVITY content
+        self.changed = asyncio.Event()                  # set when subscriptions change (wakes the emitter)
+        self.task = None                                # data emitting task
+
+    def next_seq(self, service: str, key: str) -> int:
+        self.seqs[(service, key)] = self.seqs.get((service, key), 0) + 1
+        return self.seqs[(service, key)]
+
+
+class Simulator:
+
+    app_key = "S" * 32      # credentials accepted by the simulator (any key/secret of a valid length works)
+    app_secret = "s" * 16
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, rates: dict | None = None, seed: int = 0,
+                 latency: float = 0.0, accounts: int = 1, positions: int = 20, orders: int = 50,
+                 transactions: int = 100, max_chain_contracts: int | None = None, heartbeat: float = 10.0):
+        """
+        Initialize a local simulator of the Schwab API: the REST endpoints used by Client/ClientAsync, the OAuth token endpoint
+        and a streamer websocket (LOGIN/LOGOUT/SUBS/ADD/UNSUBS/VIEW) that emits synthetic LEVELONE/BOOK/CHART/SCREENER data.
+        Use as a context manager: "with Simulator() as sim:" runs it in a background thread (needed for Client and ClientAsync
+        since token handling is synchronous), "async with Simulator() as sim:" runs it in the current event loop.
+
+        Args:
+            host (str): host to listen on. Defaults to "127.0.0.1".
+            port (int): port to listen on, 0 for any free port. Defaults to 0.
+            rates (dict | None): streamer messages per second per service (merged over DEFAULT_RATES, 0 disables a service).
+            seed (int): random seed for generated data. Defaults to 0.
+            latency (float): seconds added to every REST response. Defaults to 0.
+            accounts (int): number of linked accounts. Defaults to 1.
+            positions (int): positions per account. Defaults to 20.
+            orders (int): existing orders per account. Defaults to 50.
+            transactions (int): existing transactions per account. Defaults to 100.
+            max_chain_contracts (int | None): option chains with more contracts fail with "Body buffer overflow" (like Schwab). Defaults to None.
+            heartbeat (float): seconds between streamer heartbeats. Defaults to 10.
+        """
+        self.host = host                                # listening host
+        self.port = port                                # listening port (set when started)
+        self.rates = DEFAULT_RATES | (rates or {})      # streamer messages per second per service
+        self.latency = latency                          # added REST latency
+        self.max_chain_contracts = max_chain_contracts  # option chain size limit
+        self.heartbeat = heartbeat                      # seconds between heartbeats
+        self.stats = {"requests": 0, "frames": 0, "logins": 0, "tokens": 0}  # counters
+
+        self._rng = random.Random(seed)                 # random generator for data
+        self._prices = {}                               # symbol -> current price
+        self._codes = set()                             # issued authorization codes
+        self._access_tokens = set()                     # issued access tokens
+        self._refresh_tokens = set()                    # issued refresh tokens
+        self._sessions = set()                          # streamer sessions
+        self._order_id = 1000000000                     # last order id
+        self._runner = None                             # aiohttp app runner
+        self._loop = None                               # loop the server runs in
+        self._thread = None                             # thread (sync use)
+
+        self._accounts = {}                             # hash -> account number
+        self._positions = {}                            # hash -> positions
+        self._orders = {}                               # hash -> {order id: order}
+        self._transactions = {}                         # hash -> transactions
+        for i in range(accounts):
+            number = str(10000000 + i * 7919)
+            account_hash = hashlib.sha256(number.encode()).hexdigest().upper()
+            self._accounts[account_hash] = number
+            self._positions[account_hash] = [self._make_position(self._symbol(j)) for j in range(positions)]
+            self._orders[account_hash] = {}
+            for j in range(orders):
+                order = self._make_order(number, self._order_template(self._symbol(j)), self._rng.choice(("FILLED", "CANCELED", "WORKING")),
+                                         datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=j))
+                self._orders[account_hash][order["orderId"]] = order
+            self._transactions[account_hash] = [self._make_transaction(number, self._symbol(j),
+                                                                       datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=j))
+                                                for j in range(transactions)]
+
+    """
+    Lifecycle
+    """
+
+    @property
+    def url(self) -> str:
+        """
+        Base url to pass to Client(base_url=...)
+        """
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def streamer_url(self) -> str:
+        """
+        Websocket url of the streamer (also returned in the streamer info of preferences()).
+        """
+        return f"ws://{self.host}:{self.port}/ws"
+
+    @property
+    def account_hashes(self) -> list[str]:
+        """
+        Hashes of the simulated accounts.
+        """
+        return list(self._accounts)
+
+    def call_on_auth(self, auth_url: str) -> str:
+        """
+        Authorize without a browser, pass as Client(call_on_auth=sim.call_on_auth).
+
+        Args:
+            auth_url (str): authorization url from the tokens manager
+
+        Returns:
+            str: callback url containing an authorization code
+        """
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(auth_url).query)
+        code = secrets.token_urlsafe(16)
+        self._codes.add(code)
+        return f"{query.get('redirect_uri', ['https://127.0.0.1'])[0]}/?code={code}%40&session={secrets.token_hex(8)}"
+
+    def drop_connections(self):
+        """
+        Abruptly close all streamer connections (clients see ConnectionClosedError), e.g. to test reconnects.
+        Works from any thread.
+        """
+        async def drop():
+            for session in list(self._sessions):
+                await session.ws.close(code=1011, message=b"simulated connection drop")
+
+        if self._thread is not None:
+            asyncio.run_coroutine_threadsafe(drop(), self._loop).result(timeout=5)
+        else:
+            self._loop.create_task(drop())
+
+    async def start(self):
+        """
+        Start the server in the running event loop.
+        """
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/v1/oauth/token", self._oauth_token)
+        app.router.add_get("/v1/oauth/authorize", self._oauth_authorize)
+        app.router.add_get("/ws", self._websocket)
+        for method, path, handler in self._routes():
+            app.router.add_route(method, path, handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self):
+        """
+        Stop the server and close streamer connections.
+        """
+        for session in list(self._sessions):
+            await session.ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def __enter__(self):
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    """
+    Synthetic data
+    """
+
+    @staticmethod
+    def _symbol(i: int) -> str:
+        names = ("AAPL", "MSFT", "AMZN", "NVDA", "GOOGL", "META", "TSLA", "AMD", "INTC", "NFLX", "SPY", "QQQ", "IWM",
+                 "F", "GM", "BAC", "JPM", "XOM", "KO", "PEP")
+        return names[i] if i < len(names) else f"SYM{i}"
+
+    def _price(self, symbol: str, move: bool = False) -> float:
+        """
+        Current price of a symbol (random walk when move is True).
+        """
+        price = self._prices.get(symbol)
+        if price is None:
+            price = self._prices[symbol] = 20 + (zlib.crc32(symbol.encode()) % 48000) / 100
+        elif move:
+            price = self._prices[symbol] = max(0.01, round(price * (1 + self._rng.gauss(0, 0.0005)), 2))
+        return price
+
+    @staticmethod
+    def _cusip(symbol: str) -> str:
+        return f"{zlib.crc32(symbol.encode()) % 10**9:09d}"
+
+    def _make_quote(self, symbol: str, fields: list[str] | None = None) -> dict:
+        price = self._price(symbol)
+        close = round(price * (1 - self._rng.uniform(-0.02, 0.02)), 2)
+        now = _now_ms()
+        volume = self._rng.randint(10**5, 10**8)
+        is_option = len(symbol) > 15
+        asset = "OPTION" if is_option else "INDEX" if symbol.startswith("$") else "FUTURE" if symbol.startswith("/") else "EQUITY"
+        quote = {
+            "52WeekHigh": round(price * 1.3, 2), "52WeekLow": round(price * 0.7, 2), "askMICId": "XNAS",
+            "askPrice": round(price + 0.01, 2), "askSize": self._rng.randint(1, 20), "askTime": now, "bidMICId": "XNAS",
+            "bidPrice": round(price - 0.01, 2), "bidSize": self._rng.randint(1, 20), "bidTime": now,
+            "closePrice": close, "highPrice": round(max(price, close) * 1.01, 2), "lastMICId": "XADF",
+            "lastPrice": price, "lastSize": self._rng.randint(1, 500), "lowPrice": round(min(price, close) * 0.99, 2),
+            "mark": price, "markChange": round(price - close, 2), "markPercentChange": round((price - close) / close * 100, 4),
+            "netChange": round(price - close, 2), "netPercentChange": round((price - close) / close * 100, 4),
+            "openPrice": close, "postMarketChange": 0.0, "postMarketPercentChange": 0.0, "quoteTime": now,
+            "securityStatus": "Normal", "totalVolume": volume, "tradeTime": now,
+        }
+        if is_option:
+            quote |= {"delta": 0.5, "gamma": 0.02, "theta": -0.05, "vega": 0.1, "rho": 0.01, "volatility": 30.0,
+                      "openInterest": self._rng.randint(0, 10**5), "underlyingPrice": self._price(symbol[:6].strip())}
+        data = {
+            "assetMainType": asset, "assetSubType": "COE" if asset == "EQUITY" else None, "quoteType": "NBBO",
+            "realtime": True, "ssid": zlib.crc32(symbol.encode()), "symbol": symbol,
+            "extended": {"askPrice": 0.0, "askSize": 0, "bidPrice": 0.0, "bidSize": 0, "lastPrice": price, "lastSize": 0,
+                         "mark": 0.0, "quoteTime": now, "totalVolume": 0, "tradeTime": now},
+            "fundamental": {"avg10DaysVolume": volume * 0.9, "avg1YearVolume": volume * 1.1, "divAmount": 1.0,
+                            "divFreq": 4, "divPayAmount": 0.25, "divYield": round(100 / price, 4), "eps": round(price / 25, 2),
+                            "fundLeverageFactor": 0.0, "lastEarningsDate": "2024-08-01T00:00:00Z", "peRatio": 25.0},
+            "quote": quote,
+            "reference": {"cusip": self._cusip(symbol), "description": f"{symbol} INC", "exchange": "Q",
+                          "exchangeName": "NASDAQ", "isHardToBorrow": False, "isShortable": True, "htbRate": 0.0},
+            "regular": {"regularMarketLastPrice": price, "regularMarketLastSize": 100, "regularMarketNetChange": round(price - close, 2),
+                        "regularMarketPercentChange": round((price - close) / close * 100, 4), "regularMarketTradeTime": now},
+        }
+        if data["assetSubType"] is None:
+            del data["assetSubType"]
+        if fields:
+            for key in ("quote", "fundamental", "extended", "reference", "regular"):
+                if key not in fields:
+                    del data[key]
+        return data
+
+    def _make_position(self, symbol: str) -> dict:
+        price = self._price(symbol)
+        quantity = self._rng.randint(1, 500)
+        average = round(price * self._rng.uniform(0.8, 1.2), 4)
+        return {"shortQuantity": 0.0, "averagePrice": average, "currentDayProfitLoss": round(quantity * price * 0.001, 2),
+                "currentDayProfitLossPercentage": 0.1, "longQuantity": float(quantity), "settledLongQuantity": float(quantity),
+                "settledShortQuantity": 0.0,
+                "instrument": {"assetType": "EQUITY", "cusip": self._cusip(symbol), "symbol": symbol, "netChange": 0.0},
+                "marketValue": round(quantity * price, 2), "maintenanceRequirement": round(quantity * price * 0.25, 2),
+                "averageLongPrice": average, "taxLotAverageLongPrice": average,
+                "longOpenProfitLoss": round(quantity * (price - average), 2), "previousSessionLongQuantity": float(quantity),
+                "currentDayCost": 0.0}
+
+    def _make_account(self, account_hash: str, positions: bool) -> dict:
+        market_value = sum(p["marketValue"] for p in self._positions[account_hash])
+        cash = 100000.0
+        balances = {"accruedInterest": 0.0, "cashBalance": cash, "cashReceipts": 0.0, "longOptionMarketValue": 0.0,
+                    "liquidationValue": cash + market_value, "longMarketValue": market_value, "moneyMarketFund": 0.0,
+                    "savings": 0.0, "shortMarketValue": 0.0, "pendingDeposits": 0.0, "mutualFundValue": 0.0,
+                    "bondValue": 0.0, "shortOptionMarketValue": 0.0, "availableFunds": cash, "buyingPower": cash * 2,
+                    "equity": cash + market_value, "maintenanceRequirement": market_value * 0.25, "marginBalance": 0.0}
+        account = {"type": "MARGIN", "accountNumber": self._accounts[account_hash], "roundTrips": 0,
+                   "isDayTrader": False, "isClosingOnlyRestricted": False, "pfcbFlag": False,
+                   "initialBalances": balances | {"accountValue": cash + market_value},
+                   "currentBalances": balances, "projectedBalances": {"availableFunds": cash, "buyingPower": cash * 2}}
+        if positions:
+            account["positions"] = self._positions[account_hash]
+        return {"securitiesAccount": account,
+                "aggregatedBalance": {"currentLiquidationValue": cash + market_value, "liquidationValue": cash + market_value}}
+
+    def _order_template(self, symbol: str) -> dict:
+        order_type = self._rng.choice(("MARKET", "LIMIT"))
+        order = {"orderType": order_type, "session": "NORMAL", "duration": "DAY", "orderStrategyType": "SINGLE",
+                 "orderLegCollection": [{"instruction": self._rng.choice(("BUY", "SELL")), "quantity": self._rng.randint(1, 100),
+                                         "instrument": {"symbol": symbol, "assetType": "EQUITY"}}]}
+        if order_type == "LIMIT":
+            order["price"] = str(round(self._price(symbol) * 0.98, 2))
+        return order
+
+    def _next_order_id(self) -> int:
+        self._order_id += 1
+        return self._order_id
+
+    def _make_order(self, account_number: str, order: dict, status: str, entered: datetime.datetime | None = None) -> dict:
+        entered = entered or datetime.datetime.now(datetime.timezone.utc)
+        quantity = sum(float(leg.get("quantity", 0)) for leg in order.get("orderLegCollection", []))
+        filled = quantity if status == "FILLED" else 0.0
+        made = {"session": "NORMAL", "duration": "DAY", "orderType": "MARKET", "complexOrderStrategyType": "NONE",
+                "requestedDestination": "AUTO", "destinationLinkName": "AutoRoute", "orderStrategyType": "SINGLE"} | order
+        made |= {"quantity": quantity, "filledQuantity": filled, "remainingQuantity": quantity - filled,
+                 "orderId": self._next_order_id(), "cancelable": status in ("WORKING", "QUEUED", "PENDING_ACTIVATION"),
+                 "editable": status in ("WORKING", "QUEUED", "PENDING_ACTIVATION"), "status": status,
+                 "enteredTime": entered.strftime(_TIME_FORMAT), "tag": "API_SCHWABDEV", "accountNumber": int(account_number)}
+        legs = []
+        for leg_id, leg in enumerate(order.get("orderLegCollection", []), 1):
+            instrument = leg.get("instrument", {})
+            symbol = instrument.get("symbol", "")
+            legs.append({"orderLegType": instrument.get("assetType", "EQUITY"), "legId": leg_id,
+                         "instrument": {"assetType": instrument.get("assetType", "EQUITY"), "cusip": self._cusip(symbol),
+                                        "symbol": symbol, "instrumentId": zlib.crc32(symbol.encode())},
+                         "instruction": leg.get("instruction"), "positionEffect": "OPENING",
+                         "quantity": float(leg.get("quantity", 0))})
+        made["orderLegCollection"] = legs
+        if status in ("FILLED", "CANCELED"):
+            made["closeTime"] = made["enteredTime"]
+        if status == "FILLED":
+            price = float(order.get("price") or self._price(legs[0]["instrument"]["symbol"] if legs else ""))
+            made["orderActivityCollection"] = [{"activityType": "EXECUTION", "executionType": "FILL", "quantity": quantity,
+                                                "orderRemainingQuantity": 0.0,
+                                                "executionLegs": [{"legId": 1, "quantity": quantity, "mismarkedQuantity": 0.0,
+                                                                   "price": price, "time": made["enteredTime"]}]}]
+        return made
+
+    def _make_transaction(self, account_number: str, symbol: str, when: datetime.datetime) -> dict:
+        price = self._price(symbol)
+        quantity = self._rng.randint(1, 100)
+        amount = round(-quantity * price, 2)
+        return {"activityId": self._rng.randint(10**10, 10**11), "time": when.strftime(_TIME_FORMAT),
+                "accountNumber": account_number, "type": "TRADE", "status": "VALID", "subAccount": "MARGIN",
+                "tradeDate": when.strftime(_TIME_FORMAT), "settlementDate": (when + datetime.timedelta(days=1)).strftime(_TIME_FORMAT),
+                "positionId": self._rng.randint(10**9, 10**10), "orderId": self._rng.randint(10**9, 10**10),
+                "netAmount": amount, "activityType": "EXECUTION", "description": "BUY TRADE",
+                "transferItems": [{"instrument": {"assetType": "CURRENCY", "status": "ACTIVE", "symbol": "CURRENCY_USD",
+                                                  "description": "USD currency", "instrumentId": 1, "closingPrice": 0.0},
+                                   "amount": 0.0, "cost": 0.0, "feeType": "COMMISSION"},
+                                  {"instrument": {"assetType": "EQUITY", "status": "ACTIVE", "symbol": symbol,
+                                                  "cusip": self._cusip(symbol), "instrumentId": zlib.crc32(symbol.encode()),
+                                                  "closingPrice": price},
+                                   "amount": float(quantity), "cost": amount, "price": price, "positionEffect": "OPENING"}]}
+
+    @staticmethod
+    def _expirations(count: int = 8) -> list[datetime.date]:
+        """
+        Upcoming Friday expirations.
+        """
+        today = datetime.date.today()
+        friday = today + datetime.timedelta(days=(4 - today.weekday()) % 7)
+        return [friday + datetime.timedelta(weeks=i) for i in range(count)]
+
+    @staticmethod
+    def _option_symbol(symbol: str, expiration: datetime.date, put_call: str, strike: float) -> str:
+        return f"{symbol:<6}{expiration:%y%m%d}{put_call[0]}{int(round(strike * 1000)):08d}"
+
+    def _make_contract(self, symbol: str, price: float, expiration: datetime.date, put_call: str, strike: float, rate: float) -> dict:
+        days = max((expiration - datetime.date.today()).days, 0)
+        t = max(days, 0.5) / 365
+        sigma = 0.3 + 0.1 * abs(math.log(strike / price))
+        d1 = (math.log(price / strike) + (rate + sigma * sigma / 2) * t) / (sigma * math.sqrt(t))
+        d2 = d1 - sigma * math.sqrt(t)
+        cdf = lambda x: 0.5 * (1 + math.erf(x / math.sqrt(2)))
+        pdf = math.exp(-d1 * d1 / 2) / math.sqrt(2 * math.pi)
+        discount = math.exp(-rate * t)
+        if put_call == "CALL":
+            value, delta = price * cdf(d1) - strike * discount * cdf(d2), cdf(d1)
+            intrinsic = max(price - strike, 0.0)
+        else:
+            value, delta = strike * discount * cdf(-d2) - price * cdf(-d1), cdf(d1) - 1
+            intrinsic = max(strike - price, 0.0)
+        value = max(round(value, 2), 0.01)
+        spread = max(0.01, round(value * 0.02, 2))
+        now = _now_ms()
+        expires = datetime.datetime.combine(expiration, datetime.time(20, 0), datetime.timezone.utc)
+        option_symbol = self._option_symbol(symbol, expiration, put_call, strike)
+        return {"putCall": put_call, "symbol": option_symbol,
+                "description": f"{symbol} {expiration:%m/%d/%Y} {strike:g} {put_call[0]}", "exchangeName": "OPR",
+                "bid": round(value - spread / 2, 2), "ask": round(value + spread / 2, 2), "last": value, "mark": value,
+                "bidSize": self._rng.randint(1, 200), "askSize": self._rng.randint(1, 200), "bidAskSize": "10X10",
+                "lastSize": self._rng.randint(0, 20), "highPrice": value, "lowPrice": value, "openPrice": 0.0,
+                "closePrice": value, "totalVolume": self._rng.randint(0, 10**4), "tradeTimeInLong": now,
+                "quoteTimeInLong": now, "netChange": 0.0, "volatility": round(sigma * 100, 3), "delta": round(delta, 3),
+                "gamma": round(pdf / (price * sigma * math.sqrt(t)), 3),
+                "theta": round(-price * pdf * sigma / (2 * math.sqrt(t)) / 365, 3),
+                "vega": round(price * pdf * math.sqrt(t) / 100, 3), "rho": round(strike * t * discount * cdf(d2) / 100, 3),
+                "timeValue": round(value - intrinsic, 2), "openInterest": self._rng.randint(0, 10**5),
+                "isInTheMoney": intrinsic > 0, "theoreticalOptionValue": value, "theoreticalVolatility": 29.0,
+                "isMini": False, "isNonStandard": False, "optionDeliverablesList": [
+                    {"symbol": symbol, "assetType": "STOCK", "deliverableUnits": 100.0}],
+                "strikePrice": strike, "expirationDate": expires.strftime("%Y-%m-%dT%H:%M:%S.000+00:00"),
+                "daysToExpiration": days, "expirationType": "W", "lastTradingDay": int(expires.timestamp() * 1000),
+                "multiplier": 100.0, "settlementType": "P", "deliverableNote": "100 " + symbol,
+                "percentChange": 0.0, "markChange": 0.0, "markPercentChange": 0.0, "intrinsicValue": intrinsic,
+                "extrinsicValue": round(value - intrinsic, 2), "optionRoot": symbol, "exerciseType": "A",
+                "high52Week": value * 2, "low52Week": value / 2, "isPennyPilot": True}
+
+    def _make_chain(self, params) -> tuple[int, dict]:
+        symbol = params.get("symbol", "").upper()
+        if not symbol:
+            return 400, self._error(400, "Missing symbol")
+        price = self._price(symbol)
+        rate = float(params.get("interestRate", 4.5))
+        contract_type = params.get("contractType", "ALL").upper()
+        strike_range = params.get("range", "ALL").upper()
+        step = 1.0 if price < 100 else 2.5 if price < 250 else 5.0
+        atm = round(price / step) * step
+        strikes = [atm + step * i for i in range(-20, 21) if atm + step * i > 0]
+        if "strikeCount" in params:
+            count = int(params["strikeCount"])
+            strikes = sorted(sorted(strikes, key=lambda s: abs(s - price))[:count])
+        if "strike" in params:
+            strikes = [s for s in strikes if s == float(params["strike"])]
+        from_date = datetime.date.fromisoformat(params["fromDate"]) if "fromDate" in params else None
+        to_date = datetime.date.fromisoformat(params["toDate"]) if "toDate" in params else None
+        expirations = [e for e in self._expirations() if (from_date is None or e >= from_date) and (to_date is None or e <= to_date)]
+
+        chain = {"symbol": symbol, "status": "SUCCESS", "strategy": params.get("strategy", "SINGLE"), "interval": 0.0,
+                 "isDelayed": False, "isIndex": symbol.startswith("$"), "interestRate": rate, "underlyingPrice": price,
+                 "volatility": 29.0, "daysToExpiration": 0.0, "dividendYield": 0.0, "numberOfContracts": 0,
+                 "assetMainType": "INDEX" if symbol.startswith("$") else "EQUITY", "assetSubType": "COE",
+                 "isChainTruncated": False, "callExpDateMap": {}, "putExpDateMap": {}}
+        if params.get("includeUnderlyingQuote", "").lower() == "true":
+            quote = self._make_quote(symbol)["quote"]
+            chain["underlying"] = {"symbol": symbol, "description": f"{symbol} INC", "change": quote["netChange"],
+                                   "percentChange": quote["netPercentChange"], "close": quote["closePrice"],
+                                   "quoteTime": quote["quoteTime"], "tradeTime": quote["tradeTime"],
+                                   "bid": quote["bidPrice"], "ask": quote["askPrice"], "last": price, "mark": price,
+                                   "markChange": quote["markChange"], "markPercentChange": quote["markPercentChange"],
+                                   "bidSize": quote["bidSize"], "askSize": quote["askSize"], "highPrice": quote["highPrice"],
+                                   "lowPrice": quote["lowPrice"], "openPrice": quote["openPrice"],
+                                   "totalVolume": quote["totalVolume"], "exchangeName": "NASDAQ",
+                                   "fiftyTwoWeekHigh": quote["52WeekHigh"], "fiftyTwoWeekLow": quote["52WeekLow"], "delayed": False}
+        for put_call, key in (("CALL", "callExpDateMap"), ("PUT", "putExpDateMap")):
+            if contract_type not in ("ALL", put_call):
+                continue
+            for expiration in expirations:
+                days = (expiration - datetime.date.today()).days
+                by_strike = {}
+                for strike in strikes:
+                    itm = strike < price if put_call == "CALL" else strike > price
+                    near = abs(strike - price) <= 2 * step
+                    if (strike_range == "ITM" and not itm) or (strike_range == "OTM" and itm) or \
+                       (strike_range == "NTM" and not near) or (strike_range in ("ITM", "OTM") and near):
+                        continue
+                    by_strike[f"{strike:.1f}"] = [self._make_contract(symbol, price, expiration, put_call, strike, rate / 100)]
+                if by_strike:
+                    chain[key][f"{expiration.isoformat()}:{days}"] = by_strike
+                    chain["numberOfContracts"] += len(by_strike)
+        if self.max_chain_contracts is not None and chain["numberOfContracts"] > self.max_chain_contracts:
+            return 502, {"fault": {"faultstring": "Body buffer overflow", "detail": {"errorcode": "protocol.http.TooBigBody"}}}
+        return 200, chain
+
+    def _make_candles(self, params) -> dict:
+        symbol = params.get("symbol", "").upper()
+        period_type = params.get("periodType", "day")
+        frequency_type = params.get("frequencyType", "minute" if period_type == "day" else "daily")
+        frequency = int(params.get("frequency", 1))
+        period = int(params.get("period", {"day": 10, "month": 1, "year": 1, "ytd": 1}.get(period_type, 1)))
+        end = datetime.datetime.fromtimestamp(int(params["endDate"]) / 1000, _NY) if "endDate" in params else datetime.datetime.now(_NY)
+        if "startDate" in params:
+            start = datetime.datetime.fromtimestamp(int(params["startDate"]) / 1000, _NY)
+        elif period_type == "ytd":
+            start = end.replace(month=1, day=1, hour=0, minute=0)
+        else:
+            start = end - datetime.timedelta(days=period * {"day": 1, "month": 30, "year": 365}.get(period_type, 1))
+        step = {"minute": datetime.timedelta(minutes=frequency), "daily": datetime.timedelta(days=1),
+                "weekly": datetime.timedelta(weeks=1), "monthly": datetime.timedelta(days=30)}.get(frequency_type, datetime.timedelta(days=1))
+        extended = params.get("needExtendedHoursData", "false").lower() == "true"
+
+        rng = random.Random(f"{symbol}{start.date()}")
+        price = self._price(symbol) * 0.9
+        candles = []
+        t = start.replace(second=0, microsecond=0)
+        if frequency_type != "minute":
+            t = t.replace(hour=0, minute=0)
+        while t <= end:
+            if t.weekday() < 5:
+                minutes = t.hour * 60 + t.minute
+                if frequency_type != "minute" or (570 <= minutes < 960) or (extended and 420 <= minutes < 1200):
+                    open_ = price
+                    price = max(0.01, price * (1 + rng.gauss(0, 0.001 if frequency_type == "minute" else 0.015)))
+                    candles.append({"open": round(open_, 2), "high": round(max(open_, price) * (1 + rng.random() * 0.001), 2),
+                                    "low": round(min(open_, price) * (1 - rng.random() * 0.001), 2), "close": round(price, 2),
+                                    "volume": rng.randint(10**3, 10**6), "datetime": int(t.timestamp() * 1000)})
+            t += step
+        result = {"candles": candles, "symbol": symbol, "empty": not candles}
+        if params.get("needPreviousClose", "false").lower() == "true":
+            result |= {"previousClose": round(self._price(symbol) * 0.99, 2),
+                       "previousCloseDate": int((start - datetime.timedelta(days=1)).timestamp() * 1000)}
+        return result
+
+    @staticmethod
+    def _make_hours(market: str, date: datetime.date) -> dict:
+        products = {"equity": ("EQ",), "option": ("EQO", "IND"), "bond": ("BON",), "future": ("F",), "forex": ("FX",)}
+        result = {}
+        for product in products.get(market, ()):
+            hours = {"date": date.isoformat(), "marketType": market.upper(), "product": product,
+                     "productName": market, "isOpen": date.weekday() < 5}
+            if hours["isOpen"]:
+                session = lambda a, b: [{"start": datetime.datetime.combine(date, a, _NY).isoformat(),
+                                         "end": datetime.datetime.combine(date, b, _NY).isoformat()}]
+                hours["sessionHours"] = {"preMarket": session(datetime.time(7), datetime.time(9, 30)),
+                                         "regularMarket": session(datetime.time(9, 30), datetime.time(16)),
+                                         "postMarket": session(datetime.time(16), datetime.time(20))}
+            result[product] = hours
+        return {market: result}
+
+    def _make_instrument(self, symbol: str, projection: str = "symbol-search") -> dict:
+        instrument = {"cusip": self._cusip(symbol), "symbol": symbol, "description": f"{symbol} INC",
+                      "exchange": "NASDAQ", "assetType": "EQUITY"}
+        if projection == "fundamental":
+            instrument["fundamental"] = self._make_quote(symbol)["fundamental"] | {"symbol": symbol, "high52": self._price(symbol) * 1.3,
+                                                                                   "low52": self._price(symbol) * 0.7}
+        return instrument
+
+    """
+    REST
+    """
+
+    @staticmethod
+    def _error(status: int, detail: str) -> dict:
+        titles = {400: "Bad Request", 401: "Unauthorized", 404: "Not Found"}
+        return {"errors": [{"id": secrets.token_hex(8), "status": str(status), "title": titles.get(status, "Error"), "detail": detail}]}
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.stats["requests"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if request.path.startswith(("/trader/", "/marketdata/")):
+            auth = request.headers.get("Authorization", "")
+            if not (auth.startswith("Bearer ") and auth[7:] in self._access_tokens):
+                return web.json_response(self._error(401, "Client not authorized"), status=401)
+        return await handler(request)
+
+    def _routes(self) -> list[tuple[str, str, callable]]:
+        return [("GET", "/trader/v1/accounts/accountNumbers", self._account_numbers),
+                ("GET", "/trader/v1/accounts/", self._accounts_all),
+                ("GET", "/trader/v1/accounts", self._accounts_all),
+                ("GET", "/trader/v1/accounts/{hash}", self._account),
+                ("GET", "/trader/v1/accounts/{hash}/orders", self._account_orders),
+                ("POST", "/trader/v1/accounts/{hash}/orders", self._place_order),
+                ("GET", "/trader/v1/accounts/{hash}/orders/{id}", self._order),
+                ("DELETE", "/trader/v1/accounts/{hash}/orders/{id}", self._cancel_order),
+                ("PUT", "/trader/v1/accounts/{hash}/orders/{id}", self._replace_order),
+                ("POST", "/trader/v1/accounts/{hash}/previewOrder", self._preview_order),
+                ("GET", "/trader/v1/orders", self._orders_all),
+                ("GET", "/trader/v1/accounts/{hash}/transactions", self._account_transactions),
+                ("GET", "/trader/v1/accounts/{hash}/transactions/{id}", self._transaction),
+                ("GET", "/trader/v1/userPreference", self._preferences),
+                ("GET", "/marketdata/v1/quotes", self._quotes),
+                ("GET", "/marketdata/v1/chains", self._chains),
+                ("GET", "/marketdata/v1/expirationchain", self._expiration_chain),
+                ("GET", "/marketdata/v1/pricehistory", self._price_history),
+                ("GET", "/marketdata/v1/movers/{symbol}", self._movers),
+                ("GET", "/marketdata/v1/markets", self._markets),
+                ("GET", "/marketdata/v1/markets/{market}", self._market),
+                ("GET", "/marketdata/v1/instruments", self._instruments),
+                ("GET", "/marketdata/v1/instruments/{cusip}", self._instrument_cusip),
+                ("GET", "/marketdata/v1/{symbol}/quotes", self._quote)]
+
+    async def _oauth_authorize(self, request: web.Request):
+        redirect = request.query.get("redirect_uri", "https://127.0.0.1")
+        raise web.HTTPFound(self.call_on_auth(f"?redirect_uri={urllib.parse.quote(redirect)}"))
+
+    async def _oauth_token(self, request: web.Request):
+        if not request.headers.get("Authorization", "").startswith("Basic "):
+            return web.json_response({"error": "invalid_client"}, status=401)
+        form = await request.post()
+        grant = form.get("grant_type")
+        if grant == "authorization_code":
+            code = urllib.parse.unquote(form.get("code", "")).rstrip("@")
+            if code not in self._codes:
+                return web.json_response({"error": "invalid_grant", "error_description": "Bad authorization code"}, status=400)
+            self._codes.discard(code)
+            refresh_token = secrets.token_urlsafe(32)
+            self._refresh_tokens.add(refresh_token)
+        elif grant == "refresh_token":
+            refresh_token = form.get("refresh_token")
+            if refresh_token not in self._refresh_tokens:
+                return web.json_response({"error": "invalid_grant", "error_description": "Bad refresh token"}, status=400)
+        else:
+            return web.json_response({"error": "unsupported_grant_type"}, status=400)
+        access_token = secrets.token_urlsafe(32)
+        self._access_tokens.add(access_token)
+        self.stats["tokens"] += 1
+        return web.json_response({"expires_in": 1800, "token_type": "Bearer", "scope": "api", "refresh_token": refresh_token,
+                                  "access_token": access_token, "id_token": secrets.token_urlsafe(32)})
+
+    def _account_hash(self, request: web.Request) -> str:
+        account_hash = request.match_info["hash"]
+        if account_hash not in self._accounts:
+            raise web.HTTPBadRequest(text=json.dumps(self._error(400, "Invalid account hash")), content_type="application/json")
+        return account_hash
+
+    async def _account_numbers(self, request: web.Request):
+        return web.json_response([{"accountNumber": number, "hashValue": account_hash} for account_hash, number in self._accounts.items()])
+
+    async def _accounts_all(self, request: web.Request):
+        positions = "positions" in request.query.get("fields", "")
+        return web.json_response([self._make_account(account_hash, positions) for account_hash in self._accounts])
+
+    async def _account(self, request: web.Request):
+        return web.json_response(self._make_account(self._account_hash(request), "positions" in request.query.get("fields", "")))
+
+    @staticmethod
+    def _filter_orders(orders, query) -> list[dict]:
+        start, end = query.get("fromEnteredTime"), query.get("toEnteredTime")
+        parse = lambda s: datetime.datetime.fromisoformat(s.replace("Z", "+00:00"))
+        result = []
+        for order in orders:
+            entered = datetime.datetime.strptime(order["enteredTime"], _TIME_FORMAT).replace(tzinfo=datetime.timezone.utc)
+            if start and entered < parse(start) or end and entered > parse(end):
+                continue
+            if "status" in query and order["status"] != query["status"]:
+                continue
+            result.append(order)
+        result.sort(key=lambda order: order["enteredTime"], reverse=True)
+        return result[:int(query.get("maxResults", 3000))]
+
+    async def _account_orders(self, request: web.Request):
+        account_hash = self._account_hash(request)
+        return web.json_response(self._filter_orders(self._orders[account_hash].values(), request.query))
+
+    async def _orders_all(self, request: web.Request):
+        orders = [order for orders in self._orders.values() for order in orders.values()]
+        return web.json_response(self._filter_orders(orders, request.query))
+
+    def _find_order(self, request: web.Request) -> tuple[str, dict]:
+        account_hash = self._account_hash(request)
+        order = self._orders[account_hash].get(int(request.match_info["id"]))
+        if order is None:
+            raise web.HTTPNotFound(text=json.dumps(self._error(404, "Order not found")), content_type="application/json")
+        return account_hash, order
+
+    async def _place_order(self, request: web.Request):
+        account_hash = self._account_hash(request)
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            return web.json_response(self._error(400, "Invalid order"), status=400)
+        if not body.get("orderLegCollection"):
+            return web.json_response(self._error(400, "Order must have legs"), status=400)
+        order = self._make_order(self._accounts[account_hash], body, "FILLED" if body.get("orderType") == "MARKET" else "WORKING")
+        self._orders[account_hash][order["orderId"]] = order
+        await self._account_activity(account_hash, order, ("OrderCreated", "OrderAccepted") +
+                                     (("ExecutionCreated",) if order["status"] == "FILLED" else ()))
+        return web.Response(status=201, headers={"Location": f"{self.url}/trader/v1/accounts/{account_hash}/orders/{order['orderId']}"})
+
+    async def _order(self, request: web.Request):
+        return web.json_response(self._find_order(request)[1])
+
+    async def _cancel_order(self, request: web.Request):
+        account_hash, order = self._find_order(request)
+        if not order["cancelable"]:
+            return web.json_response(self._error(400, "Order cannot be canceled"), status=400)
+        order.update(status="CANCELED", cancelable=False, editable=False, closeTime=datetime.datetime.now(datetime.timezone.utc).strftime(_TIME_FORMAT))
+        await self._account_activity(account_hash, order, ("CancelAccepted", "OrderUROutCompleted"))
+        return web.Response(status=200)
+
+    async def _replace_order(self, request: web.Request):
+        account_hash, old = self._find_order(request)
+        if not old["editable"]:
+            return web.json_response(self._error(400, "Order cannot be replaced"), status=400)
+        body = await request.json()
+        order = self._make_order(self._accounts[account_hash], body, "FILLED" if body.get("orderType") == "MARKET" else "WORKING")
+        old.update(status="REPLACED", cancelable=False, editable=False, replacingOrderCollection=[order])
+        self._orders[account_hash][order["orderId"]] = order
+        await self._account_activity(account_hash, order, ("ChangeCreated", "ChangeAccepted"))
+        return web.Response(status=201, headers={"Location": f"{self.url}/trader/v1/accounts/{account_hash}/orders/{order['orderId']}"})
+
+    async def _preview_order(self, request: web.Request):
+        self._account_hash(request)
+        body = await request.json()
+        return web.json_response({"orderId": 0, "orderStrategy": body | {"status": "AWAITING_MANUAL_REVIEW"},
+                                  "orderValidationResult": {"alerts": [], "accepts": [], "rejects": [], "reviews": [], "warns": []},
+                                  "commissionAndFee": {"commission": {"commissionLegs": []}, "fee": {"feeLegs": []}}})
+
+    async def _account_transactions(self, request: web.Request):
+        account_hash = self._account_hash(request)
+        types = set(request.query.get("types", "TRADE").split(","))
+        symbol = request.query.get("symbol")
+        result = [t for t in self._transactions[account_hash]
+                  if t["type"] in types and (symbol is None or any(i["instrument"].get("symbol") == symbol for i in t["transferItems"]))]
+        return web.json_response(result)
+
+    async def _transaction(self, request: web.Request):
+        account_hash = self._account_hash(request)
+        for transaction in self._transactions[account_hash]:
+            if str(transaction["activityId"]) == request.match_info["id"]:
+                return web.json_response([transaction])
+        return web.json_response(self._error(404, "Transaction not found"), status=404)
+
+    async def _preferences(self, request: web.Request):
+        return web.json_response({
+            "accounts": [{"accountNumber": number, "primaryAccount": i == 0, "type": "BROKERAGE", "nickName": "Individual",
+                          "displayAcctId": f"...{number[-3:]}", "autoPositionEffect": False, "accountColor": "Green"}
+                         for i, number in enumerate(self._accounts.values())],
+            "streamerInfo": [{"streamerSocketUrl": self.streamer_url, "schwabClientCustomerId": "simulator-customer",
+                              "schwabClientCorrelId": secrets.token_hex(16), "schwabClientChannel": "N9",
+                              "schwabClientFunctionId": "APIAPP"}],
+            "offers": [{"level2Permissions": True, "mktDataPermission": "NP"}]})
+
+    async def _quotes(self, request: web.Request):
+        symbols = [s.strip().upper() for s in request.query.get("symbols", "").split(",") if s.strip()]
+        fields = request.query.get("fields", "").split(",") if "fields" in request.query else None
+        return web.json_response({symbol: self._make_quote(symbol, fields) for symbol in symbols})
+
+    async def _quote(self, request: web.Request):
+        symbol = urllib.parse.unquote(request.match_info["symbol"]).upper()
+        fields = request.query.get("fields", "").split(",") if "fields" in request.query else None
+        return web.json_response({symbol: self._make_quote(symbol, fields)})
+
+    async def _chains(self, request: web.Request):
+        status, body = self._make_chain(request.query)
+        return web.json_response(body, status=status)
+
+    async def _expiration_chain(self, request: web.Request):
+        symbol = request.query.get("symbol", "").upper()
+        return web.json_response({"expirationList": [
+            {"expirationDate": e.isoformat(), "daysToExpiration": (e - datetime.date.today()).days, "expirationType": "W",
+             "settlementType": "P", "optionRoots": symbol, "standard": True} for e in self._expirations()]})
+
+    async def _price_history(self, request: web.Request):
+        if not request.query.get("symbol"):
+            return web.json_response(self._error(400, "Missing symbol"), status=400)
+        return web.json_response(self._make_candles(request.query))
+
+    async def _movers(self, request: web.Request):
+        movers = []
+        for i in range(10):
+            symbol = self._symbol(i)
+            price = self._price(symbol)
+            change = round(price * self._rng.uniform(-0.05, 0.05), 2)
+            movers.append({"description": f"{symbol} INC", "volume": self._rng.randint(10**6, 10**8), "lastPrice": price,
+                           "netChange": change, "marketShare": round(self._rng.uniform(0, 5), 2),
+                           "totalVolume": 10**9, "trades": self._rng.randint(10**3, 10**6),
+                           "netPercentChange": round(change / price, 4), "symbol": symbol})
+        return web.json_response({"screeners": movers})
+
+    @staticmethod
+    def _date(request: web.Request) -> datetime.date:
+        return datetime.date.fromisoformat(request.query["date"]) if "date" in request.query else datetime.datetime.now(_NY).date()
+
+    async def _markets(self, request: web.Request):
+        result = {}
+        for market in request.query.get("markets", "").split(","):
+            result |= self._make_hours(market.strip(), self._date(request))
+        return web.json_response(result)
+
+    async def _market(self, request: web.Request):
+        return web.json_response(self._make_hours(request.match_info["market"], self._date(request)))
+
+    async def _instruments(self, request: web.Request):
+        symbols = [s.strip().upper() for s in request.query.get("symbol", "").split(",") if s.strip()]
+        return web.json_response({"instruments": [self._make_instrument(s, request.query.get("projection", "symbol-search")) for s in symbols]})
+
+    async def _instrument_cusip(self, request: web.Request):
+        cusip = request.match_info["cusip"]
+        return web.json_response({"instruments": [{"cusip": cusip, "symbol": f"CUSIP{cusip[-4:]}", "description": "SIMULATED INSTRUMENT",
+                                                   "exchange": "NASDAQ", "assetType": "EQUITY"}]})
+
+    """
+    Streamer
+    """
+
+    async def _websocket(self, request: web.Request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        session = _StreamSession(ws)
+        self._sessions.add(session)
+        try:
+            async for message in ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    await self._on_requests(session, message.data)
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    break
+        finally:
+            if session.task is not None:
+                session.task.cancel()
+            self._sessions.discard(session)
+        return ws
+
+    async def _send(self, session: _StreamSession, message: dict):
+        if not session.ws.closed:
+            await session.ws.send_str(json.dumps(message))
+            self.stats["frames"] += 1
+
+    async def _on_requests(self, session: _StreamSession, text: str):
+        try:
+            message = json.loads(text)
+        except json.JSONDecodeError:
+            return
+        requests = message.get("requests", message) if isinstance(message, dict) else message
+        if isinstance(requests, dict):
+            requests = [requests]
+        responses = []
+        logout = False
+        for request in requests:
+            service, command = request.get("service", ""), request.get("command", "")
+            parameters = request.get("parameters", {})
+            code, msg = 0, f"{command} command succeeded"
+            if service == "ADMIN" and command == "LOGIN":
+                if parameters.get("Authorization") in self._access_tokens:
+                    session.logged_in = True
+                    self.stats["logins"] += 1
+                    msg = "server=simulator;status=PN"
+                    if session.task is None:
+                        session.task = asyncio.create_task(self._emit(session))
+                else:
+                    code, msg = 3, "Login denied"
+            elif service == "ADMIN" and command == "LOGOUT":
+                logout = True
+            elif not session.logged_in:
+                code, msg = 20, "Not logged in"
+            else:
+                self._subscribe(session, service, command, parameters)
+                session.changed.set()
+            responses.append({"service": service, "command": command, "requestid": str(request.get("requestid", "")),
+                              "SchwabClientCorrelId": request.get("SchwabClientCorrelId"), "timestamp": _now_ms(),
+                              "content": {"code": code, "msg": msg}})
+        await self._send(session, {"response": responses})
+        if logout or (responses and responses[0]["content"]["code"] == 3):
+            await session.ws.close()
+
+    @staticmethod
+    def _subscribe(session: _StreamSession, service: str, command: str, parameters: dict):
+        keys = [k for k in str(parameters.get("keys", "")).split(",") if k]
+        fields = [f for f in str(parameters.get("fields", "")).split(",") if f]
+        subs = session.subscriptions.setdefault(service, {})
+        if command == "SUBS":
+            subs.clear()
+        if command in ("SUBS", "ADD"):
+            for key in keys:
+                subs[key] = sorted(set(fields) | set(subs.get(key, ())), key=lambda f: (len(f), f)) if command == "ADD" else fields
+                session.snapshot.add((service, key))
+        elif command == "UNSUBS":
+            for key in keys:
+                subs.pop(key, None)
+                session.bars.pop((service, key), None)
+        elif command == "VIEW":
+            for key in subs:
+                subs[key] = fields
+                session.snapshot.add((service, key))
+
+    async def _emit(self, session: _StreamSession):
+        """
+        Send data for the session's subscriptions at the configured rates.
+        """
+        due = {}
+        next_heartbeat = time.monotonic() + self.heartbeat
+        try:
+            while not session.ws.closed:
+                now = time.monotonic()
+                wait = next_heartbeat - now
+                for service, subs in list(session.subscriptions.items()):
+                    rate = self.rates.get(service, 0)
+                    if not subs or not rate:
+                        continue
+                    next_due = due.setdefault(service, now)
+                    sent = 0
+                    while next_due <= now and sent < 1000:
+                        await self._send(session, {"data": [self._data(session, service, subs)]})
+                        next_due += 1 / rate
+                        sent += 1
+                    if next_due < now - 1:  # fell behind, don't try to catch up more than a second
+                        next_due = now
+                    due[service] = next_due
+                    wait = min(wait, next_due - now)
+                if now >= next_heartbeat:
+                    await self._send(session, {"notify": [{"heartbeat": str(_now_ms())}]})
+                    next_heartbeat = now + self.heartbeat
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(session.changed.wait(), wait)
+                    except TimeoutError:
+                        pass
+                    session.changed.clear()
+                else:
+                    await asyncio.sleep(0)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+
+    def _data(self, session: _StreamSession, service: str, subs: dict) -> dict:
+        content = []
+        for key, fields in subs.items():
+            snapshot = (service, key) in session.snapshot
+            if service in _LEVEL_ONE:
+                item = self._level_one(service, key, fields, snapshot)
+            elif service.endswith("_BOOK"):
+                item = self._book(key, fields)
+            elif service.startswith("CHART_"):
+                item = self._chart(session, service, key, fields)
+            elif service.startswith("SCREENER_"):
+                item = self._screener(key, fields)
+            else:
+                continue
+            session.snapshot.discard((service, key))
+            content.append(item)
+        return {"service": service, "timestamp": _now_ms(), "command": "SUBS", "content": content}
+
+    def _level_one(self, service: str, key: str, fields: list[str], snapshot: bool) -> dict:
+        price = self._price(key, move=True)
+        now = _now_ms()
+        rng = self._rng
+        item = {"key": key}
+        spec = _LEVEL_ONE[service]
+        for field in fields:
+            name, kind = spec.get(field, (None, None))
+            if kind is None or (not snapshot and kind not in _DYNAMIC):
+                continue
+            if kind == "price":
+                lowered = name.lower()
+                item[field] = round(price - 0.01, 2) if "bid" in lowered else round(price + 0.01, 2) if "ask" in lowered else price
+            elif kind == "change":
+                item[field] = round(rng.uniform(-2, 2), 4)
+            elif kind == "greek":
+                item[field] = round(rng.uniform(-1, 1), 4)
+            elif kind == "size":
+                item[field] = rng.randint(1, 10**4)
+            elif kind == "time":
+                item[field] = now
+            elif kind == "int":
+                item[field] = 100 if "multiplier" in name.lower() else rng.randint(1, 30)
+            elif kind == "bool":
+                item[field] = rng.random() < 0.5
+            else:
+                item[field] = "Q" if "id" in name.lower().split() else f"{key} {name}"
+        return item
+
+    def _book(self, key: str, fields: list[str]) -> dict:
+        price = self._price(key, move=True)
+        now = _now_ms()
+        rng = self._rng
+
+        def levels(sign: int) -> list:
+            return [{"0": round(price + sign * 0.01 * (i + 1), 2), "1": rng.randint(100, 5000), "2": 2,
+                     "3": [{"0": "NSDQ", "1": rng.randint(100, 2500), "2": now}, {"0": "ARCX", "1": rng.randint(100, 2500), "2": now}]}
+                    for i in range(10)]
+
+        item = {"key": key, "1": now, "2": levels(-1), "3": levels(1)}
+        return {k: v for k, v in item.items() if k == "key" or k in fields} if fields else item
+
+    def _chart(self, session: _StreamSession, service: str, key: str, fields: list[str]) -> dict:
+        price = self._price(key, move=True)
+        minute = int(time.time() // 60) * 60000
+        bar = session.bars.get((service, key))
+        if bar is None or bar[0] != minute:
+            bar = session.bars[(service, key)] = [minute, price, price, price, price, 0]
+        bar[2], bar[3], bar[4] = max(bar[2], price), min(bar[3], price), price
+        bar[5] += self._rng.randint(1, 1000)
+        seq = session.next_seq(service, key)
+        if service == "CHART_EQUITY":
+            item = {"seq": seq, "key": key, "1": seq, "2": bar[1], "3": bar[2], "4": bar[3], "5": bar[4],
+                    "6": float(bar[5]), "7": minute, "8": int(minute // 86400000)}
+        else:
+            item = {"seq": seq, "key": key, "1": minute, "2": bar[1], "3": bar[2], "4": bar[3], "5": bar[4], "6": float(bar[5])}
+        return {k: v for k, v in item.items() if k in ("seq", "key") or k in fields} if fields else item
+
+    def _screener(self, key: str, fields: list[str]) -> dict:
+        items = []
+        for i in range(10):
+            symbol = self._symbol(i)
+            items.append({"description": f"{symbol} INC", "lastPrice": self._price(symbol), "marketShare": 1.0,
+                          "netChange": 0.5, "netPercentChange": 0.01, "symbol": symbol, "totalVolume": 10**8,
+                          "trades": 10**4, "volume": 10**6})
+        item = {"key": key, "1": _now_ms(), "2": key.split("_")[-1], "3": 0, "4": items}
+        return {k: v for k, v in item.items() if k == "key" or k in fields} if fields else item
+
+    async def _account_activity(self, account_hash: str, order: dict, message_types: tuple[str, ...]):
+        """
+        Send ACCT_ACTIVITY messages for an order change to subscribed sessions.
+        """
+        for session in list(self._sessions):
+            if not session.subscriptions.get("ACCT_ACTIVITY"):
+                continue
+            content = []
+            key = next(iter(session.subscriptions["ACCT_ACTIVITY"]))
+            for message_type in message_types:
+                content.append({"seq": session.next_seq("ACCT_ACTIVITY", key), "key": key,
+                                "1": self._accounts[account_hash], "2": message_type,
+                                "3": json.dumps({"SchwabOrderID": str(order["orderId"]), "AccountNumber": self._accounts[account_hash],
+                                                 "BaseEvent": {"EventType": message_type, "Order": order}})})
+            await self._send(session, {"data": [{"service": "ACCT_ACTIVITY", "timestamp": _now_ms(), "command": "SUBS",
+                                                 "content": content}]})
+
+
+def main():
+    """
+    Run the simulator from the command line: python -m schwabdev.simulator --port 8080
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local Schwab API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every REST response")
+    parser.add_argument("--rate", type=float, default=None, help="streamer messages per second for every service")
+    args = parser.parse_args()
+
+    rates = {service: args.rate for service in DEFAULT_RATES} if args.rate is not None else None
+    with Simulator(args.host, args.port, rates, args.seed, args.latency) as sim:
+        print(f"[Schwabdev] Simulator running at {sim.url} (streamer {sim.streamer_url}), "
+              f"app_key={sim.app_key} app_secret={sim.app_secret}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
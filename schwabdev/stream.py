@@ -11,22 +11,40 @@ import logging
 import threading
 import time
 import zoneinfo
-import websockets
-import websockets.exceptions
+
+from ._lazy import lazy_import
+from .subscriptions import MAX_REQUEST_KEYS, diff as diff_commands, normalize_fields, pack as pack_requests
+
+websockets = lazy_import("websockets")  # imported on first use
+
+
+# services whose content carries a sequence number (field) that increases by one per key
+_SEQUENCE_FIELDS = {"CHART_EQUITY": "1", "ACCT_ACTIVITY": "seq"}
+# services that can be refilled from REST quotes after a reconnect
+_SNAPSHOT_SERVICES = ("LEVELONE_EQUITIES", "LEVELONE_OPTIONS", "LEVELONE_FUTURES", "LEVELONE_FUTURES_OPTIONS", "LEVELONE_FOREX")
 
 
 class StreamBase:
 
-    def __init__(self, tokens, get_streamer_info, logger: logging.Logger):
+    def __init__(self, tokens, get_streamer_info, logger: logging.Logger, streamer_url: str | None = None, get_quotes=None, resync: bool = False):
         """
         Initialize the stream object to stream data from Schwab Streamer
 
         Args:
             client (Client): Client object needed to get streamer info
+            streamer_url (str | None): websocket url override (e.g. a local simulator), defaults to the url from streamer info
+            get_quotes (function | None): function to get REST quotes for symbols (for snapshots after a reconnect)
+            resync (bool): send reset, snapshot and gap events to the receiver (see _run_streamer). Defaults to False.
         """
         self._tokens = tokens                           # tokens object
         self._get_streamer_info = get_streamer_info     # function to get streamer info
         self._logger = logger                           # logger
+        self._streamer_url = streamer_url               # websocket url override
+        self._get_quotes = get_quotes                   # function to get REST quotes (symbols -> {symbol: quote})
+        self._resync = resync                           # emit reset/snapshot/gap events
+        self._sequences = {}                            # (service, key) -> last sequence number
+        self._disconnected = None                       # (time, reason) of the last lost connection
+        self._tasks = set()                             # snapshot tasks (cancelled when the connection ends)
 
         self._websocket = None                          # the websocket
         self._event_loop = None                         # the asyncio loop
@@ -61,10 +79,11 @@ class StreamBase:
                 receiver_func(response, **kwargs)
         
         self._should_stop = False
+        self._disconnected = None
         while not self._should_stop:
 
             try:
-                self._streamer_info = self._get_streamer_info()
+                self._streamer_info = await asyncio.to_thread(self._get_streamer_info)  # off the loop (it may be shared)
             except Exception as e:
                 self._logger.error("Error getting streamer info, cannot start stream.")
                 self._logger.error(e)
@@ -78,7 +97,7 @@ class StreamBase:
             start_time = datetime.datetime.now(datetime.timezone.utc)
             try:
                 self._logger.debug("Connecting to streaming server...")
-                async with websockets.connect(self._streamer_info.get('streamerSocketUrl'), ping_timeout=ping_timeout) as self._websocket:
+                async with websockets.connect(self._streamer_url or self._streamer_info.get('streamerSocketUrl'), ping_timeout=ping_timeout) as self._websocket:
                     self._logger.debug("Connected to streaming server.")
                     login_payload = self.basic_request(service="ADMIN",
                                                        command="LOGIN",
@@ -91,48 +110,132 @@ class StreamBase:
                     await call_receiver(await self._websocket.recv(), **kwargs)  # receive login response
                     self.active = True
 
-                    # send subscriptions (that are recorded (queued or previously sent))
-                    for service, subs in self.subscriptions.items():
-                        grouped: dict[str, list[str]] = {} # group subscriptions by fields for more efficient requests
-                        for key, fields in subs.items():
-                            grouped.setdefault(self._list_to_string(fields), []).append(key)
-                        reqs = [] # list of requests to send for this service
-                        for fields, keys in grouped.items():
-                            reqs.append(self.basic_request(service=service, command="ADD", parameters={"keys": self._list_to_string(keys), "fields": fields}))
-                        if reqs:
-                            self._logger.debug(f"Sending subscriptions: {reqs}")
-                            await self._websocket.send(json.dumps({"requests": reqs}))
-                            await call_receiver(await self._websocket.recv(), **kwargs)  # receive subscription response
+                    # send subscriptions (that are recorded (queued or previously sent)), pipelined: the responses
+                    # are passed to the receiver by the listener loop instead of waiting for each one here
+                    messages = pack_requests(self.subscription_requests(self.subscriptions, current={}))
+                    self._logger.debug(f"Sending subscriptions in {len(messages)} message(s).")
+                    for message in messages:
+                        await self._websocket.send(message)
 
                     # reset backoff time
                     self._backoff_time = 2.0
 
+                    if self._resync and self._disconnected is not None:  # reconnected, updates were missed
+                        await call_receiver(self._reset_event(), **kwargs)
+                        if self._get_quotes is not None:
+                            task = asyncio.create_task(self._send_snapshots(call_receiver, **kwargs))
+                            self._tasks.add(task)
+                            task.add_done_callback(self._tasks.discard)
+                    self._disconnected = None
+
                     # main listener loop
-                    if is_async_receiver:
+                    if self._resync:
+                        while self.active and not self._should_stop:
+                            message = await self._websocket.recv()
+                            if is_async_receiver:
+                                await receiver_func(message, **kwargs)
+                            else:
+                                receiver_func(message, **kwargs)
+                            if '"CHART_EQUITY"' in message or '"ACCT_ACTIVITY"' in message:  # cheap check before parsing
+                                gaps = self._check_sequences(message)
+                                if gaps is not None:
+                                    await call_receiver(gaps, **kwargs)
+                    elif is_async_receiver:
                         while self.active and not self._should_stop:
                             await receiver_func(await self._websocket.recv(), **kwargs)
                     else:
                         while self.active and not self._should_stop:
                             receiver_func(await self._websocket.recv(), **kwargs)
 
-            except (websockets.exceptions.ConnectionClosedOK, websockets.exceptions.ConnectionClosed) as e: # "received 1000 (OK); then sent 1000 (OK)", "sent 1000 (OK); no close frame received"
+            except websockets.ConnectionClosedOK as e: # "received 1000 (OK); then sent 1000 (OK)"
                 self._logger.info(f"Stream connection closed. ({e})")
                 break
-            except websockets.exceptions.ConnectionClosedError as e: # lost internet connection
+            except websockets.ConnectionClosedError as e: # lost internet connection (checked before its base class ConnectionClosed)
                 elapsed = (datetime.datetime.now(datetime.timezone.utc) - start_time).total_seconds()
                 if elapsed <= 90:
                     self._logger.warning(f"Stream has crashed within 90 seconds, likely no subscriptions, invalid login, or lost connection. Not restarting. {e}")
                     break
                 else:
                     self._logger.error(f"Stream connection Error. Reconnecting in {self._backoff_time} seconds...")
+                    self._disconnected = self._disconnected or (time.time(), str(e))
                     await self._wait_for_backoff()
+            except websockets.ConnectionClosed as e: # "sent 1000 (OK); no close frame received"
+                self._logger.info(f"Stream connection closed. ({e})")
+                break
             except Exception as e:  # stream has quit unexpectedly, try to reconnect
                 self._logger.error(e)
                 self._logger.warning(f"Stream connection lost to server, reconnecting...")
+                self._disconnected = self._disconnected or (time.time(), str(e))
                 await self._wait_for_backoff()
             finally:
                 self.active = False
                 self._websocket = None
+                for task in list(self._tasks):  # snapshots of this connection are outdated
+                    task.cancel()
+
+    def _reset_event(self) -> str:
+        """
+        Make a reset event (sent after reconnecting, updates while disconnected were missed).
+
+        Returns:
+            str: message {"events": [{"service": "ADMIN", "command": "RESET", ...}]}
+        """
+        since, reason = self._disconnected
+        self._sequences = {}  # sequence numbers restart with the new connection
+        return json.dumps({"events": [{"service": "ADMIN", "command": "RESET", "timestamp": int(time.time() * 1000),
+                                       "content": {"reason": reason, "downtime": round(time.time() - since, 3),
+                                                   "services": list(self.subscriptions)}}]})
+
+    async def _send_snapshots(self, call_receiver, **kwargs):
+        """
+        Get REST quotes for the subscribed LEVELONE keys (in a thread) and send them as snapshot events.
+        """
+        entries = []
+        for service in _SNAPSHOT_SERVICES:
+            keys = list(self.subscriptions.get(service, ()))
+            if not keys:
+                continue
+            try:
+                quotes = await asyncio.to_thread(self._get_quotes, keys)
+            except Exception as e:
+                self._logger.error(f"Could not get snapshot quotes for {service}: {e}")
+                continue
+            entries.append({"service": service, "command": "SNAPSHOT", "timestamp": int(time.time() * 1000),
+                            "content": [{"key": key} | quote for key, quote in quotes.items() if key in self.subscriptions.get(service, ())]})
+        if entries and self.active:
+            await call_receiver(json.dumps({"events": entries}), **kwargs)
+
+    def _check_sequences(self, message: str) -> str | None:
+        """
+        Track sequence numbers of CHART_EQUITY and ACCT_ACTIVITY content and report skipped ones.
+
+        Args:
+            message (str): message from the stream
+
+        Returns:
+            str | None: message {"events": [{"service": ..., "command": "GAP", "content": [{"key", "expected", "received", "missed"}]}]} or None if there were no gaps
+        """
+        gaps = {}
+        for data in json.loads(message).get("data", ()):
+            service = data.get("service")
+            field = _SEQUENCE_FIELDS.get(service)
+            if field is None:
+                continue
+            for content in data.get("content", ()):
+                sequence = content.get(field)
+                if not isinstance(sequence, int):
+                    continue
+                key = content.get("key")
+                last = self._sequences.get((service, key))
+                if last is not None and sequence > last + 1:
+                    gaps.setdefault(service, []).append({"key": key, "expected": last + 1, "received": sequence, "missed": sequence - last - 1})
+                if last is None or sequence > last:
+                    self._sequences[(service, key)] = sequence
+        if not gaps:
+            return None
+        self._logger.warning(f"Stream sequence gap: {gaps}")
+        return json.dumps({"events": [{"service": service, "command": "GAP", "timestamp": int(time.time() * 1000), "content": content}
+                                      for service, content in gaps.items()]})
 
     async def _wait_for_backoff(self):
         """
@@ -141,6 +244,27 @@ class StreamBase:
         await asyncio.sleep(self._backoff_time)
         self._backoff_time = min(self._backoff_time * 2, 120)
 
+    @staticmethod
+    def _auto_window(now: datetime.datetime, start_time: datetime.time, stop_time: datetime.time, on_days, now_timezone: zoneinfo.ZoneInfo,
+                     calendar=None, market: str = "equity", sessions: tuple[str] = ("regularMarket",), lead: float = 60.0):
+        """
+        Current or next window start_auto keeps the stream running in: the market's sessions from a MarketCalendar
+        (started lead seconds early) or start_time to stop_time on on_days.
+
+        Returns:
+            tuple[datetime.datetime, datetime.datetime] | None: (start, stop), None if there is none in the next week (or cached days)
+        """
+        if calendar is not None:
+            window = calendar.window(market, sessions, now)
+            return None if window is None else (window[0] - datetime.timedelta(seconds=lead), window[1])
+        today = now.astimezone(now_timezone).date()
+        for days in range(8):
+            date = today + datetime.timedelta(days=days)
+            stop = datetime.datetime.combine(date, stop_time, tzinfo=now_timezone)
+            if date.weekday() in on_days and stop > now:
+                return datetime.datetime.combine(date, start_time, tzinfo=now_timezone), stop
+        return None
+
 
     def _record_request(self, request: dict):
         """
@@ -168,7 +292,7 @@ class StreamBase:
                         if key not in self.subscriptions[service]:
                             self.subscriptions[service][key] = fields
                         else:
-                            self.subscriptions[service][key] = list(set(fields) | set(self.subscriptions[service][key]))
+                            self.subscriptions[service][key] = list(normalize_fields(set(fields) | set(self.subscriptions[service][key])))
                 elif command == "SUBS":
                     self.subscriptions[service] = {}
                     for key in keys:
@@ -216,6 +340,30 @@ class StreamBase:
         if parameters is not None and len(parameters) > 0: request["parameters"] = parameters
         return request
 
+    def subscription_requests(self, desired: dict, current: dict | None = None, max_keys: int = MAX_REQUEST_KEYS) -> list[dict]:
+        """
+        Minimal requests (UNSUBS/VIEW/ADD) that change the current subscriptions into the desired ones.
+
+        Args:
+            desired (dict): desired subscriptions, service -> key -> fields (e.g. {"LEVELONE_EQUITIES": {"AAPL": "0,1,2"}})
+            current (dict | None, optional): current subscriptions in the same format. Defaults to None (self.subscriptions).
+            max_keys (int, optional): maximum keys per request, larger requests are split. Defaults to MAX_REQUEST_KEYS.
+
+        Returns:
+            list[dict]: requests
+        """
+        requests = []
+        for service, command, keys, fields in diff_commands(self.subscriptions if current is None else current, desired):
+            if command == "VIEW":
+                requests.append(self.basic_request(service, command, {"fields": self._list_to_string(fields)}))
+                continue
+            for i in range(0, len(keys), max_keys):
+                parameters = {"keys": self._list_to_string(keys[i:i + max_keys])}
+                if fields:
+                    parameters["fields"] = self._list_to_string(fields)
+                requests.append(self.basic_request(service, command, parameters))
+        return requests
+
     @staticmethod
     def _list_to_string(ls: list | str | tuple | set):
         """
@@ -451,8 +599,27 @@ class StreamBase:
         return self.basic_request("ACCT_ACTIVITY", command, parameters={"keys": Stream._list_to_string(keys), "fields": Stream._list_to_string(fields)})
     
 class Stream(StreamBase):
-    def __init__(self, client):
-        super().__init__(client.tokens, client._get_streamer_info, client.logger)
+    def __init__(self, client, streamer_url: str | None = None, resync: bool = False, loop=None):
+        """
+        Initialize the stream object to stream data from Schwab Streamer
+
+        Args:
+            client (Client): Client object needed to get streamer info
+            streamer_url (str | None): websocket url override (e.g. a local simulator), defaults to the url from streamer info
+            resync (bool): send reset, snapshot and gap events to the receiver (see _run_streamer). Defaults to False.
+            loop (SharedLoop | None): shared background loop to run in (see schwabdev.loop), None for a thread and loop of its own. Defaults to None.
+        """
+        super().__init__(client.tokens, client._get_streamer_info, client.logger, streamer_url, client._get_quotes, resync)
+        self._shared_loop = loop                        # shared background loop (schwabdev.loop.SharedLoop)
+        self._future = None                             # the stream running in the shared loop
+        self._send_queue = []                           # requests waiting to be sent (coalesced into one message)
+        self._send_lock = threading.Lock()              # lock for the send queue
+        self._flushing = False                          # a flush of the send queue is scheduled or running
+
+    def _running(self) -> bool:
+        if self._shared_loop is not None:
+            return self._future is not None and not self._future.done()
+        return self._thread is not None and self._thread.is_alive()
 
     def start(self, receiver=print, daemon: bool = True, ping_interval: int = 20, **kwargs):
         """
@@ -460,23 +627,62 @@ class Stream(StreamBase):
 
         Args:
             receiver (function, optional): function to call when data is received. Defaults to print.
-            daemon (bool, optional): whether to run the thread in the background (as a daemon). Defaults to True.
+            daemon (bool, optional): whether to run the thread in the background (as a daemon), unused with a shared loop. Defaults to True.
             ping_interval (int, optional): interval in seconds to send pings to the streamer. Defaults to 20.
         """
-        if self.active and (self._thread and self._thread.is_alive()):
+        if self.active and self._running():
             self._logger.warning("Stream already active.")
             return
         else:
             self._loop_ready.clear()
+            with self._send_lock:
+                self._send_queue, self._flushing = [], False  # requests still queued are recorded and sent on login
 
-            def _start_asyncio():
-                asyncio.run(self._run_streamer(receiver, ping_interval, **kwargs))
+            if self._shared_loop is not None:
+                self._future = self._shared_loop.submit(self._run_streamer(receiver, ping_interval, **kwargs))
+            else:
+                def _start_asyncio():
+                    asyncio.run(self._run_streamer(receiver, ping_interval, **kwargs))
 
-            self._thread = threading.Thread(target=_start_asyncio, daemon=daemon)
-            self._thread.start()
+                self._thread = threading.Thread(target=_start_asyncio, daemon=daemon)
+                self._thread.start()
 
             self._loop_ready.wait(timeout=4.0)
 
+    def _enqueue(self, requests: list):
+        """
+        Queue requests to send from any thread, requests queued before the flush runs in the stream's loop are sent
+        together (packed into as few messages as possible).
+        """
+        with self._send_lock:
+            self._send_queue.extend(requests)
+            if self._flushing:
+                return
+            self._flushing = True
+        flush = self._flush()
+        try:
+            asyncio.run_coroutine_threadsafe(flush, self._event_loop)
+        except Exception as e:  # the loop is closing, requests still queued are recorded and sent on login
+            flush.close()
+            self._logger.error(f"Error sending requests: {e}")
+            with self._send_lock:
+                self._send_queue, self._flushing = [], False
+
+    async def _flush(self):
+        try:
+            while True:
+                with self._send_lock:
+                    requests, self._send_queue = self._send_queue, []
+                    if not requests:
+                        self._flushing = False
+                        return
+                for message in pack_requests(requests):
+                    await self._websocket.send(message)
+        except Exception as e:
+            self._logger.error(f"Error sending requests: {e}")
+            with self._send_lock:
+                self._send_queue, self._flushing = [], False
+
     def __enter__(self):
         self.start()
         return self
@@ -489,7 +695,8 @@ class Stream(StreamBase):
 
     def start_auto(self, receiver=print, start_time: datetime.time = datetime.time(9, 29, 0),
                    stop_time: datetime.time = datetime.time(16, 0, 0), on_days: list[int] = [0,1,2,3,4],
-                   now_timezone: zoneinfo.ZoneInfo = zoneinfo.ZoneInfo("America/New_York"), daemon: bool = True, **kwargs):
+                   now_timezone: zoneinfo.ZoneInfo = zoneinfo.ZoneInfo("America/New_York"), daemon: bool = True,
+                   calendar=None, market: str = "equity", sessions: tuple[str] = ("regularMarket",), lead: float = 60.0, **kwargs):
         """
         Start the stream automatically at market open and close, will NOT erase subscriptions
 
@@ -500,12 +707,22 @@ class Stream(StreamBase):
             on_days (list[int], optional): day(s) to start the stream default: (0,1,2,3,4) = Mon-Fri, (0 = Monday, ..., 6 = Sunday). Defaults to (0,1,2,3,4).
             now_timezone (zoneinfo.ZoneInfo, optional): timezone to use for now. Defaults to ZoneInfo("America/New_York").
             daemon (bool, optional): whether to run the thread in the background (as a daemon). Defaults to True.
+            calendar (MarketCalendar, optional): follow the market's sessions (holidays and early closes) instead of start_time, stop_time and on_days. Defaults to None.
+            market (str, optional): market of the calendar to follow. Defaults to "equity".
+            sessions (tuple[str], optional): sessions of the calendar to stream in. Defaults to ("regularMarket",).
+            lead (float, optional): seconds before the calendar's open to start the stream. Defaults to 60.
         """
         def checker():
 
             while True:
+                if calendar is not None:
+                    try:
+                        calendar.refresh()  # only requests days that are not cached
+                    except Exception as e:
+                        self._logger.error(f"Could not refresh the market calendar: {e}")
                 now = datetime.datetime.now(now_timezone)
-                in_hours = (start_time <= now.time() <= stop_time) and (now.weekday() in on_days)
+                window = self._auto_window(now, start_time, stop_time, on_days, now_timezone, calendar, market, sessions, lead)
+                in_hours = window is not None and window[0] <= now
                 if in_hours and not self.active:
                     if len(self.subscriptions) == 0:
                         self._logger.warning("No subscriptions, starting stream anyways.")
@@ -513,11 +730,13 @@ class Stream(StreamBase):
                 elif not in_hours and self.active:
                     self._logger.info("Stopping Stream.")
                     self.stop(clear_subscriptions=False)
-                time.sleep(30)
+                # in hours check every 30s (restarting a stream that died), else sleep until the next start (at most an hour)
+                delay = 3600 if window is None else ((window[1] if in_hours else window[0]) - now).total_seconds()
+                time.sleep(min(max(delay, 0.0), 30 if in_hours else 3600))
 
         threading.Thread(target=checker, daemon=daemon).start()
 
-        if not start_time <= datetime.datetime.now(now_timezone).time() <= stop_time:
+        if calendar is None and not start_time <= datetime.datetime.now(now_timezone).time() <= stop_time:
             self._logger.info("Stream was started outside of active hours and will launch when in hours.")
     
     def send(self, requests: list | dict, record: bool=True):
@@ -539,11 +758,28 @@ class Stream(StreamBase):
         elif not self.active:
             self._logger.info("Stream is not active, request queued.")
         else:
-            asyncio.run_coroutine_threadsafe(self._websocket.send(json.dumps({"requests": requests})), self._event_loop)
+            self._enqueue(requests)
+
+    def update_subscriptions(self, desired: dict, max_keys: int = MAX_REQUEST_KEYS):
+        """
+        Change the subscriptions to the desired ones with the minimal requests, packed into as few messages as possible
+        and sent without waiting for each response (responses are passed to the receiver).
+
+        Args:
+            desired (dict): desired subscriptions, service -> key -> fields (services not included are unsubscribed)
+            max_keys (int, optional): maximum keys per request. Defaults to MAX_REQUEST_KEYS.
+        """
+        requests = self.subscription_requests(desired, max_keys=max_keys)
+        for request in requests:
+            self._record_request(request)
+        if self._event_loop is None or not self.active:
+            self._logger.info("Stream is not active, requests queued.")
+            return
+        self._enqueue(requests)
 
     async def send_async(self, requests: list | dict):
         """
-        Send a request to the stream
+        Send a request to the stream from a coroutine, queued and packed with other sends like send()
 
         Args:
             request (list | dict): list of requests or a single request
@@ -554,14 +790,12 @@ class Stream(StreamBase):
         for req in requests:
             self._record_request(req)
 
-        payload = json.dumps({"requests": requests})
-
         if self._event_loop is None:
             self._logger.info("Stream event loop not initialized yet; request queued.")
         elif not self.active:
             self._logger.info("Stream is not active, request queued.")
         else:
-            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._websocket.send(payload), self._event_loop))
+            self._enqueue(requests)
 
     def stop(self, clear_subscriptions: bool = True):
         """
@@ -595,11 +829,92 @@ class Stream(StreamBase):
         if self._thread is not None:
             self._thread.join(timeout=5)
             self._thread = None
+        if self._future is not None:
+            try:
+                self._future.result(timeout=5)
+            except Exception as e:
+                self._logger.debug(f"Stream ended with: {e!r}")
+            self._future = None
+
+class MessageQueue:
+
+    def __init__(self, services: set | None, keys: set | None, maxsize: int, overflow: str, responses: bool, on_close):
+        """
+        A bounded queue of stream messages for one consumer, made by StreamAsync.messages().
+        Messages are the parsed entries of a stream message (e.g. {"service": "LEVELONE_EQUITIES", "timestamp": ..., "command": "SUBS", "content": [...]}),
+        they are shared between consumers and should not be modified.
+        """
+        if overflow not in ("drop_oldest", "drop_newest", "block"):
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+        self.services = services                        # services to receive (None for all)
+        self.keys = keys                                # keys (e.g. symbols) to receive (None for all)
+        self.overflow = overflow                        # what to do when the queue is full
+        self.responses = responses                      # also receive "response" and "notify" entries
+        self.maxsize = maxsize                          # maximum queued messages
+        self.dropped = 0                                # messages dropped because the queue was full
+        self.closed = False                             # no more messages will be added
+        self._queue = asyncio.Queue()                   # queued entries (bounded by _put, so ending never waits)
+        self._space = asyncio.Event()                   # set when an entry is taken (for "block")
+        self._on_close = on_close                       # unregisters the queue from the stream
+
+    async def _put(self, entry: dict):
+        if self._queue.qsize() >= self.maxsize:
+            if self.overflow == "block":
+                while self._queue.qsize() >= self.maxsize and not self.closed:  # holds up the reader until there is room
+                    self._space.clear()
+                    await self._space.wait()
+                if self.closed:
+                    return
+            else:
+                self.dropped += 1
+                if self.overflow == "drop_newest":
+                    return
+                self._queue.get_nowait()
+        self._queue.put_nowait(entry)
+
+    def _end(self):
+        self.closed = True
+        self._queue.put_nowait(None)  # wakes the consumer, ends iteration after queued messages
+        self._space.set()             # releases a blocked reader
+
+    def close(self):
+        """
+        Stop receiving messages, iteration ends after the messages already queued.
+        """
+        if not self.closed:
+            self._on_close(self)
+            self._end()
+
+    def qsize(self) -> int:
+        """
+        Returns:
+            int: number of queued messages
+        """
+        return self._queue.qsize()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        entry = await self._queue.get()
+        self._space.set()
+        if entry is None:
+            self._queue.put_nowait(None)  # keep ending for later calls
+            raise StopAsyncIteration
+        return entry
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
 
 class StreamAsync(StreamBase):
-    def __init__(self, client):
-        super().__init__(client.tokens, client._get_streamer_info, client.logger)
+    def __init__(self, client, streamer_url: str | None = None, resync: bool = False):
+        super().__init__(client.tokens, client._get_streamer_info, client.logger, streamer_url, client._get_quotes, resync)
         self._task = None
+        self._consumers = []                            # MessageQueues from messages()
 
     async def __aenter__(self):
         await self.start()
@@ -611,6 +926,11 @@ class StreamAsync(StreamBase):
     async def start(self, receiver=print, ping_interval: int = 20, **kwargs):
         """
         Start the stream in the *current* event loop (no thread).
+
+        Args:
+            receiver (function | None, optional): function to call when data is received, None when only using messages(). Defaults to print.
+            ping_interval (int, optional): how long to wait for pongs from the server. Defaults to 20.
+            **kwargs: keyword arguments to pass to receiver
         """
         if self.active or (self._task and not self._task.done()):
             self._logger.warning("Stream already active.")
@@ -619,15 +939,104 @@ class StreamAsync(StreamBase):
             self._event_loop = asyncio.get_running_loop() #override with where we are called from
             self._task = self._event_loop.create_task(
                 self._run_streamer(
-                    receiver_func=receiver,
+                    receiver_func=self._dispatcher(receiver),
                     ping_timeout=ping_interval,
                     **kwargs,
                 )
             )
+            self._task.add_done_callback(lambda _: self._end_consumers())
+
+    def _dispatcher(self, receiver):
+        """
+        Wrap the receiver so messages are also put in the queues of messages() consumers.
+        """
+        is_async_receiver = asyncio.iscoroutinefunction(receiver)
+
+        async def dispatch(message, **kwargs):
+            if self._consumers:
+                await self._dispatch(message)
+            if receiver is None:
+                return
+            if is_async_receiver:
+                await receiver(message, **kwargs)
+            else:
+                receiver(message, **kwargs)
+        return dispatch
+
+    async def _dispatch(self, message: str):
+        """
+        Parse a message once and put each entry in the queue of every consumer whose filters match it.
+        """
+        try:
+            parsed = json.loads(message)
+        except ValueError:
+            self._logger.error(f"Could not parse stream message: {message[:100]}")
+            return
+        for kind, entries in parsed.items():
+            if not isinstance(entries, list):
+                continue
+            for entry in entries:
+                service = entry.get("service")
+                for consumer in tuple(self._consumers):
+                    if kind not in ("data", "events") and not consumer.responses:
+                        continue
+                    if consumer.services is not None and service not in consumer.services and entry.get("command") != "RESET":
+                        continue
+                    if consumer.keys is not None and isinstance(entry.get("content"), list):
+                        content = [item for item in entry.get("content", ()) if item.get("key") in consumer.keys]
+                        if not content:
+                            continue
+                        await consumer._put(entry | {"content": content})
+                    else:
+                        await consumer._put(entry)
+
+    def messages(self, services: str | list | None = None, keys: str | list | None = None, maxsize: int = 1000,
+                 overflow: str = "drop_oldest", responses: bool = False) -> MessageQueue:
+        """
+        Iterate over stream messages, each consumer has its own bounded queue so a slow consumer does not hold up the reader or other consumers.
+        Iteration ends when the stream stops or the queue is closed.
+
+        Args:
+            services (str | list | None, optional): services to receive, e.g. "LEVELONE_EQUITIES". Defaults to None (all).
+            keys (str | list | None, optional): keys to receive, e.g. ["AAPL", "MSFT"]. Defaults to None (all).
+            maxsize (int, optional): maximum queued messages. Defaults to 1000.
+            overflow (str, optional): when the queue is full "drop_oldest" or "drop_newest" message, or "block" the reader until there is room (backpressure on the connection and every consumer). Defaults to "drop_oldest".
+            responses (bool, optional): also receive "response" (e.g. LOGIN, SUBS) and "notify" (heartbeat) entries. Defaults to False.
+                Reconnect events (RESET, SNAPSHOT and GAP, sent with resync=True) are always received.
+
+        Returns:
+            MessageQueue: async iterator (and async context manager) of parsed message entries
+
+        Example:
+            async with stream.messages("LEVELONE_EQUITIES", ["AAPL"]) as messages:
+                async for message in messages:
+                    print(message["content"])
+        """
+        def to_set(value):
+            if value is None:
+                return None
+            return set(value.split(",") if isinstance(value, str) else value)
+
+        consumer = MessageQueue(to_set(services), to_set(keys), maxsize, overflow, responses, self._remove_consumer)
+        self._consumers.append(consumer)
+        return consumer
+
+    def _remove_consumer(self, consumer: MessageQueue):
+        if consumer in self._consumers:
+            self._consumers.remove(consumer)
+
+    def _end_consumers(self):
+        """
+        End iteration for all messages() consumers (the stream stopped).
+        """
+        consumers, self._consumers = self._consumers, []
+        for consumer in consumers:
+            consumer._end()
 
     async def start_auto(self, receiver=print, start_time: datetime.time = datetime.time(9, 29, 0),
                    stop_time: datetime.time = datetime.time(16, 0, 0), on_days: list[int] | tuple[int] = (0,1,2,3,4),
-                   now_timezone: zoneinfo.ZoneInfo = zoneinfo.ZoneInfo("America/New_York"), daemon: bool = True, **kwargs):
+                   now_timezone: zoneinfo.ZoneInfo = zoneinfo.ZoneInfo("America/New_York"), daemon: bool = True,
+                   calendar=None, market: str = "equity", sessions: tuple[str] = ("regularMarket",), lead: float = 60.0, **kwargs):
         """
         Start the stream automatically at market open and close, will NOT erase subscriptions
 
@@ -638,12 +1047,24 @@ class StreamAsync(StreamBase):
             on_days (list[int], optional): day(s) to start the stream default: (0,1,2,3,4) = Mon-Fri, (0 = Monday, ..., 6 = Sunday). Defaults to (0,1,2,3,4).
             now_timezone (zoneinfo.ZoneInfo, optional): timezone to use for now. Defaults to ZoneInfo("America/New_York").
             daemon (bool, optional): whether to run the thread in the background (as a daemon). Defaults to True.
+            calendar (MarketCalendar, optional): follow the market's sessions (holidays and early closes) instead of start_time, stop_time and on_days. Defaults to None.
+            market (str, optional): market of the calendar to follow. Defaults to "equity".
+            sessions (tuple[str], optional): sessions of the calendar to stream in. Defaults to ("regularMarket",).
+            lead (float, optional): seconds before the calendar's open to start the stream. Defaults to 60.
         """
         async def checker():
 
             while True:
+                if calendar is not None:
+                    try:
+                        result = calendar.refresh()  # only requests days that are not cached
+                        if asyncio.iscoroutine(result):
+                            await result
+                    except Exception as e:
+                        self._logger.error(f"Could not refresh the market calendar: {e}")
                 now = datetime.datetime.now(now_timezone)
-                in_hours = (start_time <= now.time() <= stop_time) and (now.weekday() in on_days)
+                window = self._auto_window(now, start_time, stop_time, on_days, now_timezone, calendar, market, sessions, lead)
+                in_hours = window is not None and window[0] <= now
                 if in_hours and not self.active:
                     if len(self.subscriptions) == 0:
                         self._logger.warning("No subscriptions, starting stream anyways.")
@@ -651,7 +1072,9 @@ class StreamAsync(StreamBase):
                 elif not in_hours and self.active:
                     self._logger.info("Stopping Stream.")
                     await self.stop(clear_subscriptions=False)
-                await asyncio.sleep(30)
+                # in hours check every 30s (restarting a stream that died), else sleep until the next start (at most an hour)
+                delay = 3600 if window is None else ((window[1] if in_hours else window[0]) - now).total_seconds()
+                await asyncio.sleep(min(max(delay, 0.0), 30 if in_hours else 3600))
 
         asyncio.create_task(checker())
 
@@ -677,6 +1100,24 @@ class StreamAsync(StreamBase):
             await self._websocket.send(json.dumps({"requests": requests}))
             
 
+    async def update_subscriptions(self, desired: dict, max_keys: int = MAX_REQUEST_KEYS):
+        """
+        Change the subscriptions to the desired ones with the minimal requests, packed into as few messages as possible
+        and sent without waiting for each response (responses are passed to the receiver).
+
+        Args:
+            desired (dict): desired subscriptions, service -> key -> fields (services not included are unsubscribed)
+            max_keys (int, optional): maximum keys per request. Defaults to MAX_REQUEST_KEYS.
+        """
+        requests = self.subscription_requests(desired, max_keys=max_keys)
+        for request in requests:
+            self._record_request(request)
+        if self._event_loop is None or not self.active:
+            self._logger.info("Stream is not active, requests queued.")
+            return
+        for message in pack_requests(requests):
+            await self._websocket.send(message)
+
     async def stop(self, clear_subscriptions: bool = True):
         """
         Stop the stream started with start_async.
@@ -703,6 +1144,8 @@ class StreamAsync(StreamBase):
                 self._event_loop = None
                 self._websocket = None
 
+        self._end_consumers()  # before waiting on the task, its reader may be blocked on a full "block" queue
+
         if self._task is not None:
             try:
                 await self._task
@@ -0,0 +1,97 @@
+"""
+Schwabdev Subscriptions Module.
+Minimal command sets between stream subscription states and packing commands into messages.
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import json
+
+MAX_REQUEST_KEYS = 500          # keys per request (larger ADD/UNSUBS are split)
+MAX_MESSAGE_BYTES = 64 * 1024   # bytes per websocket message (several requests are packed into one message up to this)
+
+
+def normalize_fields(fields: str | list | tuple | set) -> tuple:
+    """
+    Canonical form of a field list, so field lists can be compared (e.g. "3,0,1" -> ("0", "1", "3")).
+
+    Args:
+        fields (str | list | tuple | set): fields
+
+    Returns:
+        tuple: sorted unique fields
+    """
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    return tuple(sorted({str(f).strip() for f in fields if str(f).strip()}, key=lambda f: (not f.isdigit(), int(f) if f.isdigit() else 0, f)))
+
+
+def diff(current: dict, desired: dict) -> list[tuple[str, str, list, tuple]]:
+    """
+    Find the minimal commands that change the current subscriptions into the desired ones.
+    Per service: UNSUBS removed keys (and keys losing fields), VIEW when every kept key changes to one common field list,
+    then ADD new and changed keys grouped by field list.
+
+    Args:
+        current (dict): current subscriptions, service -> key -> fields
+        desired (dict): desired subscriptions, service -> key -> fields
+
+    Returns:
+        list[tuple[str, str, list, tuple]]: commands (service, command, keys, fields)
+    """
+    normalized = {}  # most keys share a field list, normalize each distinct one once
+
+    def normalize(fields):
+        cache_key = fields if isinstance(fields, str) else tuple(fields)
+        result = normalized.get(cache_key)
+        if result is None:
+            result = normalized[cache_key] = normalize_fields(fields)
+        return result
+
+    commands = []
+    for service in list(current) + [s for s in desired if s not in current]:
+        have = {key: normalize(fields) for key, fields in current.get(service, {}).items()}
+        want = {key: normalize(fields) for key, fields in desired.get(service, {}).items()}
+
+        removed = [key for key in have if key not in want]
+        kept = [key for key in have if key in want]
+        changed = [key for key in kept if have[key] != want[key]]
+        view = None
+        common = set(want.values())
+        if len(common) == 1 and changed and len(changed) == len(kept):
+            view = common.pop()  # one VIEW instead of re-adding every kept key
+            changed = []
+        shrunk = [key for key in changed if not set(have[key]) <= set(want[key])]  # ADD only adds fields
+
+        if removed or shrunk:
+            commands.append((service, "UNSUBS", removed + shrunk, ()))
+        if view is not None:
+            commands.append((service, "VIEW", [], view))
+        grouped = {}
+        for key in changed + [key for key in want if key not in have]:
+            grouped.setdefault(want[key], []).append(key)
+        for fields, keys in grouped.items():
+            commands.append((service, "ADD", keys, fields))
+    return commands
+
+
+def pack(requests: list[dict], max_bytes: int = MAX_MESSAGE_BYTES) -> list[str]:
+    """
+    Pack requests into as few websocket messages as possible, each at most max_bytes (a larger single request gets its own message).
+
+    Args:
+        requests (list[dict]): requests
+        max_bytes (int): maximum message size. Defaults to MAX_MESSAGE_BYTES.
+
+    Returns:
+        list[str]: json messages ({"requests": [...]})
+    """
+    messages, batch, size = [], [], len('{"requests": []}')
+    for request in requests:
+        encoded = json.dumps(request)
+        if batch and size + len(encoded) + 2 > max_bytes:
+            messages.append(f'{{"requests": [{", ".join(batch)}]}}')
+            batch, size = [], len('{"requests": []}')
+        batch.append(encoded)
+        size += len(encoded) + 2
+    if batch:
+        messages.append(f'{{"requests": [{", ".join(batch)}]}}')
+    return messages
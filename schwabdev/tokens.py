@@ -7,17 +7,20 @@ import base64
 import datetime
 import logging
 import os
-import webbrowser
 import sqlite3
-import requests
 import urllib.parse
 import threading
-from cryptography.fernet import Fernet
+
+from ._lazy import lazy_import
+
+requests = lazy_import("requests")        # imported on first use
+fernet = lazy_import("cryptography.fernet")
+webbrowser = lazy_import("webbrowser")    # only needed for the authorization flow
 
 _ENC_PREFIX = "enc:"
 
 class Tokens:
-    def __init__(self,app_key: str, app_secret: str, callback_url: str, logger: logging.Logger, tokens_db: str="~/.schwabdev/tokens.db", encryption: str=None, call_for_auth=None):
+    def __init__(self,app_key: str, app_secret: str, callback_url: str, logger: logging.Logger, tokens_db: str="~/.schwabdev/tokens.db", encryption: str=None, call_for_auth=None, base_url: str="https://api.schwabapi.com"):
         """
         Initialize a tokens manager
 
@@ -28,6 +31,7 @@ class Tokens:
             callback_url (str): Url for callback
             tokens_db (str): Path to tokens database file
             call_for_auth (function | None): Function to call for custom auth flow
+            base_url (str): Base url of the api (OAuth endpoints are under it)
         """
         #parameter validation
         if not app_key:
@@ -59,13 +63,14 @@ class Tokens:
         self._app_secret = app_secret                       # app secret credential
         self._update_lock = threading.RLock()                # lock for token update operations
         self._callback_url = callback_url                   # callback url to use
+        self._base_url = base_url.rstrip("/")               # base url of the api (for OAuth endpoints)
         self._access_token_issued = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)  # datetime of access token issue
         self._refresh_token_issued = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc) # datetime of refresh token issue
         self._access_token_timeout = 30 * 60                # in seconds (30 min from schwab)
         self._refresh_token_timeout = 7 * 24 * 60 * 60      # in seconds (7 days from schwab)
         self._logger = logger                               # logger
         self._call_for_auth = call_for_auth                 # function to call for custom auth
-        self._cipher_suite = Fernet(encryption) if (encryption and len(encryption) > 16) else None # encryption suite for tokens
+        self._cipher_suite = fernet.Fernet(encryption) if (encryption and len(encryption) > 16) else None # encryption suite for tokens
 
         #init token database
         tokens_db = os.path.expanduser(tokens_db)
@@ -102,6 +107,13 @@ class Tokens:
             self._logger.warning("[Schwabdev] Could not load tokens from DB, starting authorization flow.")
             self.update_tokens(force_refresh_token=True)
 
+    @property
+    def access_token_expires(self) -> datetime.datetime:
+        """
+        When the access token expires (UTC).
+        """
+        return self._access_token_issued + datetime.timedelta(seconds=self._access_token_timeout)
+
     def _close(self):
         try:
             self._conn.close()
@@ -272,7 +284,7 @@ class Tokens:
                     'refresh_token': code}
         else:
             raise Exception("Invalid grant type; options are 'authorization_code' or 'refresh_token'")
-        return requests.post('https://api.schwabapi.com/v1/oauth/token', headers=headers, data=data, timeout=30)
+        return requests.post(f'{self._base_url}/v1/oauth/token', headers=headers, data=data, timeout=30)
 
 
     def update_tokens(self, force_access_token=False, force_refresh_token=False):
@@ -414,7 +426,7 @@ class Tokens:
                 self._conn.rollback() # release exclusive
                 return
 
-            auth_url = f'https://api.schwabapi.com/v1/oauth/authorize?client_id={self._app_key}&redirect_uri={self._callback_url}'
+            auth_url = f'{self._base_url}/v1/oauth/authorize?client_id={self._app_key}&redirect_uri={self._callback_url}'
 
             now = datetime.datetime.now(datetime.timezone.utc)
             if self._call_for_auth is not None and callable(self._call_for_auth):
@@ -3,6 +3,7 @@ Schwabdev Stream Field Mappings.
 Used to translate field numbers to field names.
 https://github.com/tylerebowers/Schwab-API-Python
 """
+import json
 
 stream_fields = {
     "LEVELONE_EQUITIES": ["Symbol", "Bid Price", "Ask Price", "Last Price", "Bid Size", "Ask Size", "Ask ID", "Bid ID",
@@ -64,3 +65,22 @@ stream_fields = {
     "SCREENER_EQUITY": ["symbol", "timestamp", "sortField", "frequency", "Items"],
     "SCREENER_OPTION": ["symbol", "timestamp", "sortField", "frequency", "Items"],
     "ACCT_ACTIVITY": {"seq": "Sequence", "key": "Key", "1": "Account", "2": "Message Type", "3": "Message Data"}}
+
+
+def iter_data(message: str | bytes | dict):
+    """
+    Iterate over the content of a stream data message (responses and notifications are skipped).
+
+    Args:
+        message (str | bytes | dict): message from the stream (raw or parsed)
+
+    Yields:
+        tuple[str, int, dict]: service, timestamp and content for each content item
+    """
+    if isinstance(message, (str, bytes)):
+        message = json.loads(message)
+    for data in message.get("data", ()):
+        service = data.get("service")
+        timestamp = data.get("timestamp")
+        for content in data.get("content", ()):
+            yield service, timestamp, content
@@ -0,0 +1,356 @@
+"""
+Schwabdev Transport Module.
+HTTP transports for ClientAsync: aiohttp (HTTP/1.1, the default) and httpx (HTTP/2, many requests multiplexed over one connection).
+https://github.com/tylerebowers/Schwab-API-Python
+"""
+import abc
+import json
+import time
+
+from ._lazy import lazy_import
+
+asyncio = lazy_import("asyncio")
+aiohttp = lazy_import("aiohttp")
+httpx = lazy_import("httpx")
+multidict = lazy_import("multidict")
+yarl = lazy_import("yarl")
+
+
+class Transport(abc.ABC):
+
+    @abc.abstractmethod
+    def open(self, base_url: str, headers: dict, timeout: float):
+        """
+        Create the underlying session, called by the client.
+
+        Args:
+            base_url (str): base url of the api
+            headers (dict): default headers (the client updates "Authorization" in transport.headers)
+            timeout (float): request timeout in seconds
+        """
+
+    @property
+    @abc.abstractmethod
+    def headers(self):
+        """
+        Default headers sent with every request (mutable).
+        """
+
+    @abc.abstractmethod
+    async def request(self, method: str, path: str, trace_request_ctx=None, **kwargs):
+        """
+        Send a request.
+
+        Args:
+            method (str): HTTP method
+            path (str): path (relative to the base url)
+            trace_request_ctx (schwabdev.hooks.RequestInfo | None): request info that timings are recorded into. Defaults to None.
+            **kwargs: params, json, data and headers
+
+        Returns:
+            aiohttp.ClientResponse | HttpxResponse: response (with the aiohttp response interface)
+        """
+
+    @property
+    def idle_timeout(self) -> float | None:
+        """
+        Seconds an idle connection is kept open by the client, None if it is not closed.
+        """
+        return None
+
+    def enable_tracing(self):
+        """
+        Start recording connection timings into the RequestInfo of requests (called when the first hook is added).
+        """
+
+    @abc.abstractmethod
+    async def warm(self, path: str = "/", connections: int = 1) -> int:
+        """
+        Open (or keep open) pooled connections with concurrent lightweight requests, so each request uses its own connection.
+
+        Args:
+            path (str): path requested (relative to the base url). Defaults to "/".
+            connections (int): number of connections. Defaults to 1.
+
+        Returns:
+            int: number of connections that answered
+        """
+
+    @abc.abstractmethod
+    def pool_stats(self) -> dict:
+        """
+        Connection pool statistics.
+
+        Returns:
+            dict: {"limit": maximum connections (None for no limit), "open": open connections, "idle": open connections not in use,
+                "in_use": connections with a request in flight}
+        """
+
+    @abc.abstractmethod
+    async def close(self):
+        """
+        Close all connections.
+        """
+
+
+class AiohttpTransport(Transport):
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, keepalive_timeout: float = 15.0, dns_cache_ttl: int | None = 10,
+                 ssl=None):
+        """
+        HTTP/1.1 transport using aiohttp (one request per connection at a time, so concurrency opens more connections).
+
+        Args:
+            limit (int): maximum open connections, 0 for no limit. Defaults to 100.
+            limit_per_host (int): maximum open connections per host, 0 for no limit. Defaults to 0.
+            keepalive_timeout (float): seconds an idle connection is kept open for reuse. Defaults to 15.
+            dns_cache_ttl (int | None): seconds DNS results are cached, None to cache forever. Defaults to 10.
+            ssl (ssl.SSLContext | None): TLS context shared by all connections, None for the default. Defaults to None.
+        """
+        self.limit = limit                                          # maximum open connections
+        self.limit_per_host = limit_per_host                        # maximum open connections per host
+        self.keepalive_timeout = keepalive_timeout                  # idle connection lifetime (seconds)
+        self.dns_cache_ttl = dns_cache_ttl                          # DNS cache lifetime (seconds)
+        self.ssl = ssl                                              # TLS context
+        self.session = None                                         # aiohttp.ClientSession
+
+    def open(self, base_url: str, headers: dict, timeout: float):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required to use AiohttpTransport")
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host, keepalive_timeout=self.keepalive_timeout,
+                                         ttl_dns_cache=self.dns_cache_ttl, ssl=self.ssl if self.ssl is not None else True)
+        self.session = aiohttp.ClientSession(base_url=base_url, headers=headers, connector=connector,
+                                             timeout=aiohttp.ClientTimeout(total=timeout))
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    @property
+    def idle_timeout(self) -> float | None:
+        return self.keepalive_timeout
+
+    async def request(self, method: str, path: str, trace_request_ctx=None, **kwargs):
+        if trace_request_ctx is not None:
+            kwargs["trace_request_ctx"] = trace_request_ctx
+        return await self.session.request(method, path, **kwargs)
+
+    def enable_tracing(self):
+        from .hooks import trace_config
+        self.session.trace_configs.append(trace_config())  # records dns/connect/ttfb timings into the request's RequestInfo
+
+    async def warm(self, path: str = "/", connections: int = 1) -> int:
+        # requests started together each acquire a connection before any response arrives
+        responses = await asyncio.gather(*(self.session.head(path) for _ in range(connections)), return_exceptions=True)
+        for response in responses:
+            if not isinstance(response, BaseException):
+                response.release()
+        return sum(not isinstance(response, BaseException) for response in responses)
+
+    def pool_stats(self) -> dict:
+        connector = self.session.connector
+        idle = sum(len(connections) for connections in connector._conns.values())
+        in_use = len(connector._acquired)
+        return {"limit": connector.limit or None, "open": idle + in_use, "idle": idle, "in_use": in_use}
+
+    async def close(self):
+        await self.session.close()
+
+
+class HttpxContent:
+    __slots__ = ("_body", "_position")
+
+    def __init__(self, body: bytes):
+        """
+        Body of an HttpxResponse with the aiohttp.StreamReader interface (the body is already read, so chunks are slices of it).
+
+        Args:
+            body (bytes): response body
+        """
+        self._body = body
+        self._position = 0                                          # bytes already consumed
+
+    async def read(self, n: int = -1) -> bytes:
+        end = len(self._body) if n < 0 else min(self._position + n, len(self._body))
+        data, self._position = self._body[self._position:end], end
+        return data
+
+    async def readany(self) -> bytes:
+        return await self.read()
+
+    async def iter_chunked(self, n: int):
+        while self._position < len(self._body):
+            yield await self.read(n)
+
+    async def iter_any(self):
+        if self._position < len(self._body):
+            yield await self.read()
+
+    def at_eof(self) -> bool:
+        return self._position >= len(self._body)
+
+
+class HttpxResponse:
+    __slots__ = ("_response", "content")
+
+    def __init__(self, response):
+        """
+        httpx response with the aiohttp.ClientResponse interface used by ClientAsync (status, ok, headers, await read()/text()/json(),
+        content.iter_chunked() and raise_for_status() raising aiohttp.ClientResponseError).
+
+        Args:
+            response (httpx.Response): response (already read)
+        """
+        self._response = response
+        self.content = HttpxContent(response.content)              # body as an aiohttp.StreamReader
+
+    @property
+    def status(self) -> int:
+        return self._response.status_code
+
+    @property
+    def ok(self) -> bool:
+        return self._response.status_code < 400
+
+    @property
+    def reason(self) -> str:
+        return self._response.reason_phrase
+
+    @property
+    def headers(self):
+        return self._response.headers
+
+    @property
+    def url(self):
+        return self._response.url
+
+    @property
+    def content_length(self) -> int | None:
+        length = self._response.headers.get("Content-Length")
+        return int(length) if length is not None else len(self._response.content)
+
+    @property
+    def http_version(self) -> str:
+        return self._response.http_version
+
+    async def read(self) -> bytes:
+        return self._response.content
+
+    async def text(self, encoding: str | None = None) -> str:
+        return self._response.content.decode(encoding) if encoding else self._response.text
+
+    async def json(self, loads=json.loads, **kwargs):
+        return loads(self._response.content)
+
+    def raise_for_status(self):
+        """
+        Raise aiohttp.ClientResponseError for 4xx/5xx responses (like aiohttp, so the same errors are caught with either transport).
+        """
+        if self.ok:
+            return
+        request = self._response.request
+        url = yarl.URL(str(request.url))
+        request_headers = multidict.CIMultiDictProxy(multidict.CIMultiDict(request.headers.multi_items()))
+        request_info = aiohttp.RequestInfo(url, request.method, request_headers, url)
+        raise aiohttp.ClientResponseError(request_info, (), status=self.status, message=self.reason,
+                                          headers=multidict.CIMultiDictProxy(multidict.CIMultiDict(self._response.headers.multi_items())))
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    def __getattr__(self, name: str):
+        return getattr(self._response, name)
+
+    def __repr__(self) -> str:
+        return f"<HttpxResponse [{self.status} {self.reason}] {self.http_version}>"
+
+
+class HttpxTransport(Transport):
+
+    # httpcore trace event: (connection timing, whether the event starts it)
+    _trace_events = {"connection.connect_tcp.started": ("connect", True), "connection.connect_tcp.complete": ("connect", False),
+                     "connection.start_tls.started": ("tls", True), "connection.start_tls.complete": ("tls", False)}
+
+    def __init__(self, http2: bool = True, http1: bool = True, max_connections: int | None = 10, max_keepalive_connections: int | None = 10,
+                 keepalive_expiry: float | None = 60.0, ssl=None):
+        """
+        HTTP/2 transport using httpx (pip install schwabdev[http2]), concurrent requests share one connection per host.
+
+        Args:
+            http2 (bool): use HTTP/2 (negotiated with ALPN over TLS). Defaults to True.
+            http1 (bool): allow HTTP/1.1, set to False with http2 to use HTTP/2 without TLS (e.g. a local server). Defaults to True.
+            max_connections (int | None): maximum open connections, None for no limit. Defaults to 10.
+            max_keepalive_connections (int | None): maximum idle connections kept open, None for no limit. Defaults to 10.
+            keepalive_expiry (float | None): seconds an idle connection is kept open, None to keep it forever. Defaults to 60.
+            ssl (ssl.SSLContext | None): TLS context shared by all connections, None for the default. Defaults to None.
+        """
+        self.http2 = http2                                          # use HTTP/2
+        self.http1 = http1                                          # allow HTTP/1.1
+        self.max_connections = max_connections                      # maximum open connections
+        self.max_keepalive_connections = max_keepalive_connections  # maximum idle connections
+        self.keepalive_expiry = keepalive_expiry                    # idle connection lifetime (seconds)
+        self.ssl = ssl                                              # TLS context
+        self.client = None                                          # httpx.AsyncClient
+        self._tracing = False                                       # record connection timings
+
+    def open(self, base_url: str, headers: dict, timeout: float):
+        if httpx is None:
+            raise ImportError("httpx is required to use HttpxTransport (pip install schwabdev[http2])")
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive_connections,
+                              keepalive_expiry=self.keepalive_expiry)
+        self.client = httpx.AsyncClient(base_url=base_url, headers=headers, timeout=timeout, limits=limits, http2=self.http2,
+                                        http1=self.http1, verify=self.ssl if self.ssl is not None else True)
+
+    @property
+    def headers(self):
+        return self.client.headers
+
+    @property
+    def idle_timeout(self) -> float | None:
+        return self.keepalive_expiry
+
+    def _tracer(self, info):
+        started = time.perf_counter()
+
+        async def trace(event: str, params: dict):
+            now = time.perf_counter()
+            timing = self._trace_events.get(event)
+            if timing is not None:
+                name, start = timing
+                if start:
+                    info.context[f"_{name}_start"] = now
+                elif f"_{name}_start" in info.context:
+                    info.timings[name] = info.timings.get(name, 0.0) + now - info.context.pop(f"_{name}_start")
+            elif event.endswith(".receive_response_headers.complete"):
+                info.timings["ttfb"] = now - started
+        return trace
+
+    async def request(self, method: str, path: str, trace_request_ctx=None, **kwargs):
+        if self._tracing and trace_request_ctx is not None:
+            kwargs["extensions"] = {"trace": self._tracer(trace_request_ctx)}
+        return HttpxResponse(await self.client.request(method, path, **kwargs))
+
+    def enable_tracing(self):
+        self._tracing = True
+
+    async def warm(self, path: str = "/", connections: int = 1) -> int:
+        # with HTTP/2 the requests are multiplexed over one connection
+        responses = await asyncio.gather(*(self.client.head(path) for _ in range(connections)), return_exceptions=True)
+        return sum(not isinstance(response, BaseException) for response in responses)
+
+    def pool_stats(self) -> dict:
+        connections = [connection for connection in self.client._transport._pool.connections if not connection.is_closed()]
+        idle = sum(connection.is_idle() for connection in connections)
+        return {"limit": self.max_connections, "open": len(connections), "idle": idle, "in_use": len(connections) - idle}
+
+    async def close(self):
+        await self.client.aclose()